@@ -1,19 +1,24 @@
 import asyncio
+import contextvars
 import csv
 import logging
 import os
+import re
 import sys
 import time
-import traceback
-from collections import defaultdict
+import weakref
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 
 import httpx
-from httpx import Timeout
+from httpx import Limits, Timeout
 import requests
 
 from dotenv import load_dotenv
-from settings import OPT_IMAGE_URL, SERVER_URL, DEFAULT_PROVIDER
+import metrics
+from media_index import ChapterIndex, TrackIndex
+from settings import OPT_IMAGE_URL, SERVER_URL, DEFAULT_PROVIDER, str2bool
 
 # Logger Config
 logger = logging.getLogger("bot")
@@ -39,6 +44,196 @@ HTTPX_TIMEOUT = Timeout(
     pool=HTTPX_TIMEOUT_POOL
 )
 
+# Connection pool configuration
+HTTPX_MAX_CONNECTIONS = int(os.getenv('HTTPX_MAX_CONNECTIONS', '20'))
+HTTPX_MAX_KEEPALIVE = int(os.getenv('HTTPX_MAX_KEEPALIVE', '10'))
+HTTPX_KEEPALIVE_EXPIRY = float(os.getenv('HTTPX_KEEPALIVE_EXPIRY', '30.0'))
+HTTPX_HTTP2 = str2bool(os.getenv('HTTPX_HTTP2', 'True'))
+
+HTTPX_LIMITS = Limits(
+    max_connections=HTTPX_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTPX_MAX_KEEPALIVE,
+    keepalive_expiry=HTTPX_KEEPALIVE_EXPIRY
+)
+
+# Token of the ABS user requests run as, set with use_token(). None means the bookshelfToken environment variable
+_request_token = contextvars.ContextVar('bookshelf_request_token', default=None)
+
+
+def current_token() -> str:
+    """
+    :return: the token requests made from the current context are sent with
+    """
+    token = _request_token.get()
+    return token if token is not None else os.environ.get("bookshelfToken", "")
+
+
+@contextmanager
+def use_token(token: str):
+    """
+    Send every request made inside the block with another user's token, without touching os.environ.
+    The token is held in a context variable, so tasks started inside the block inherit it and concurrent
+    tasks can each run as a different user.
+    :param token: ABS API token
+    """
+    reset = _request_token.set(token)
+    try:
+        yield
+    finally:
+        _request_token.reset(reset)
+
+
+# One pooled client per event loop. The bot, the voice thread and one-off asyncio.run() calls each
+# run their own loop, and an httpx client can only be used from the loop it was created on. Every user shares
+# it, bookshelf_conn sends the token of the current context with each request.
+_http_clients = weakref.WeakKeyDictionary()
+
+
+def _http2_available() -> bool:
+    if not HTTPX_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("HTTPX_HTTP2 is enabled but the 'h2' package is not installed, falling back to HTTP/1.1")
+        return False
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared keep-alive client for the running event loop, creating it on first use.
+    :return: httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        http2 = _http2_available()
+        client = httpx.AsyncClient(timeout=HTTPX_TIMEOUT, limits=HTTPX_LIMITS, http2=http2)
+        _http_clients[loop] = client
+        logger.debug(f"Created pooled HTTP client (http2={http2})")
+    return client
+
+
+async def close_http_client():
+    """
+    Close the shared client bound to the running event loop, if any.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    client = _http_clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        logger.debug("Closed pooled HTTP client")
+
+
+# Item metadata cache configuration
+ITEM_CACHE_SIZE = int(os.getenv('ITEM_CACHE_SIZE', '128'))
+ITEM_CACHE_TTL = float(os.getenv('ITEM_CACHE_TTL', '300'))
+
+
+class ItemCache:
+    """
+    Size-bounded LRU cache for /items/{id} documents with a per-entry TTL.
+    Expired entries keep their ETag/Last-Modified validators so they can be revalidated
+    with a conditional GET instead of downloading the whole document again.
+    Entries are keyed by (token, item id), a document fetched for one user is never served to another.
+    """
+
+    def __init__(self, max_size: int = ITEM_CACHE_SIZE, ttl: float = ITEM_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.monotonic() < entry['expires']
+
+    def put(self, key: tuple, data: dict, etag=None, last_modified=None):
+        self._entries[key] = {
+            'data': data,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires': time.monotonic() + self.ttl
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def touch(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry['expires'] = time.monotonic() + self.ttl
+
+    def invalidate(self, item_id: str = None):
+        if item_id is None:
+            self._entries.clear()
+            return
+        # Every user's copy of the item
+        for key in [key for key in self._entries if key[1] == item_id]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidated': self.revalidated
+        }
+
+
+_item_cache = ItemCache()
+
+
+def invalidate_item_cache(item_id: str = None):
+    """
+    Drop a cached item document, or the whole cache when no item_id is given.
+    :param item_id:
+    """
+    _item_cache.invalidate(item_id)
+
+
+def item_cache_stats() -> dict:
+    return _item_cache.stats()
+
+
+def _cache_metrics():
+    caches = (('item', _item_cache.hits, _item_cache.misses),
+              ('progress_map', _progress_map_stats['hits'], _progress_map_stats['misses']))
+    for cache, hits, misses in caches:
+        yield 'counter', 'cache.hits', {'cache': cache}, hits
+        yield 'counter', 'cache.misses', {'cache': cache}, misses
+        yield 'gauge', 'cache.hit_ratio', {'cache': cache}, round(hits / (hits + misses), 4) if hits + misses else 0.0
+    yield 'gauge', 'cache.items', {'cache': 'item'}, len(_item_cache._entries)
+
+
+# Seconds a user's bulk progress map is reused before /me is requested again
+PROGRESS_MAP_TTL = float(os.getenv('PROGRESS_MAP_TTL', '15'))
+
+# token -> (expires, {(libraryItemId, episodeId): mediaProgress})
+_progress_maps = {}
+_progress_map_stats = {'hits': 0, 'misses': 0}
+
+metrics.register_collector(_cache_metrics)
+
+
+def invalidate_progress_map():
+    """
+    Drop the cached progress maps, called after progress was changed by the bot.
+    """
+    _progress_maps.clear()
+
 
 def time_converter(time_sec: int) -> str:
     """
@@ -56,8 +251,21 @@ def successMSG(endpoint, status):
     logger.debug(f'Successfully Reached {endpoint} with Status {status}')
 
 
+# Path segments that identify a single object, e.g. li_8gch9ve09orgn4fdz8 or a uuid
+_ID_SEGMENT = re.compile(r"^(?=.*\d)[\w-]{8,}$")
+
+
+def metrics_endpoint(endpoint: str) -> str:
+    """
+    Endpoint with object ids replaced, so requests for different items share one metrics series.
+    :param endpoint: e.g. /items/li_8gch9ve09orgn4fdz8/play
+    :return: e.g. /items/:id/play
+    """
+    return '/'.join(':id' if _ID_SEGMENT.match(segment) else segment for segment in endpoint.split('/'))
+
+
 async def bookshelf_conn(endpoint: str, Headers=None, Data=None, Token=True, GET=False,
-                         POST=False, params=None):
+                         POST=False, params=None, PATCH=False):
     """
     :param endpoint:
     :param Headers:
@@ -66,46 +274,101 @@ async def bookshelf_conn(endpoint: str, Headers=None, Data=None, Token=True, GET
     :param GET:
     :param POST:
     :param params:
+    :param PATCH:
     :return: r -> requests or httpx object if status 200.
     """
     bookshelfURL = SERVER_URL
     API_URL = bookshelfURL + "/api"
-    bookshelfToken = os.environ.get("bookshelfToken")
-    tokenInsert = "?token=" + bookshelfToken if Token else ""
 
     if params is not None:
         additional_params = params
     else:
         additional_params = ''
 
-    link = f'{API_URL}{endpoint}{tokenInsert}{additional_params}'
+    link = f'{API_URL}{endpoint}'
+    if additional_params:
+        link += '?' + additional_params.lstrip('&')
+
+    # The token travels per request, the pooled client is shared by every user
+    send_json = Data is not None and Headers is not None
+    Headers = dict(Headers or {})
+    if Token:
+        Headers['Authorization'] = f'Bearer {current_token()}'
+
     if __name__ == '__main__':
         print(link)
-    # Create an HTTPX client
-    async with httpx.AsyncClient(timeout=HTTPX_TIMEOUT) as client:
-        if GET:
-            if Headers:
+    if GET:
+        method = 'GET'
+    elif POST:
+        method = 'POST'
+    elif PATCH:
+        method = 'PATCH'
+    else:
+        logger.warning('Must include GET, POST or PATCH in arguments')
+        raise Exception
+
+    # Reuse the pooled client so consecutive calls share TCP/TLS connections
+    client = get_http_client()
+    endpoint_label = metrics_endpoint(endpoint)
+    with metrics.span('abs.request'), metrics.span('abs.endpoint', endpoint=endpoint_label, method=method):
+        try:
+            if GET:
                 r = await client.get(link, headers=Headers)
+            elif POST:
+                if send_json:
+                    r = await client.post(link, headers=Headers, json=Data)
+                else:
+                    r = await client.post(link, headers=Headers)
             else:
-                r = await client.get(link)
+                r = await client.patch(link, headers=Headers, json=Data)
+        except httpx.HTTPError:
+            metrics.inc('abs.errors', endpoint=endpoint_label, method=method)
+            raise
 
-            if r.status_code == 404:
-                logger.warning(f"404: GET {link} returned 404")
+    metrics.inc('abs.responses', status=f"{r.status_code // 100}xx")
+    if r.status_code == 404:
+        logger.warning(f"404: {method} {link} returned 404")
 
-            return r
-        elif POST:
-            if Data is not None and Headers is not None:
-                r = await client.post(link, headers=Headers, json=Data)
-            else:
-                r = await client.post(link)
+    return r
 
-            if r.status_code == 404:
-                logger.warning(f"404: POST {link} returned 404")
 
-            return r
-        else:
-            logger.warning('Must include GET, POST or PATCH in arguments')
-            raise Exception
+async def bookshelf_get_item(item_id: str, force_refresh=False):
+    """
+    Fetch the raw /items/{id} document through the item cache.
+    The returned dict is shared with the cache, callers must copy anything they want to modify.
+    :param item_id:
+    :param force_refresh: skip the TTL check and revalidate with the server
+    :return: item data (dict) or None if the item could not be retrieved
+    """
+    key = (current_token(), item_id)
+    entry = _item_cache.get(key)
+    if entry is not None and not force_refresh and _item_cache.is_fresh(entry):
+        _item_cache.hits += 1
+        return entry['data']
+
+    headers = None
+    if entry is not None:
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    r = await bookshelf_conn(GET=True, endpoint=f"/items/{item_id}", Headers=headers or None)
+
+    if r.status_code == 304 and entry is not None:
+        _item_cache.revalidated += 1
+        _item_cache.touch(key)
+        return entry['data']
+
+    if r.status_code != 200:
+        logger.error(f"Failed to fetch item {item_id}. Status: {r.status_code}")
+        return None
+
+    _item_cache.misses += 1
+    data = r.json()
+    _item_cache.put(key, data, r.headers.get('ETag'), r.headers.get('Last-Modified'))
+    return data
 
 
 # Test initial Connection to Bookshelf Server
@@ -220,6 +483,7 @@ async def bookshelf_auth_test():
         logger.warning("Could not establish connection: ", e)
 
 
+@metrics.timed('abs.get_item_details')
 async def bookshelf_get_item_details(book_id) -> dict:
     """
     Fetch book/podcast details from Bookshelf API.
@@ -227,18 +491,10 @@ async def bookshelf_get_item_details(book_id) -> dict:
     :return: formatted_data(dict) -> keys: title, author, narrator, series, publisher, genres, 
                                            publishedYear, description, language, duration, addedDate, mediaType
     """
-    _url = f"/items/{book_id}"
-    r = await bookshelf_conn(GET=True, endpoint=_url)
-
-    # Check if response is valid
-    if r.status_code != 200:
-        logger.error(f"Failed to fetch book details. Status: {r.status_code}, Response: {r.text}")
-        return {}
-
     try:
-        data = r.json()
+        data = await bookshelf_get_item(book_id)
     except Exception as e:
-        logger.error(f"Error parsing JSON response: {e}. Raw response: {r.text}")
+        logger.error(f"Error fetching book details for {book_id}: {e}")
         return {}
 
     # Validate required fields
@@ -315,7 +571,7 @@ async def bookshelf_listening_stats():
     Gets the 10 most recent sessions for the logged in ABS user.
     :return: formatted_session_info, data
     """
-    bookshelfToken = os.environ.get("bookshelfToken")
+    bookshelfToken = current_token()
     endpoint = "/me/listening-stats"
     formatted_sessions = []
 
@@ -421,6 +677,45 @@ async def bookshelf_libraries():
         return library_data
 
 
+# Multi-library requests, libraries queried at once and seconds allowed per library
+LIBRARY_FANOUT_CONCURRENCY = int(os.getenv('LIBRARY_FANOUT_CONCURRENCY', '4'))
+LIBRARY_FANOUT_TIMEOUT = float(os.getenv('LIBRARY_FANOUT_TIMEOUT', '10'))
+
+
+async def bookshelf_library_fanout(func, libraries=None, concurrency=None, timeout=None) -> list:
+    """
+    Run func(library_id, name) for every library concurrently.
+    A library that raises or exceeds the timeout is logged and left out, the others are still returned.
+    :param func: coroutine function taking (library_id, name)
+    :param libraries: dict in the format of bookshelf_libraries(), fetched when None
+    :param concurrency: libraries queried at once, default LIBRARY_FANOUT_CONCURRENCY
+    :param timeout: seconds allowed per library, default LIBRARY_FANOUT_TIMEOUT
+    :return: list of (library_id, name, result) in library order
+    """
+    if libraries is None:
+        libraries = await bookshelf_libraries() or {}
+    semaphore = asyncio.Semaphore(concurrency or LIBRARY_FANOUT_CONCURRENCY)
+    timeout = timeout or LIBRARY_FANOUT_TIMEOUT
+
+    async def run(library_id, name):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(func(library_id, name), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Library '{name}' ({library_id}) did not answer within {timeout}s, skipping it")
+            except Exception as e:
+                logger.warning(f"Library '{name}' ({library_id}) failed: {e}")
+            return _FANOUT_FAILED
+
+    targets = [(library_id, name) for name, (library_id, audiobooks_only) in libraries.items()]
+    results = await asyncio.gather(*(run(library_id, name) for library_id, name in targets))
+    return [(library_id, name, result) for (library_id, name), result in zip(targets, results)
+            if result is not _FANOUT_FAILED]
+
+
+_FANOUT_FAILED = object()
+
+
 async def bookshelf_item_progress(item_id, episode_id=None):
     if episode_id:
         endpoint = f"/me/progress/{item_id}/{episode_id}"
@@ -446,10 +741,8 @@ async def bookshelf_item_progress(item_id, episode_id=None):
         converted_lastUpdate = lastUpdate.strftime('%Y-%m-%d %H:%M')
 
         # Get Media Title
-        secondary_url = f"/items/{item_id}"
-        r = await bookshelf_conn(GET=True, endpoint=secondary_url)
-        data = r.json()
-        title = data['media']['metadata']['title']
+        data = await bookshelf_get_item(item_id)
+        title = data['media']['metadata']['title'] if data else 'Unknown Title'
 
         formatted_info = {
             'title': title,
@@ -463,6 +756,50 @@ async def bookshelf_item_progress(item_id, episode_id=None):
         return formatted_info
 
 
+async def bookshelf_progress_map(force=False):
+    """
+    Every mediaProgress entry of the current user from a single /me request, cached for PROGRESS_MAP_TTL.
+    :param force: skip the cache
+    :return: dict keyed by (libraryItemId, episodeId), episodeId is None for books, or None on failure
+    """
+    token = current_token()
+    cached = _progress_maps.get(token)
+    if cached is not None and not force and time.monotonic() < cached[0]:
+        _progress_map_stats['hits'] += 1
+        return cached[1]
+    _progress_map_stats['misses'] += 1
+
+    r = await bookshelf_conn(GET=True, endpoint="/me")
+    if r.status_code != 200:
+        logger.warning(f"Could not fetch progress map from /me, status {r.status_code}")
+        return None
+
+    progress_map = {}
+    for media in r.json().get('mediaProgress', []):
+        progress_map[(media.get('libraryItemId'), media.get('episodeId'))] = media
+
+    _progress_maps[token] = (time.monotonic() + PROGRESS_MAP_TTL, progress_map)
+    return progress_map
+
+
+async def bookshelf_item_finished(item_id, episode_id=None) -> bool:
+    """
+    Lightweight finished check for a single item, unlike bookshelf_item_progress it doesn't fetch the title.
+    :param item_id:
+    :param episode_id:
+    :return: True if the item or episode is finished
+    """
+    if episode_id:
+        endpoint = f"/me/progress/{item_id}/{episode_id}"
+    else:
+        endpoint = f"/me/progress/{item_id}"
+
+    r = await bookshelf_conn(GET=True, endpoint=endpoint)
+    if r.status_code == 200:
+        return bool(r.json().get('isFinished'))
+    return False
+
+
 async def bookshelf_mark_book_finished(item_id: str, session_id: str, episode_id: str = None):
     """
     Explicitly mark a book or podcast episode as finished
@@ -473,14 +810,12 @@ async def bookshelf_mark_book_finished(item_id: str, session_id: str, episode_id
     """
     try:
         # First, get the item's details to determine media type
-        endpoint = f"/items/{item_id}"
-        r = await bookshelf_conn(GET=True, endpoint=endpoint)
+        data = await bookshelf_get_item(item_id)
 
-        if r.status_code != 200:
+        if data is None:
             logger.error(f"Failed to get book details for {item_id}")
             return False
 
-        data = r.json()
         media_type = data.get('mediaType', 'book')
 
         if media_type == 'podcast':
@@ -535,22 +870,18 @@ async def bookshelf_mark_book_finished(item_id: str, session_id: str, episode_id
         }
 
         # Use PATCH method for progress update
-        async with httpx.AsyncClient() as client:
-            bookshelfURL = os.environ.get("bookshelfURL")
-            bookshelfToken = os.environ.get("bookshelfToken")
-            api_url = f"{bookshelfURL}/api{progress_endpoint}?token={bookshelfToken}"
-
-            progress_response = await client.patch(api_url, json=progress_update,
-                                                   headers={'Content-Type': 'application/json'})
-
-            if progress_response.status_code == 200:
-                logger.info(
-                    f"Successfully marked {media_type} {'episode ' + episode_id if episode_id else item_id} as finished")
-                return True
-            else:
-                logger.warning(
-                    f"Failed to update progress endpoint. Status: {progress_response.status_code}, Response: {progress_response.text}")
-                return False
+        progress_response = await bookshelf_conn(endpoint=progress_endpoint, PATCH=True, Data=progress_update,
+                                                 Headers={'Content-Type': 'application/json'})
+
+        if progress_response.status_code == 200:
+            logger.info(
+                f"Successfully marked {media_type} {'episode ' + episode_id if episode_id else item_id} as finished")
+            invalidate_progress_map()
+            return True
+        else:
+            logger.warning(
+                f"Failed to update progress endpoint. Status: {progress_response.status_code}, Response: {progress_response.text}")
+            return False
 
     except Exception as e:
         logger.error(f"Error marking {media_type if 'media_type' in locals() else 'item'} as finished: {e}")
@@ -567,14 +898,12 @@ async def bookshelf_mark_book_unfinished(item_id: str, episode_id: str = None):
     logger.info(f"Attempting to mark as unfinished - item_id: {item_id}, episode_id: {episode_id}")
     try:
         # First, get the item's details to determine media type
-        endpoint = f"/items/{item_id}"
-        r = await bookshelf_conn(GET=True, endpoint=endpoint)
+        data = await bookshelf_get_item(item_id)
 
-        if r.status_code != 200:
-            logger.error(f"404 SOURCE: Failed to get item details for {item_id} - Status: {r.status_code}")
+        if data is None:
+            logger.error(f"404 SOURCE: Failed to get item details for {item_id}")
             return False
 
-        data = r.json()
         media_type = data.get('mediaType', 'book')
 
         # Determine the correct progress endpoint
@@ -599,22 +928,18 @@ async def bookshelf_mark_book_unfinished(item_id: str, episode_id: str = None):
         }
 
         # Use PATCH method for progress update
-        async with httpx.AsyncClient() as client:
-            bookshelfURL = os.environ.get("bookshelfURL")
-            bookshelfToken = os.environ.get("bookshelfToken")
-            api_url = f"{bookshelfURL}/api{progress_endpoint}?token={bookshelfToken}"
-
-            progress_response = await client.patch(api_url, json=progress_update,
-                                                   headers={'Content-Type': 'application/json'})
-
-            if progress_response.status_code == 200:
-                media_name = f"podcast episode {episode_id}" if episode_id else f"book {item_id}"
-                logger.info(f"Successfully marked {media_name} as not finished")
-                return True
-            else:
-                logger.error(
-                    f"404 SOURCE: Failed to update progress endpoint {progress_endpoint}. Status: {progress_response.status_code}, Response: {progress_response.text}")
-                return False
+        progress_response = await bookshelf_conn(endpoint=progress_endpoint, PATCH=True, Data=progress_update,
+                                                 Headers={'Content-Type': 'application/json'})
+
+        if progress_response.status_code == 200:
+            media_name = f"podcast episode {episode_id}" if episode_id else f"book {item_id}"
+            logger.info(f"Successfully marked {media_name} as not finished")
+            invalidate_progress_map()
+            return True
+        else:
+            logger.error(
+                f"404 SOURCE: Failed to update progress endpoint {progress_endpoint}. Status: {progress_response.status_code}, Response: {progress_response.text}")
+            return False
 
     except Exception as e:
         media_name = f"podcast episode {episode_id}" if episode_id else f"book {item_id}"
@@ -627,65 +952,57 @@ async def bookshelf_title_search(display_title: str) -> list:
     :param display_title:
     :return: found_titles(list)
     """
-    libraries = await bookshelf_libraries()
-    valid_media_types = ['book', 'podcast']
+    import search_index
+    indexed = await search_index.search(display_title, limit=10)
+    if indexed is not None:
+        return [{'id': item['id'], 'title': item['title'], 'author': item['author']} for item in indexed]
 
-    valid_libraries = []
-    valid_library_count = 0
-    found_titles = []
+    valid_media_types = ['book', 'podcast']
 
-    # Get valid libraries
-    for name, (library_id, audiobooks_only) in libraries.items():
-        # Parse for the library that is only audio
-        valid_libraries.append({"id": library_id, "name": name})
-        valid_library_count += 1
-        logger.debug(f"Valid Libraries Found: {valid_library_count} | Name: {name}\n")
+    async def search_library(library_id, name):
+        logger.debug(f"Beginning to search libraries: {name} | {library_id}\n")
+        library_titles = []
+        # Search for the title name using endpoint
+        limit = 10
+        endpoint = f"/libraries/{library_id}/search"
+        params = f"&q={display_title}&limit={limit}"
+        r = await bookshelf_conn(endpoint=endpoint, GET=True, params=params)
+        logger.debug(f"status code: {r.status_code}")
+        if r.status_code == 200:
+            data = r.json()
 
-    if valid_library_count > 0:
+            successMSG(endpoint, r.status_code)
+            dataset = data.get('book', [])
+            for book in dataset:
+                authors_list = []
+                title = book['libraryItem']['media']['metadata']['title']
+                authors_raw = book['libraryItem']['media']['metadata']['authors']
+
+                for author in authors_raw:
+                    author_name = author.get('name')
+                    authors_list.append(author_name)
+
+                authors = ', '.join(authors_list)
+
+                book_id = book['libraryItem']['id']
+                media_type = book['libraryItem']['mediaType']
+                # Add to dict
+                if media_type in valid_media_types:
+                    logger.debug(f'accepted: {title} | media type: {media_type}')
+                    library_titles.append({'id': book_id, 'title': title, 'author': authors})
+                else:
+                    logger.warning(f'rejected: {title}, reason: media-type {media_type} rejected')
+        return library_titles
 
-        # Search the libraries for the title name
-        for lib_id in valid_libraries:
-            library_iD = lib_id.get('id')
-            logger.debug(f"Beginning to search libraries: {lib_id.get('name')} | {library_iD}\n")
-            # Search for the title name using endpoint
-            try:
-                limit = 10
-                endpoint = f"/libraries/{library_iD}/search"
-                params = f"&q={display_title}&limit={limit}"
-                r = await bookshelf_conn(endpoint=endpoint, GET=True, params=params)
-                logger.debug(f"status code: {r.status_code}")
-                if r.status_code == 200:
-                    data = r.json()
-
-                    successMSG(endpoint, r.status_code)
-                    dataset = data.get('book', [])
-                    for book in dataset:
-                        authors_list = []
-                        title = book['libraryItem']['media']['metadata']['title']
-                        authors_raw = book['libraryItem']['media']['metadata']['authors']
-
-                        for author in authors_raw:
-                            name = author.get('name')
-                            authors_list.append(name)
-
-                        authors = ', '.join(authors_list)
-
-                        book_id = book['libraryItem']['id']
-                        media_type = book['libraryItem']['mediaType']
-                        # Add to dict
-                        if media_type in valid_media_types:
-                            logger.debug(f'accepted: {title} | media type: {media_type}')
-                            found_titles.append({'id': book_id, 'title': title, 'author': authors})
-                        else:
-                            logger.warning(f'rejected: {title}, reason: media-type {media_type} rejected')
-
-                    # Append None to book_titles if nothing is found
-                    logger.debug(found_titles)
-                    return found_titles
+    # Search every library at once and merge the results
+    found_titles = []
+    for library_id, name, library_titles in await bookshelf_library_fanout(search_library):
+        for title in library_titles:
+            if not any(found['id'] == title['id'] for found in found_titles):
+                found_titles.append(title)
 
-            except Exception as e:
-                logger.error(f'Error occured: {e}')
-                logger.error(traceback.print_exc())
+    logger.debug(found_titles)
+    return found_titles
 
 
 async def bookshelf_search_users(name):
@@ -711,52 +1028,39 @@ async def bookshelf_search_users(name):
                 return isFound, username, user_id, c_last_seen, isActive
 
 
+async def bookshelf_batch_items(item_ids: list):
+    """
+    Fetch several library items with a single request.
+    :param item_ids: library item ids
+    :return: list of expanded library items, or None if the request failed
+    """
+    if not item_ids:
+        return []
+    endpoint = "/items/batch/get"
+    r = await bookshelf_conn(POST=True, endpoint=endpoint, Data={'libraryItemIds': list(item_ids)},
+                             Headers={'Content-Type': 'application/json'})
+    if r.status_code == 200:
+        successMSG(endpoint, r.status_code)
+        return r.json().get('libraryItems', [])
+    logger.warning(f"Batch item request failed with status {r.status_code}")
+    return None
+
+
 async def bookshelf_get_series_id(series_name: str):
     """
     Search for a series by name and return its ID and library ID
     :param series_name: Name of the series to search for
-    :return: tuple (series_id, library_id) if found, (None, None) if not found
+    :return: tuple (series_id, library_id, books) if found, (None, None, []) if not found.
+        books are sorted by sequence, see series_index.get_series
     """
-    try:
-        libraries = await bookshelf_libraries()
-        logger.info(f"Searching for series '{series_name}' across {len(libraries)} libraries")
-
-        for name, (library_id, audiobooks_only) in libraries.items():
-            logger.debug(f"Checking library '{name}' (ID: {library_id})")
-
-            endpoint = f"/libraries/{library_id}/series"
-            params = "&limit=500"
-
-            r = await bookshelf_conn(endpoint=endpoint, GET=True, params=params)
-            logger.debug(f"Raw series response: {r.text}")
-
-            logger.debug(f"Series endpoint status for library '{name}': {r.status_code}")
-            if r.status_code == 200:
-                data = r.json()
-                series_list = data.get('results', [])
-                total_series = data.get('total', 0)
-                logger.info(f"Found {len(series_list)} series (out of {total_series} total) in library '{name}'")
-
-                for series_item in series_list:
-                    found_name = series_item.get('name', '').strip()
-                    target_name = series_name.lower()
-                    found_name_lower = found_name.lower()
-
-                    if found_name_lower == target_name:
-                        series_id = series_item.get('id')
-                        books = series_item.get('books', [])
-                        logger.info(
-                            f"Found series '{series_name}' with ID {series_id} and {len(books)} books in library '{name}'")
-                        return series_id, library_id, books
-            else:
-                logger.warning(f"Failed to get series from library '{name}'. Status: {r.status_code}")
-
+    import series_index
+    series = await series_index.get_series(name=series_name)
+    if series is None:
         logger.debug(f"Series '{series_name}' not found in any library")
-        return None, None
+        return None, None, []
 
-    except Exception as e:
-        logger.error(f"Error searching for series '{series_name}': {e}")
-        return None, None
+    logger.info(f"Found series '{series_name}' with ID {series['id']} and {len(series['books'])} books")
+    return series['id'], series['library_id'], series['books']
 
 
 async def bookshelf_get_podcast_episodes(item_id: str):
@@ -766,21 +1070,20 @@ async def bookshelf_get_podcast_episodes(item_id: str):
     :return: List of episodes with index information
     """
     try:
-        endpoint = f"/items/{item_id}"
-        r = await bookshelf_conn(GET=True, endpoint=endpoint)
+        data = await bookshelf_get_item(item_id)
 
-        if r.status_code != 200:
+        if data is None:
             logger.error(f"Failed to get podcast episodes for {item_id}")
             return []
 
-        data = r.json()
         media_type = data.get('mediaType', '')
 
         if media_type != 'podcast':
             logger.warning(f"Item {item_id} is not a podcast")
             return []
 
-        episodes = data.get('media', {}).get('episodes', [])
+        # Copy the episodes, the item document is shared with the item cache
+        episodes = [dict(episode) for episode in data.get('media', {}).get('episodes', [])]
 
         def get_sort_key(episode):
             """
@@ -860,30 +1163,25 @@ async def bookshelf_create_user(username: str, password, user_type: str, email=N
 
 
 async def bookshelf_library_csv(library_id: str, file_name='books.csv'):
-    bookshelfToken = os.getenv('bookshelfToken')
-    endpoint = f'/libraries/{library_id}'
-    headers = {'Authorization': f'Bearer {bookshelfToken}'}
-    params = '?sort=media.metadata.authorName'
-
-    response = await bookshelf_conn(GET=True, endpoint=endpoint, Headers=headers, params=params)
-    if response.status_code == 200:
-
-        data = response.json()['results']
-
-        # CSV file creation
-        with open(file_name, 'w', newline='') as file:
-            writer = csv.writer(file)
-            # Writing the headers
-            writer.writerow(["Title", "Author", "Series", "Year"])
+    """
+    Writes every item of a library to a csv file, sorted by author.
+    :param library_id:
+    :param file_name:
+    """
+    items = await bookshelf_mirrored_items(library_id, sort='author', include_ebooks=True)
+    if items is None:
+        return
 
-            for result in data:
-                title = result['media']['metadata']['title']
-                author = result['media']['metadata']['authorName']
-                series = result['media']['metadata']['seriesName']
-                year = result['media']['metadata']['publishedYear']
+    # CSV file creation
+    with open(file_name, 'w', newline='') as file:
+        writer = csv.writer(file)
+        # Writing the headers
+        writer.writerow(["Title", "Author", "Series", "Year"])
 
-                # Writing the data
-                writer.writerow([title, author, series, year])
+        for item in items:
+            # Writing the data
+            writer.writerow([item.get('title'), item.get('author'), item.get('series', ''),
+                             item.get('publishedYear', '')])
 
 
 async def bookshelf_cover_image(item_id: str):
@@ -896,7 +1194,7 @@ async def bookshelf_cover_image(item_id: str):
     else:
         bookshelfURL = os.environ.get("bookshelfURL")
     defaultAPIURL = bookshelfURL + '/api'
-    bookshelfToken = os.environ.get("bookshelfToken")
+    bookshelfToken = current_token()
     tokenInsert = "?token=" + bookshelfToken
 
     # Generates Cover Link
@@ -936,6 +1234,50 @@ async def bookshelf_all_library_items(library_id, params=''):
         return found_titles
 
 
+async def bookshelf_mirrored_items(library_id=None, sort='title', limit=None, **filters):
+    """
+    Library items from the local mirror, falling back to bookshelf_all_library_items when the mirror is off.
+    :param library_id: restrict to one library, all libraries when None
+    :param sort: 'title', 'author' or 'added' (newest first)
+    :param limit:
+    :param filters: extra mirror filters (include_ebooks, added_since, media_type, genre, refresh),
+        ignored by the fallback
+    :return: list of items with id, title, author, addedTime and mediaType
+    """
+    import library_mirror
+    import search_index
+    # The mirror holds every user's libraries, only answer from it for the ones this token can see
+    visible = await search_index.visible_libraries() if library_mirror.is_available() else None
+    if visible is not None:
+        if library_id and library_id not in visible:
+            logger.warning(f"Library {library_id} is not visible to the current user")
+            return []
+        items = await library_mirror.get_items(library_id=library_id, sort=sort, limit=limit,
+                                               library_ids=visible, **filters)
+        if items is not None:
+            return items
+
+    libraries = {library_id: (library_id, None)} if library_id else None
+
+    params = {'title': '', 'author': 'sort=media.metadata.authorName', 'added': 'sort=addedAt&desc=1'}.get(sort, '')
+    if limit and sort == 'added':
+        params += f'&limit={limit}'
+
+    async def library_items(lib_id, name):
+        return await bookshelf_all_library_items(lib_id, params=params) or []
+
+    results = await bookshelf_library_fanout(library_items, libraries)
+    items = []
+    for lib_id, name, found in results:
+        items.extend(found)
+
+    if len(results) > 1 and sort == 'added':
+        items.sort(key=lambda x: x.get('addedTime', 0), reverse=True)
+    if limit:
+        items = items[:limit]
+    return items
+
+
 # NOT CURRENTLY IN USE
 async def bookshelf_list_backup():
     endpoint = "/backups"
@@ -949,6 +1291,7 @@ async def bookshelf_list_backup():
         print(backup_IDs)
 
 
+@metrics.timed('abs.get_current_chapter')
 async def bookshelf_get_current_chapter(item_id: str, current_time=0):
     """
     :param item_id:
@@ -957,7 +1300,6 @@ async def bookshelf_get_current_chapter(item_id: str, current_time=0):
     """
     try:
         progress_endpoint = f"/me/progress/{item_id}"
-        endpoint = f"/items/{item_id}"
         book_finished = False
 
         progress_r = await bookshelf_conn(GET=True, endpoint=progress_endpoint)
@@ -970,11 +1312,9 @@ async def bookshelf_get_current_chapter(item_id: str, current_time=0):
             else:
                 book_finished = False
 
-        r = await bookshelf_conn(GET=True, endpoint=endpoint)
+        data = await bookshelf_get_item(item_id)
 
-        if r.status_code == 200:
-            # Place data in JSON Format
-            data = r.json()
+        if data is not None:
             mediaType = data['mediaType']
             if mediaType == 'podcast':
                 isPodcast = True
@@ -987,19 +1327,16 @@ async def bookshelf_get_current_chapter(item_id: str, current_time=0):
                 chapter_array = []
                 foundChapter = {}
 
-            for chapters in data['media']['chapters']:
-                chapter_array.append(chapters)
-
-            for chapter in chapter_array:
-                chapter_start = float(chapter.get('start'))
-                chapter_end = float(chapter.get('end'))
+            # Copy the chapters, the item document is shared with the item cache
+            chapter_index = ChapterIndex(item_id, [dict(chapter) for chapter in data['media']['chapters']])
+            chapter_array = chapter_index.chapters
 
-                # Verify if in current chapter
-                if current_time >= chapter_start and current_time < chapter_end:  # NOQA
-                    chapter["currentTime"] = current_time
-                    foundChapter = chapter
+            chapter = chapter_index.chapter_at(current_time)
+            if chapter is not None:
+                chapter["currentTime"] = current_time
+                foundChapter = chapter
 
-            if chapter_array and foundChapter is not None:
+            if chapter_array and foundChapter:
                 return foundChapter, chapter_array, book_finished, isPodcast
 
             # If no matching chapter found but chapters exist, use the first chapter
@@ -1016,6 +1353,23 @@ async def bookshelf_get_current_chapter(item_id: str, current_time=0):
         return {}, [], False, False  # Default empty values that are unpacked correctly
 
 
+async def bookshelf_get_chapter_index(item_id: str) -> ChapterIndex:
+    """
+    Build a chapter index for an item from the cached item document.
+    :param item_id:
+    :return: ChapterIndex (empty for podcasts, items without chapters or on error)
+    """
+    try:
+        data = await bookshelf_get_item(item_id)
+        if data is None or data.get('mediaType') == 'podcast':
+            return ChapterIndex(item_id)
+        return ChapterIndex(item_id, [dict(chapter) for chapter in data['media'].get('chapters', [])])
+    except Exception as e:
+        logger.error(f"Error building chapter index for item {item_id}: {e}")
+        return ChapterIndex(item_id)
+
+
+@metrics.timed('abs.audio_obj')
 async def bookshelf_audio_obj(item_id: str, episode_index: int = 0):
     """
     Enhanced audio object function with proper podcast episode support
@@ -1023,11 +1377,11 @@ async def bookshelf_audio_obj(item_id: str, episode_index: int = 0):
     :param item_id: Book/Podcast item ID
     :param episode_index: Episode index for podcasts ONLY (0 = newest, 1 = second newest, etc.)
                          This parameter is IGNORED for books
-    :return: For books: (onlineURL, currentTime, session_id, title, duration, episode_id)
+    :return: For books: (TrackIndex, currentTime, session_id, title, duration, episode_id)
              For podcasts: (onlineURL, currentTime, session_id, title, duration, episode_id, episode_info)
     """
     bookshelfURL = os.environ.get("bookshelfURL", "")
-    bookshelfToken = os.environ.get("bookshelfToken", "")
+    bookshelfToken = current_token()
 
     if not bookshelfURL or not bookshelfToken:
         logger.error("Missing Bookshelf URL or Token in environment variables.")
@@ -1037,14 +1391,12 @@ async def bookshelf_audio_obj(item_id: str, episode_index: int = 0):
     tokenInsert = f"?token={bookshelfToken}"
 
     # First, get the item details to determine media type
-    item_endpoint = f"/items/{item_id}"
-    item_response = await bookshelf_conn(GET=True, endpoint=item_endpoint)
+    item_data = await bookshelf_get_item(item_id)
 
-    if item_response.status_code != 200:
+    if item_data is None:
         logger.error(f"Failed to get item details for {item_id}")
         return None
 
-    item_data = item_response.json()
     mediaType = item_data.get("mediaType", "unknown")
     logger.info(f"Item {item_id} mediaType: {mediaType}")
 
@@ -1150,9 +1502,19 @@ async def bookshelf_audio_obj(item_id: str, episode_index: int = 0):
             logger.warning(f"No audio files found for item {item_id}")
             return None
 
-        # Use the first audio file for books
-        selected_file = audiofiles[0]
-        ino = selected_file.get('ino', '')
+        # Books can be split over several files, map them onto the book timeline in playback order
+        tracks = TrackIndex.from_audio_files(
+            item_id, audiofiles, lambda f: f"{defaultAPIURL}/items/{item_id}/file/{f.get('ino', '')}{tokenInsert}")
+
+        if not tracks or not all(track['ino'] for track in tracks.tracks):
+            logger.error(f"No valid audio file identifier found for {mediaType} {item_id}")
+            return None
+
+        logger.info(f"Media Type: {mediaType}, Current Time: {currentTime} Seconds, Tracks: {len(tracks)}")
+        logger.info(f"Attempting to play: {tracks.tracks[0]['url']}")
+
+        # Books returns 6-tuple structure without episode_info
+        return tracks, currentTime, session_id, bookTitle, bookDuration, episode_id
 
     if not ino:
         logger.error(f"No valid audio file identifier found for {mediaType} {item_id}")
@@ -1163,11 +1525,7 @@ async def bookshelf_audio_obj(item_id: str, episode_index: int = 0):
     logger.info(f"Attempting to play: {onlineURL}")
 
     # Podcasts return 7-tuple structure
-    if mediaType == "podcast":
-        return onlineURL, currentTime, session_id, bookTitle, bookDuration, episode_id, episode_info
-    else:
-        # Books returns 6-tuple structure without episode_info
-        return onlineURL, currentTime, session_id, bookTitle, bookDuration, episode_id
+    return onlineURL, currentTime, session_id, bookTitle, bookDuration, episode_id, episode_info
 
 
 async def bookshelf_session_update(session_id: str, item_id: str, current_time: float, next_time=None,
@@ -1267,6 +1625,50 @@ async def bookshelf_session_update(session_id: str, item_id: str, current_time:
     return updatedTime, duration, serverCurrentTime, finished_book
 
 
+async def bookshelf_get_session(session_id: str):
+    """
+    :param session_id:
+    :return: session data (dict) or None if the session could not be retrieved
+    """
+    endpoint = f"/session/{session_id}"
+    try:
+        r = await bookshelf_conn(GET=True, endpoint=endpoint)
+        if r.status_code == 200:
+            return r.json()
+        logger.warning(f"Session info request failed. Status: {r.status_code}")
+    except Exception as e:
+        logger.warning(f"Issue reading session {session_id}: {e}")
+    return None
+
+
+async def bookshelf_session_sync(session_id: str, current_time: float, time_listened: float, duration: float) -> int:
+    """
+    Push the local playback position to an open session without reading it back first.
+    :param session_id:
+    :param current_time: absolute position in seconds
+    :param time_listened: seconds listened since the previous sync
+    :param duration:
+    :return: HTTP status code, 0 if the request could not be sent
+    """
+    sync_endpoint = f"/session/{session_id}/sync"
+    headers = {'Content-Type': 'application/json'}
+    session_update = {
+        'currentTime': float(current_time),
+        'timeListened': float(time_listened),
+        'duration': float(duration)
+    }
+    try:
+        r = await bookshelf_conn(POST=True, endpoint=sync_endpoint, Data=session_update, Headers=headers)
+        if r.status_code != 200:
+            logger.warning(f"Session sync failed. Status: {r.status_code}, Response: {r.text}")
+        else:
+            logger.debug(f'bookshelf session sync successful. {current_time}')
+        return r.status_code
+    except Exception as e:
+        logger.warning(f"Issue with sync: {e}")
+        return 0
+
+
 # Need to  revisit this at some point
 async def bookshelf_close_session(session_id: str):
     """
@@ -1341,7 +1743,7 @@ async def bookshelf_search_books(title: str, provider=DEFAULT_PROVIDER, author='
     :returns: data -> item object from ABS api.
     """
     endpoint = '/search/books'
-    bookshelfToken = os.environ.get("bookshelfToken")
+    bookshelfToken = current_token()
     bookshelfURL = os.getenv('bookshelfURL')
     bookshelfURL = bookshelfURL + "/api" + endpoint
 
@@ -1367,31 +1769,28 @@ async def bookshelf_search_books(title: str, provider=DEFAULT_PROVIDER, author='
         params = {"title": title, "author": author, "provider": provider}
 
     # GET Request for book title
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url=bookshelfURL, params=params, headers=tokenHeaders)
+    client = get_http_client()
+    response = await client.get(url=bookshelfURL, params=params, headers=tokenHeaders)
 
-        if response.status_code == 200:
-            data = response.json()
-            # Debug
-            if __name__ == '__main__':
-                print(data)
-            return data
+    if response.status_code == 200:
+        data = response.json()
+        # Debug
+        if __name__ == '__main__':
+            print(data)
+        return data
 
 
 async def bookshelf_get_valid_books() -> list:
     """
     :returns: found_books -> a list of all library items which is in a valid audio format.
     """
-    libraries = await bookshelf_libraries()
-    # Get libraries
     found_books = []
-    for name, (library_id, audiobooks_only) in libraries.items():
-        books = await bookshelf_all_library_items(library_id)
-        for book in books:
-            book_title = book.get('title')
-            book_id = book.get('id')
-            book_authors = book.get('author')
-            found_books.append({"title": book_title, "author": book_authors, "id": book_id})
+    books = await bookshelf_mirrored_items()
+    for book in books:
+        book_title = book.get('title')
+        book_id = book.get('id')
+        book_authors = book.get('author')
+        found_books.append({"title": book_title, "author": book_authors, "id": book_id})
 
     return found_books
 
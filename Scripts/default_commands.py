@@ -8,6 +8,7 @@ from datetime import datetime
 
 # Local file imports
 import bookshelfAPI as c
+import metrics
 import settings
 from utils import ownership_check, is_bot_owner, add_progress_indicators, get_extension_instance
 
@@ -52,6 +53,22 @@ class PrimaryCommands(Extension):
         await ctx.send(message, ephemeral=True)
         logger.debug(f' Successfully sent command: ping')
 
+    # Latency percentiles of the playback stages
+    @check(is_bot_owner)
+    @slash_command(name="perf", description="Latency percentiles (ms) of playback stages and ABS requests. Owner only.")
+    async def perf(self, ctx: SlashContext):
+        data = metrics.snapshot()
+        try:
+            # Refresh the web UI's copy while we're at it
+            metrics.write_snapshot()
+        except Exception as e:
+            logger.warning(f"Could not write metrics snapshot: {e}")
+
+        report = metrics.format_report(data)
+        since = datetime.fromtimestamp(data['since']).strftime('%Y-%m-%d %H:%M')
+        await ctx.send(f"Timings since {since}\n```\n{report[:1900]}\n```", ephemeral=True)
+        logger.debug(f' Successfully sent command: perf')
+
     # Self-explanatory, pulls all a library's items
     @slash_command(name="all-library-items",
                    description=f"Get all library items from the currently signed in ABS user. Default Command.")
@@ -261,17 +278,8 @@ class PrimaryCommands(Extension):
         try:
             await ctx.defer(ephemeral=self.ephemeral_output)
         
-            libraries = await c.bookshelf_libraries()
-            all_items = []
-        
-            # Gather items from all libraries
-            for name, (lib_id, audiobooks_only) in libraries.items():
-                # Get items sorted by addedAt, most recent first
-                items = await c.bookshelf_all_library_items(lib_id, params="sort=addedAt&desc=1&limit=20")
-                all_items.extend(items)
-        
-            # Sort all items by addedTime and get the most recent ones
-            items_sorted = sorted(all_items, key=lambda x: x.get('addedTime', 0), reverse=True)[:count]
+            # Most recent items across all libraries, newest first
+            items_sorted = await c.bookshelf_mirrored_items(sort='added', limit=count)
         
             if not items_sorted:
                 await ctx.send("No recently added items found.", ephemeral=self.ephemeral_output)
@@ -365,25 +373,15 @@ class PrimaryCommands(Extension):
         try:
             await ctx.defer(ephemeral=self.ephemeral_output)
         
-            # Get all books from specified library or all libraries
-            all_books = []
-            libraries = await c.bookshelf_libraries()
-
-
-
             if library:
                 # Use specific library
-                if library in [lib_id for name, (lib_id, audiobooks_only) in libraries.items()]:
-                    books = await c.bookshelf_all_library_items(library)
-                    all_books.extend(books)
-                else:
+                libraries = await c.bookshelf_libraries()
+                if library not in [lib_id for name, (lib_id, audiobooks_only) in libraries.items()]:
                     await ctx.send("Invalid library selected.", ephemeral=True)
                     return
-            else:
-                # Get books from all libraries
-                for name, (lib_id, audiobooks_only) in libraries.items():
-                    books = await c.bookshelf_all_library_items(lib_id)
-                    all_books.extend(books)
+
+            # Get all books from specified library or all libraries
+            all_books = await c.bookshelf_mirrored_items(library_id=library, genre=genre)
         
             if not all_books:
                 await ctx.send("No books found in your library.", ephemeral=True)
@@ -394,8 +392,12 @@ class PrimaryCommands(Extension):
                 filtered_books = []
                 for book in all_books:
                     try:
-                        book_details = await c.bookshelf_get_item_details(book['id'])
-                        book_genres = book_details.get('genres', '').lower()
+                        # Mirrored items carry their genres, otherwise look them up
+                        if 'genres' in book:
+                            book_genres = book['genres'].lower()
+                        else:
+                            book_details = await c.bookshelf_get_item_details(book['id'])
+                            book_genres = book_details.get('genres', '').lower()
                         if genre.lower() in book_genres:
                             filtered_books.append(book)
                     except:
@@ -0,0 +1,692 @@
+"""
+Library Mirror - local copy of the library item index.
+
+Commands that need every item of a library (random, discover, recently added, new book checks, csv export)
+read from this table instead of enumerating the libraries over HTTP on every call. The mirror is refreshed
+incrementally: items are paged from ABS sorted by updatedAt until the stored watermark is reached, and a full
+pass only runs when the item count no longer matches the server (items were removed).
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Iterable, Optional, List, Tuple
+from abc import ABC, abstractmethod
+
+import bookshelfAPI as c
+import metrics
+import search_index
+import series_index
+import settings as s
+
+logger = logging.getLogger("bot")
+
+# Database configuration from environment variables
+DB_TYPE = os.getenv('DB_TYPE', 'sqlite').lower()  # 'sqlite' or 'mariadb'
+DB_HOST = os.getenv('DB_HOST', 'localhost')
+DB_PORT = int(os.getenv('DB_PORT', '3306'))
+DB_USER = os.getenv('DB_USER', 'root')
+DB_PASSWORD = os.getenv('DB_PASSWORD', '')
+DB_NAME = os.getenv('DB_NAME', 'bookshelf')
+
+ITEM_COLUMNS = ('id, library_id, title, authors, narrators, series, genres, published_year, asin, duration, '
+                'added_at, updated_at, media_type, is_ebook')
+
+# A first full pass of a large library takes a while, allow it more than a regular request
+REFRESH_FETCH_TIMEOUT = 300
+
+SORT_ORDERS = {
+    'title': 'title',
+    'author': 'authors, title',
+    'added': 'added_at DESC',
+}
+
+
+# Abstract Database Interface
+class LibraryDatabaseInterface(ABC):
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def create_library_tables(self):
+        pass
+
+    @abstractmethod
+    async def upsert_items(self, rows: List[Tuple]):
+        pass
+
+    @abstractmethod
+    async def get_item_ids(self, library_id: str) -> set:
+        pass
+
+    @abstractmethod
+    async def delete_items(self, item_ids: List[str]):
+        pass
+
+    @abstractmethod
+    async def delete_library(self, library_id: str):
+        pass
+
+    @abstractmethod
+    async def count_items(self, library_id: str) -> int:
+        pass
+
+    @abstractmethod
+    async def get_sync_state(self, library_id: str) -> Optional[Tuple]:
+        pass
+
+    @abstractmethod
+    async def set_sync_state(self, library_id: str, updated_at: int, item_count: int):
+        pass
+
+    @abstractmethod
+    async def get_synced_libraries(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    async def query_items(self, library_id: str = None, sort: str = 'title', limit: int = None,
+                          include_ebooks: bool = False, added_since: int = None, media_type: str = None,
+                          genre: str = None, library_ids: Iterable[str] = None) -> List[Tuple]:
+        pass
+
+
+def _build_query(placeholder: str, library_id: str = None, sort: str = 'title', limit: int = None,
+                 include_ebooks: bool = False, added_since: int = None, media_type: str = None,
+                 genre: str = None, library_ids: Iterable[str] = None) -> Tuple[str, list]:
+    """
+    Shared SELECT builder, placeholder is '?' for SQLite and '%s' for MariaDB.
+    """
+    clauses = []
+    params = []
+    if library_id:
+        clauses.append(f"library_id = {placeholder}")
+        params.append(library_id)
+    if library_ids is not None:
+        library_ids = list(library_ids)
+        if library_ids:
+            clauses.append(f"library_id IN ({', '.join([placeholder] * len(library_ids))})")
+            params.extend(library_ids)
+        else:
+            clauses.append("1 = 0")
+    if not include_ebooks:
+        clauses.append("is_ebook = 0")
+    if added_since is not None:
+        clauses.append(f"added_at >= {placeholder}")
+        params.append(int(added_since))
+    if media_type:
+        clauses.append(f"media_type = {placeholder}")
+        params.append(media_type)
+    if genre:
+        clauses.append(f"LOWER(genres) LIKE {placeholder}")
+        params.append(f"%{genre.lower()}%")
+
+    query = f"SELECT {ITEM_COLUMNS} FROM library_items"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += f" ORDER BY {SORT_ORDERS.get(sort, SORT_ORDERS['title'])}"
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    return query, params
+
+
+# SQLite Implementation
+class SQLiteLibraryDatabase(LibraryDatabaseInterface):
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = None
+        self.cursor = None
+
+    async def connect(self):
+        import sqlite_manager
+        self.conn = await sqlite_manager.connect(self.db_path)
+        self.cursor = await self.conn.cursor()
+        logger.info(f"Connected to SQLite database: {self.db_path}")
+
+    async def close(self):
+        if self.conn:
+            import sqlite_manager
+            await self.cursor.close()
+            await sqlite_manager.release(self.db_path)
+            self.conn = None
+
+    async def create_library_tables(self):
+        await self.cursor.execute('''
+CREATE TABLE IF NOT EXISTS library_items (
+    id TEXT PRIMARY KEY,
+    library_id TEXT NOT NULL,
+    title TEXT NOT NULL COLLATE NOCASE,
+    authors TEXT COLLATE NOCASE,
+    narrators TEXT,
+    series TEXT,
+    genres TEXT,
+    published_year TEXT,
+    asin TEXT,
+    duration REAL NOT NULL DEFAULT 0,
+    added_at INTEGER NOT NULL DEFAULT 0,
+    updated_at INTEGER NOT NULL DEFAULT 0,
+    media_type TEXT NOT NULL,
+    is_ebook INTEGER NOT NULL DEFAULT 0
+)
+        ''')
+        await self.cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_library_items_library ON library_items (library_id)')
+        await self.cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_library_items_added ON library_items (added_at)')
+        await self.cursor.execute('''
+CREATE TABLE IF NOT EXISTS library_sync_state (
+    library_id TEXT PRIMARY KEY,
+    updated_at INTEGER NOT NULL DEFAULT 0,
+    item_count INTEGER NOT NULL DEFAULT 0,
+    last_refresh INTEGER NOT NULL DEFAULT 0
+)
+        ''')
+        await self.conn.commit()
+
+    async def upsert_items(self, rows: List[Tuple]):
+        await self.cursor.executemany(f'''
+INSERT OR REPLACE INTO library_items ({ITEM_COLUMNS})
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', rows)
+        await self.conn.commit()
+
+    async def get_item_ids(self, library_id: str) -> set:
+        await self.cursor.execute('SELECT id FROM library_items WHERE library_id = ?', (library_id,))
+        rows = await self.cursor.fetchall()
+        return {row[0] for row in rows}
+
+    async def delete_items(self, item_ids: List[str]):
+        await self.cursor.executemany('DELETE FROM library_items WHERE id = ?', [(i,) for i in item_ids])
+        await self.conn.commit()
+
+    async def delete_library(self, library_id: str):
+        await self.cursor.execute('DELETE FROM library_items WHERE library_id = ?', (library_id,))
+        await self.cursor.execute('DELETE FROM library_sync_state WHERE library_id = ?', (library_id,))
+        await self.conn.commit()
+
+    async def count_items(self, library_id: str) -> int:
+        await self.cursor.execute('SELECT COUNT(*) FROM library_items WHERE library_id = ?', (library_id,))
+        row = await self.cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    async def get_sync_state(self, library_id: str) -> Optional[Tuple]:
+        await self.cursor.execute(
+            'SELECT updated_at, item_count, last_refresh FROM library_sync_state WHERE library_id = ?',
+            (library_id,))
+        return await self.cursor.fetchone()
+
+    async def set_sync_state(self, library_id: str, updated_at: int, item_count: int):
+        await self.cursor.execute('''
+INSERT OR REPLACE INTO library_sync_state (library_id, updated_at, item_count, last_refresh)
+VALUES (?, ?, ?, ?)''', (library_id, int(updated_at), int(item_count), int(time.time())))
+        await self.conn.commit()
+
+    async def get_synced_libraries(self) -> List[str]:
+        await self.cursor.execute('SELECT library_id FROM library_sync_state')
+        rows = await self.cursor.fetchall()
+        return [row[0] for row in rows]
+
+    async def query_items(self, library_id: str = None, sort: str = 'title', limit: int = None,
+                          include_ebooks: bool = False, added_since: int = None, media_type: str = None,
+                          genre: str = None, library_ids: Iterable[str] = None) -> List[Tuple]:
+        query, params = _build_query('?', library_id, sort, limit, include_ebooks, added_since, media_type, genre,
+                                    library_ids)
+        await self.cursor.execute(query, params)
+        return await self.cursor.fetchall()
+
+
+# MariaDB Implementation
+class MariaDBLibraryDatabase(LibraryDatabaseInterface):
+    def __init__(self, host: str, port: int, user: str, password: str, database: str):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.database = database
+        self.pool = None
+
+    async def connect(self):
+        import aiomysql
+        self.pool = await aiomysql.create_pool(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            db=self.database,
+            autocommit=True
+        )
+        logger.info(f"Connected to MariaDB database: {self.database}")
+
+    async def close(self):
+        if self.pool:
+            self.pool.close()
+            await self.pool.wait_closed()
+
+    async def create_library_tables(self):
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('''
+CREATE TABLE IF NOT EXISTS library_items (
+    id VARCHAR(64) PRIMARY KEY,
+    library_id VARCHAR(64) NOT NULL,
+    title TEXT NOT NULL,
+    authors TEXT,
+    narrators TEXT,
+    series TEXT,
+    genres TEXT,
+    published_year VARCHAR(16),
+    asin VARCHAR(32),
+    duration DOUBLE NOT NULL DEFAULT 0,
+    added_at BIGINT NOT NULL DEFAULT 0,
+    updated_at BIGINT NOT NULL DEFAULT 0,
+    media_type VARCHAR(16) NOT NULL,
+    is_ebook TINYINT NOT NULL DEFAULT 0,
+    INDEX idx_library_items_library (library_id),
+    INDEX idx_library_items_added (added_at)
+)
+                ''')
+                await cursor.execute('''
+CREATE TABLE IF NOT EXISTS library_sync_state (
+    library_id VARCHAR(64) PRIMARY KEY,
+    updated_at BIGINT NOT NULL DEFAULT 0,
+    item_count INT NOT NULL DEFAULT 0,
+    last_refresh BIGINT NOT NULL DEFAULT 0
+)
+                ''')
+
+    async def upsert_items(self, rows: List[Tuple]):
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany(f'''
+REPLACE INTO library_items ({ITEM_COLUMNS})
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)''', rows)
+
+    async def get_item_ids(self, library_id: str) -> set:
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('SELECT id FROM library_items WHERE library_id = %s', (library_id,))
+                rows = await cursor.fetchall()
+                return {row[0] for row in rows}
+
+    async def delete_items(self, item_ids: List[str]):
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany('DELETE FROM library_items WHERE id = %s', [(i,) for i in item_ids])
+
+    async def delete_library(self, library_id: str):
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('DELETE FROM library_items WHERE library_id = %s', (library_id,))
+                await cursor.execute('DELETE FROM library_sync_state WHERE library_id = %s', (library_id,))
+
+    async def count_items(self, library_id: str) -> int:
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('SELECT COUNT(*) FROM library_items WHERE library_id = %s', (library_id,))
+                row = await cursor.fetchone()
+                return int(row[0]) if row else 0
+
+    async def get_sync_state(self, library_id: str) -> Optional[Tuple]:
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    'SELECT updated_at, item_count, last_refresh FROM library_sync_state WHERE library_id = %s',
+                    (library_id,))
+                return await cursor.fetchone()
+
+    async def set_sync_state(self, library_id: str, updated_at: int, item_count: int):
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('''
+REPLACE INTO library_sync_state (library_id, updated_at, item_count, last_refresh)
+VALUES (%s, %s, %s, %s)''', (library_id, int(updated_at), int(item_count), int(time.time())))
+
+    async def get_synced_libraries(self) -> List[str]:
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('SELECT library_id FROM library_sync_state')
+                rows = await cursor.fetchall()
+                return [row[0] for row in rows]
+
+    async def query_items(self, library_id: str = None, sort: str = 'title', limit: int = None,
+                          include_ebooks: bool = False, added_since: int = None, media_type: str = None,
+                          genre: str = None, library_ids: Iterable[str] = None) -> List[Tuple]:
+        query, params = _build_query('%s', library_id, sort, limit, include_ebooks, added_since, media_type, genre,
+                                    library_ids)
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                return await cursor.fetchall()
+
+
+# Database Factory
+def create_library_database() -> LibraryDatabaseInterface:
+    if DB_TYPE == 'mariadb':
+        return MariaDBLibraryDatabase(DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME)
+    else:
+        db_path = 'db/library.db'
+        return SQLiteLibraryDatabase(db_path)
+
+
+# Global database instance
+library_db: Optional[LibraryDatabaseInterface] = None
+
+# Serializes refreshes, concurrent callers wait for the running refresh instead of starting their own
+_refresh_lock = asyncio.Lock()
+_last_refresh = 0.0
+_warmup_task: Optional[asyncio.Task] = None
+
+
+async def initialize_library_mirror():
+    global library_db
+    if not s.LIBRARY_MIRROR:
+        logger.info("Library mirror disabled, library items will be fetched from ABS on every call")
+        return
+    library_db = create_library_database()
+    await library_db.connect()
+    await library_db.create_library_tables()
+    logger.info(f"Initialized library mirror using {DB_TYPE}")
+    # Fill the mirror in the background so the first command doesn't wait for a full library listing
+    global _warmup_task
+    _warmup_task = asyncio.create_task(_warmup())
+
+
+async def close_library_mirror():
+    global library_db
+    if _warmup_task and not _warmup_task.done():
+        _warmup_task.cancel()
+    if library_db:
+        await library_db.close()
+        library_db = None
+
+
+def is_available() -> bool:
+    return library_db is not None
+
+
+async def _warmup():
+    await refresh_libraries()
+    await search_index.ensure_loaded()
+
+
+def schedule_refresh():
+    """
+    Start a background refresh if the mirror is stale, for callers that can't wait for one.
+    """
+    global _warmup_task
+    if library_db is None or _refresh_lock.locked():
+        return
+    if _last_refresh and time.monotonic() - _last_refresh < s.LIBRARY_MIRROR_TTL:
+        return
+    if _warmup_task and not _warmup_task.done():
+        return
+    _warmup_task = asyncio.create_task(refresh_libraries())
+
+
+# Refresh ---------------------------------
+
+def _item_row(library_id: str, item: dict) -> Tuple:
+    media = item.get('media', {}) or {}
+    metadata = media.get('metadata', {}) or {}
+    genres = metadata.get('genres') or []
+    return (
+        item.get('id'),
+        library_id,
+        metadata.get('title') or 'Untitled',
+        metadata.get('authorName') or metadata.get('author') or '',
+        metadata.get('narratorName') or '',
+        metadata.get('seriesName') or '',
+        ', '.join(genres) if isinstance(genres, list) else str(genres),
+        str(metadata.get('publishedYear') or ''),
+        metadata.get('asin') or '',
+        float(media.get('duration') or 0.0),
+        int(item.get('addedAt') or 0),
+        int(item.get('updatedAt') or 0),
+        item.get('mediaType', 'book'),
+        # Same rule as bookshelf_all_library_items, items carrying an ebook are not playable entries
+        1 if media.get('ebookFormat') else 0
+    )
+
+
+async def _fetch_page(library_id: str, page: int) -> Optional[dict]:
+    endpoint = f"/libraries/{library_id}/items"
+    params = f"&sort=updatedAt&desc=1&minified=1&limit={s.LIBRARY_MIRROR_PAGE_SIZE}&page={page}"
+    try:
+        r = await c.bookshelf_conn(GET=True, endpoint=endpoint, params=params)
+        if r.status_code == 200:
+            return r.json()
+        logger.warning(f"Library mirror: failed to fetch page {page} of {library_id}, status {r.status_code}")
+    except Exception as e:
+        logger.warning(f"Library mirror: error fetching page {page} of {library_id}: {e}")
+    return None
+
+
+async def _collect_changes(library_id: str, watermark: int, full: bool) -> Optional[dict]:
+    """
+    Page through a library newest-updated first, down to the watermark. Only talks to ABS, no database access,
+    so several libraries can be collected at once.
+    :param library_id:
+    :param watermark: updatedAt of the last refresh in ms
+    :param full: ignore the watermark and read the whole library
+    :return: dict with rows, seen_ids, newest and total, or None if a page could not be fetched
+    """
+    rows = []
+    seen_ids = set()
+    newest = watermark
+    total = None
+    page = 0
+    while True:
+        data = await _fetch_page(library_id, page)
+        if data is None:
+            return None
+
+        results = data.get('results', [])
+        total = data.get('total', total)
+        reached_watermark = False
+        for item in results:
+            updated_at = int(item.get('updatedAt') or 0)
+            # Items updated in the same millisecond as the watermark are re-read, upserts are idempotent
+            if not full and updated_at < watermark:
+                reached_watermark = True
+                break
+            rows.append(_item_row(library_id, item))
+            seen_ids.add(item.get('id'))
+            newest = max(newest, updated_at)
+
+        if reached_watermark or len(results) < s.LIBRARY_MIRROR_PAGE_SIZE:
+            break
+        page += 1
+
+    return {'rows': rows, 'seen_ids': seen_ids, 'newest': newest, 'total': total}
+
+
+@metrics.timed('db.query', db='library', query='apply_changes')
+async def _apply_changes(library_id: str, changes: dict, full: bool) -> bool:
+    """
+    Write collected changes to the mirror and the search index.
+    :return: False if the local item count disagrees with the server after an incremental pass
+    """
+    rows = changes['rows']
+    if rows:
+        await library_db.upsert_items(rows)
+        search_index.index_items([_row_to_item(row) for row in rows])
+        series_index.invalidate(library_id)
+
+    if full:
+        removed = (await library_db.get_item_ids(library_id)) - changes['seen_ids']
+        if removed:
+            await library_db.delete_items(list(removed))
+            search_index.remove_items(removed)
+            series_index.invalidate(library_id)
+            logger.info(f"Library mirror: removed {len(removed)} deleted items from {library_id}")
+
+    count = await library_db.count_items(library_id)
+    total = changes['total']
+    if not full and total is not None and count != int(total):
+        # Deletions don't move the updatedAt watermark, the caller reconciles with a full pass
+        logger.info(f"Library mirror: {library_id} has {count} items locally, {total} on the server")
+        return False
+
+    await library_db.set_sync_state(library_id, changes['newest'], count)
+    logger.debug(f"Library mirror: {library_id} {'fully' if full else 'incrementally'} refreshed, "
+                 f"{len(rows)} items written, {count} items total")
+    return True
+
+
+async def refresh_library(library_id: str, full: bool = False) -> bool:
+    """
+    Bring the mirror of one library up to date.
+    :param library_id:
+    :param full: page through the whole library and drop items that no longer exist
+    :return: True if the library was refreshed
+    """
+    state = await library_db.get_sync_state(library_id)
+    if state is None:
+        full = True
+    watermark = 0 if full else int(state[0])
+
+    changes = await _collect_changes(library_id, watermark, full)
+    if changes is None:
+        return False
+    if await _apply_changes(library_id, changes, full):
+        return True
+
+    logger.info(f"Library mirror: running a full refresh of {library_id}")
+    return await refresh_library(library_id, full=True)
+
+
+async def _library_removed(library_id: str) -> bool:
+    """
+    :param library_id: a mirrored library missing from the library listing
+    :return: True only if ABS confirms the library no longer exists, not when it is hidden from the user
+    """
+    try:
+        r = await c.bookshelf_conn(GET=True, endpoint=f'/libraries/{library_id}')
+        return r.status_code == 404
+    except Exception as e:
+        logger.warning(f"Library mirror: could not check whether library {library_id} still exists: {e}")
+        return False
+
+
+async def refresh_libraries(force: bool = False) -> bool:
+    """
+    Refresh every library, at most once per LIBRARY_MIRROR_TTL unless forced.
+    Libraries are fetched from ABS concurrently, the database writes then happen one library at a time.
+    :param force: refresh even if the mirror is still fresh
+    :return: True if the mirror is usable
+    """
+    global _last_refresh
+    if library_db is None:
+        return False
+
+    async with _refresh_lock:
+        if not force and time.monotonic() - _last_refresh < s.LIBRARY_MIRROR_TTL and _last_refresh:
+            return True
+
+        started = time.perf_counter()
+        libraries = await c.bookshelf_libraries()
+        if not libraries:
+            # Keep serving whatever we have if ABS can't be reached
+            return bool(await library_db.get_synced_libraries())
+
+        library_ids = [library_id for name, (library_id, audiobooks_only) in libraries.items()]
+        watermarks = {}
+        for library_id in library_ids:
+            state = await library_db.get_sync_state(library_id)
+            # A library without sync state gets a full first pass
+            watermarks[library_id] = None if state is None else int(state[0])
+
+        async def collect(library_id, name):
+            watermark = watermarks[library_id]
+            return await _collect_changes(library_id, watermark or 0, watermark is None)
+
+        collected = await c.bookshelf_library_fanout(collect, libraries, timeout=REFRESH_FETCH_TIMEOUT)
+
+        ok = len(collected) == len(library_ids)
+        for library_id, name, changes in collected:
+            try:
+                if changes is None:
+                    ok = False
+                elif not await _apply_changes(library_id, changes, watermarks[library_id] is None):
+                    ok = await refresh_library(library_id, full=True) and ok
+            except Exception as e:
+                logger.error(f"Library mirror: error refreshing {library_id}: {e}")
+                ok = False
+
+        for library_id in await library_db.get_synced_libraries():
+            # Libraries the current user can't see are still mirrored for the others, only removed ones go
+            if library_id not in library_ids and await _library_removed(library_id):
+                search_index.remove_items(await library_db.get_item_ids(library_id))
+                await library_db.delete_library(library_id)
+                series_index.remove_library(library_id)
+                logger.info(f"Library mirror: dropped removed library {library_id}")
+
+        if ok:
+            _last_refresh = time.monotonic()
+        metrics.observe('task.run', (time.perf_counter() - started) * 1000, task='library_mirror_refresh')
+        return True
+
+
+# Queries ---------------------------------
+
+def _row_to_item(row: Tuple) -> dict:
+    (item_id, library_id, title, authors, narrators, series, genres, published_year, asin, duration,
+     added_at, updated_at, media_type, is_ebook) = row
+    return {
+        'id': item_id,
+        'libraryId': library_id,
+        'title': title,
+        'author': authors,
+        'narrator': narrators,
+        'series': series,
+        'genres': genres,
+        'publishedYear': published_year,
+        'asin': asin,
+        'duration': duration,
+        'addedTime': added_at,
+        'updatedAt': updated_at,
+        'mediaType': media_type,
+        'ebook': bool(is_ebook)
+    }
+
+
+async def get_items(library_id: str = None, sort: str = 'title', limit: int = None, include_ebooks: bool = False,
+                    added_since: int = None, media_type: str = None, genre: str = None,
+                    refresh: bool = False, stale_ok: bool = False,
+                    library_ids: Iterable[str] = None) -> Optional[list]:
+    """
+    Query the mirror, refreshing it first when it is stale.
+    Items use the keys of bookshelf_all_library_items (id, title, author, addedTime, mediaType) plus metadata.
+    :param library_id: restrict to one library
+    :param sort: 'title', 'author' or 'added' (newest first)
+    :param limit:
+    :param include_ebooks:
+    :param added_since: addedAt in ms
+    :param media_type: 'book' or 'podcast'
+    :param genre: case-insensitive substring of the genres
+    :param refresh: force an incremental refresh before querying
+    :param stale_ok: answer from the stored items and refresh in the background instead of waiting
+    :param library_ids: restrict to these libraries, all stored libraries when None
+    :return: list of item dicts, or None if the mirror is not available
+    """
+    if library_db is None:
+        return None
+    try:
+        if stale_ok:
+            schedule_refresh()
+            if not await library_db.get_synced_libraries():
+                # Nothing stored yet, the first refresh is still running
+                return None
+        elif not await refresh_libraries(force=refresh):
+            return None
+        with metrics.span('db.query', db='library', query='query_items'):
+            rows = await library_db.query_items(library_id=library_id, sort=sort, limit=limit,
+                                                include_ebooks=include_ebooks, added_since=added_since,
+                                                media_type=media_type, genre=genre, library_ids=library_ids)
+        return [_row_to_item(row) for row in rows]
+    except Exception as e:
+        logger.error(f"Library mirror query failed: {e}")
+        return None
@@ -15,8 +15,12 @@ from threading import Thread
 import bookshelfAPI as c
 import db_additions
 import settings
+import sqlite_manager
 from subscription_task import conn_test, initialize_task_database, close_task_database
 from wishlist import initialize_database as initialize_wishlist_database, close_database as close_wishlist_database
+from library_mirror import initialize_library_mirror, close_library_mirror
+from multi_user import initialize_user_database, close_user_database, insert_data as insert_user_data
+import metrics
 from interactions.api.events import *
 from settings_watcher import SettingsWatcher, reload_bot_components
 
@@ -146,6 +150,22 @@ async def on_startup(event: Startup):
         logger.error(f"Failed to initialize task database: {e}")
         raise
 
+    try:
+        await initialize_user_database()
+        logger.info("User database initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize user database: {e}")
+        raise
+
+    try:
+        await initialize_library_mirror()
+    except Exception as e:
+        # Not fatal, library lookups fall back to the ABS api
+        logger.error(f"Failed to initialize library mirror: {e}")
+
+    # Timing snapshot for the web UI
+    metrics.start_snapshot_writer()
+
     # Start settings watcher for auto-reload
     global settings_watcher
     env_file = os.path.join(os.path.dirname(__file__), ".env")
@@ -164,17 +184,11 @@ async def on_startup(event: Startup):
         logger.warning(f'EXPERIMENTAL FEATURES ENABLED!')
 
     if MULTI_USER:
-        import multi_user as mu
         user_token = os.getenv('bookshelfToken')
         user_info = c.bookshelf_user_login(token=user_token)
         username = user_info['username']
         if username != '':
-            # Check if multi_user also needs async conversion
-            try:
-                mu.insert_data(discord_id=owner_id, user=username, token=user_token)
-            except Exception as e:
-                # If multi_user is also async
-                await mu.insert_data(discord_id=owner_id, user=username, token=user_token)
+            await insert_user_data(discord_id=owner_id, user=username, token=user_token)
             logger.info(f'Registered initial user {username} successfully')
             if not DEBUG_MODE and INITIALIZED_MSG:
                 await owner.send(f'Bot is ready. Logged in as {bot.user}. ABS user: {username} signed in.')
@@ -207,6 +221,31 @@ async def on_disconnect(event):
     except Exception as e:
         logger.error(f"Error closing task database: {e}")
 
+    try:
+        await close_user_database()
+        logger.info("User database closed successfully")
+    except Exception as e:
+        logger.error(f"Error closing user database: {e}")
+
+    try:
+        await close_library_mirror()
+        logger.info("Library mirror closed successfully")
+    except Exception as e:
+        logger.error(f"Error closing library mirror: {e}")
+
+    try:
+        await sqlite_manager.close_all()
+    except Exception as e:
+        logger.error(f"Error closing SQLite connections: {e}")
+
+    metrics.stop_snapshot_writer()
+
+    try:
+        await c.close_http_client()
+        logger.info("HTTP client closed successfully")
+    except Exception as e:
+        logger.error(f"Error closing HTTP client: {e}")
+
     # Stop settings watcher
     global settings_watcher
     if settings_watcher:
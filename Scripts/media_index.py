@@ -0,0 +1,121 @@
+"""
+Sorted lookup tables for playback positions.
+Built once per item so position lookups during playback are a bisect instead of a scan or a server round trip.
+"""
+from bisect import bisect_right
+
+
+class ChapterIndex:
+    """
+    Chapters of a library item sorted by start time.
+    """
+
+    def __init__(self, item_id: str = '', chapters: list = None):
+        self.item_id = item_id
+        self.chapters = sorted(chapters or [], key=lambda ch: float(ch.get('start', 0)))
+        self.starts = [float(ch.get('start', 0)) for ch in self.chapters]
+
+    def __len__(self):
+        return len(self.chapters)
+
+    def __bool__(self):
+        return bool(self.chapters)
+
+    def index_at(self, position: float):
+        """
+        :param position: playback position in seconds
+        :return: index of the chapter containing position, or None if there are no chapters
+        """
+        if not self.chapters:
+            return None
+        if position is None:
+            position = 0.0
+        # Positions before the first start belong to the first chapter, past the end to the last
+        return max(0, bisect_right(self.starts, float(position)) - 1)
+
+    def chapter_at(self, position: float):
+        """
+        :param position: playback position in seconds
+        :return: chapter dict containing position, or None if there are no chapters
+        """
+        index = self.index_at(position)
+        return self.chapters[index] if index is not None else None
+
+    def index_of(self, chapter: dict):
+        """
+        :param chapter: chapter dict as returned by the ABS api
+        :return: position of chapter in the sorted list, or None if it is not part of this index
+        """
+        if not chapter:
+            return None
+        chapter_id = chapter.get('id')
+        for index, ch in enumerate(self.chapters):
+            if ch.get('id') == chapter_id:
+                return index
+        return None
+
+
+class TrackIndex:
+    """
+    Audio files of a library item laid out on the global timeline of the book.
+    Each track is a dict with at least 'url' and 'duration', 'start' is filled in with its offset in the book.
+    """
+
+    def __init__(self, item_id: str = '', tracks: list = None):
+        self.item_id = item_id
+        self.tracks = []
+        self.starts = []
+        offset = 0.0
+        for track in tracks or []:
+            track = dict(track)
+            track['start'] = offset
+            self.tracks.append(track)
+            self.starts.append(offset)
+            offset += float(track.get('duration') or 0.0)
+        self.duration = offset
+
+    @classmethod
+    def from_audio_files(cls, item_id: str, audio_files: list, url_for):
+        """
+        :param item_id:
+        :param audio_files: media.audioFiles of a book item
+        :param url_for: callable returning the stream url of an audio file
+        :return: TrackIndex of the playable files in their playback order
+        """
+        playable = [f for f in audio_files or [] if not f.get('exclude') and not f.get('invalid')]
+        playable.sort(key=lambda f: f.get('index') or 0)
+        tracks = [{'ino': f.get('ino', ''), 'url': url_for(f), 'duration': float(f.get('duration') or 0.0)}
+                  for f in playable]
+        return cls(item_id, tracks)
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def __bool__(self):
+        return bool(self.tracks)
+
+    def locate(self, position: float):
+        """
+        :param position: position in the book in seconds
+        :return: (track index, offset inside that track), or None if there are no tracks
+        """
+        if not self.tracks:
+            return None
+        position = max(0.0, float(position or 0.0))
+        index = max(0, bisect_right(self.starts, position) - 1)
+        return index, position - self.starts[index]
+
+    def ffconcat(self, position: float) -> str:
+        """
+        Build an ffconcat playlist that starts at position and chains every following track.
+        :param position: position in the book in seconds
+        :return: playlist text for the ffmpeg concat demuxer
+        """
+        index, offset = self.locate(position)
+        lines = ['ffconcat version 1.0']
+        for i, track in enumerate(self.tracks[index:]):
+            url = track['url'].replace("'", "'\\''")
+            lines.append(f"file '{url}'")
+            if i == 0 and offset > 0:
+                lines.append(f"inpoint {offset:.3f}")
+        return '\n'.join(lines) + '\n'
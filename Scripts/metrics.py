@@ -0,0 +1,383 @@
+"""
+Metrics - latency histograms, counters and gauges of the bot.
+
+Durations are recorded with span() around a block or timed() on a coroutine function, each series keeps
+bucket counts for Prometheus and the most recent RESERVOIR_SIZE samples for percentiles. Counters are
+bumped with inc(), values that already live elsewhere (cache statistics, active sessions) are read by
+collectors when a snapshot is taken. The bot periodically writes the snapshot to SNAPSHOT_PATH, which is
+how the web UI, running in its own process, gets to see them.
+"""
+import asyncio
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger("bot")
+
+# Samples kept per histogram, percentiles describe roughly the last RESERVOIR_SIZE operations
+RESERVOIR_SIZE = 1024
+
+# Upper bounds in milliseconds of the histogram buckets
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Snapshot shared with the web UI process
+SNAPSHOT_PATH = os.path.join("db", "metrics.json")
+
+# Prefix of every metric name in the Prometheus exposition
+PROMETHEUS_PREFIX = "traveller_"
+
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """
+    Durations in milliseconds of one stage. Samples also arrive from the voice thread, so every access holds
+    the histogram's lock.
+    """
+
+    def __init__(self, size: int = RESERVOIR_SIZE):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=size)
+        self._buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for position, bound in enumerate(BUCKETS):
+            if value <= bound:
+                break
+        else:
+            position = len(BUCKETS)
+        with self._lock:
+            self._samples.append(value)
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+            self._buckets[position] += 1
+
+    def percentile(self, p: float, ordered: list = None) -> float:
+        """
+        Nearest-rank percentile of the kept samples.
+        :param p: 0-100
+        :param ordered: the samples already sorted, to compute several percentiles in one pass
+        :return: value in milliseconds, 0.0 without samples
+        """
+        if ordered is None:
+            with self._lock:
+                ordered = sorted(self._samples)
+        if not ordered:
+            return 0.0
+        rank = max(1, -(-len(ordered) * p // 100))
+        return ordered[int(rank) - 1]
+
+    def summary(self) -> dict:
+        with self._lock:
+            ordered = sorted(self._samples)
+            count, total, maximum = self.count, self.total, self.max
+            bucket_counts = list(self._buckets)
+
+        result = {'count': count,
+                  'sum': round(total, 1),
+                  'mean': round(total / count, 1) if count else 0.0,
+                  'max': round(maximum, 1)}
+        for p in PERCENTILES:
+            result[f'p{p}'] = round(self.percentile(p, ordered), 1)
+
+        # Cumulative, as Prometheus expects them
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(BUCKETS, bucket_counts):
+            cumulative += count
+            buckets.append([bound, cumulative])
+        result['buckets'] = buckets
+        return result
+
+
+# (name, labels) -> Histogram / value, labels is a sorted tuple of (key, value) pairs
+_histograms = {}
+_counters = {}
+_gauges = {}
+_collectors = []
+# Spans are also closed and counters bumped from the voice thread
+_lock = threading.Lock()
+_started = time.time()
+_writer_task = None
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def display_name(name: str, labels) -> str:
+    """
+    :return: name{key="value",...}, or just name without labels
+    """
+    labels = dict(labels)
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{key}="{value}"' for key, value in sorted(labels.items())) + '}'
+
+
+def histogram(name: str, **labels) -> Histogram:
+    key = _key(name, labels)
+    hist = _histograms.get(key)
+    if hist is None:
+        with _lock:
+            hist = _histograms.setdefault(key, Histogram())
+    return hist
+
+
+def observe(name: str, milliseconds: float, **labels):
+    """
+    Record a duration.
+    :param name: stage name, e.g. 'play.build_session'
+    :param milliseconds:
+    :param labels: e.g. endpoint='/items/:id'
+    """
+    histogram(name, **labels).observe(milliseconds)
+
+
+def inc(name: str, amount: float = 1, **labels):
+    """
+    Add to a counter.
+    :param name: e.g. 'ffmpeg.restarts'
+    :param amount:
+    :param labels:
+    """
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(name: str, value: float, **labels):
+    """
+    :param name:
+    :param value: current value
+    :param labels:
+    """
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def register_collector(func):
+    """
+    Register a function called on every snapshot, for values that are kept elsewhere.
+    :param func: returns an iterable of (kind, name, labels dict, value), kind is 'counter' or 'gauge'
+    """
+    if func not in _collectors:
+        _collectors.append(func)
+
+
+@contextmanager
+def span(name: str, **labels):
+    """
+    Time the enclosed block, failed blocks are recorded as well.
+    :param name: stage name
+    :param labels:
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - start) * 1000, **labels)
+
+
+def timed(name: str, **labels):
+    """
+    Decorator timing every call of a coroutine function.
+    :param name: stage name
+    :param labels:
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _series(values: dict) -> list:
+    return [{'name': name, 'labels': dict(labels), 'value': value}
+            for (name, labels), value in sorted(values.items())]
+
+
+def snapshot() -> dict:
+    """
+    :return: {'generated': unix time, 'since': unix time,
+              'histograms': {display name: summary with name and labels},
+              'counters': [{name, labels, value}], 'gauges': [{name, labels, value}]}
+    """
+    with _lock:
+        histograms = list(_histograms.items())
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+
+    for collector in list(_collectors):
+        try:
+            for kind, name, labels, value in collector():
+                target = counters if kind == 'counter' else gauges
+                target[_key(name, labels)] = value
+        except Exception as e:
+            logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+
+    summaries = {}
+    for (name, labels), hist in sorted(histograms, key=lambda entry: entry[0]):
+        summary = hist.summary()
+        summary['name'] = name
+        summary['labels'] = dict(labels)
+        summaries[display_name(name, labels)] = summary
+
+    return {
+        'generated': time.time(),
+        'since': _started,
+        'histograms': summaries,
+        'counters': _series(counters),
+        'gauges': _series(gauges)
+    }
+
+
+def write_snapshot(path: str = SNAPSHOT_PATH):
+    """
+    Write the snapshot atomically, readers never see a partial file.
+    :param path:
+    """
+    data = snapshot()
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as tmp:
+        json.dump(data, tmp)
+    os.replace(tmp.name, path)
+
+
+def read_snapshot(path: str = SNAPSHOT_PATH) -> Optional[dict]:
+    """
+    :param path:
+    :return: the last snapshot written by the bot, or None if there is none
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read metrics snapshot: {e}")
+        return None
+
+
+async def _write_periodically(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            write_snapshot()
+        except Exception as e:
+            logger.warning(f"Could not write metrics snapshot: {e}")
+
+
+def start_snapshot_writer(interval: float = None):
+    """
+    Write the snapshot every interval seconds in the background.
+    :param interval: defaults to METRICS_SNAPSHOT_INTERVAL
+    """
+    global _writer_task
+    if _writer_task and not _writer_task.done():
+        return
+    if interval is None:
+        import settings as s
+        interval = s.METRICS_SNAPSHOT_INTERVAL
+    _writer_task = asyncio.create_task(_write_periodically(interval))
+
+
+def stop_snapshot_writer():
+    global _writer_task
+    if _writer_task:
+        _writer_task.cancel()
+        _writer_task = None
+    try:
+        write_snapshot()
+    except Exception as e:
+        logger.debug(f"Could not write final metrics snapshot: {e}")
+
+
+def format_report(data: dict) -> str:
+    """
+    Plain text table of a snapshot, used by /perf. Labelled series (per endpoint, per task...) are left
+    to the web UI's /metrics.
+    :param data: snapshot()
+    :return: table, one stage per line
+    """
+    histograms = {name: summary for name, summary in data.get('histograms', {}).items()
+                  if not summary.get('labels')}
+    if not histograms:
+        return "No timings recorded yet."
+    width = max(len(name) for name in histograms)
+    lines = [f"{'stage':<{width}} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+    for name, summary in histograms.items():
+        lines.append(f"{name:<{width}} {summary['count']:>6} {summary['p50']:>8.0f} {summary['p95']:>8.0f} "
+                     f"{summary['p99']:>8.0f} {summary['max']:>8.0f}")
+    return '\n'.join(lines)
+
+
+# Prometheus exposition ---------------------------------
+
+def _prometheus_name(name: str, suffix: str = '') -> str:
+    return PROMETHEUS_PREFIX + name.replace('.', '_').replace('-', '_') + suffix
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _prometheus_labels(labels: dict, **extra) -> str:
+    labels = {**labels, **extra}
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + '}'
+
+
+def render_prometheus(data: dict) -> str:
+    """
+    Prometheus text exposition of a snapshot.
+    :param data: snapshot(), usually read back with read_snapshot()
+    :return: exposition text, version 0.0.4
+    """
+    lines = []
+
+    by_name = {}
+    for summary in data.get('histograms', {}).values():
+        by_name.setdefault(summary['name'], []).append(summary)
+    for name, summaries in sorted(by_name.items()):
+        metric = _prometheus_name(name, '_milliseconds')
+        lines.append(f"# TYPE {metric} histogram")
+        for summary in summaries:
+            labels = summary.get('labels', {})
+            for bound, count in summary['buckets']:
+                lines.append(f"{metric}_bucket{_prometheus_labels(labels, le=bound)} {count}")
+            lines.append(f"{metric}_bucket{_prometheus_labels(labels, le='+Inf')} {summary['count']}")
+            lines.append(f"{metric}_sum{_prometheus_labels(labels)} {summary['sum']}")
+            lines.append(f"{metric}_count{_prometheus_labels(labels)} {summary['count']}")
+
+    for kind, suffix in (('counters', '_total'), ('gauges', '')):
+        seen = set()
+        for series in data.get(kind, []):
+            metric = _prometheus_name(series['name'], suffix)
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} {'counter' if kind == 'counters' else 'gauge'}")
+            lines.append(f"{metric}{_prometheus_labels(series['labels'])} {series['value']}")
+
+    if data.get('generated'):
+        metric = _prometheus_name('snapshot_age_seconds')
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {round(time.time() - data['generated'], 1)}")
+
+    return '\n'.join(lines) + '\n'
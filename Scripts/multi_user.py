@@ -1,26 +1,74 @@
 import os
 import logging
-import sqlite3
+from typing import Optional, List, Tuple, Dict
+from abc import ABC, abstractmethod
 from interactions import *
 
 import bookshelfAPI as c
+import metrics
 from utils import ownership_check
 
 
 logger = logging.getLogger("bot")
 
-# Create new relative path
-db_path = 'db/user_info.db'
-os.makedirs(os.path.dirname(db_path), exist_ok=True)
+# Database configuration from environment variables
+DB_TYPE = os.getenv('DB_TYPE', 'sqlite').lower()  # 'sqlite' or 'mariadb'
+DB_HOST = os.getenv('DB_HOST', 'localhost')
+DB_PORT = int(os.getenv('DB_PORT', '3306'))
+DB_USER = os.getenv('DB_USER', 'root')
+DB_PASSWORD = os.getenv('DB_PASSWORD', '')
+DB_NAME = os.getenv('DB_NAME', 'bookshelf')
 
-# Initialize sqlite3 connection
 
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
+# Abstract Database Interface for stored ABS users
+class UserDatabaseInterface(ABC):
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def create_users_table(self):
+        pass
 
+    @abstractmethod
+    async def insert_data(self, user: str, token: str, discord_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    async def search_user_db(self, discord_id: int = 0, user: str = '', token: str = ''):
+        pass
+
+    @abstractmethod
+    async def remove_user_db(self, user: str) -> bool:
+        pass
 
-def table_create():
-    cursor.execute('''
+
+# SQLite Implementation
+class SQLiteUserDatabase(UserDatabaseInterface):
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = None
+        self.cursor = None
+
+    async def connect(self):
+        import sqlite_manager
+        self.conn = await sqlite_manager.connect(self.db_path)
+        self.cursor = await self.conn.cursor()
+        logger.info(f"Connected to SQLite user database: {self.db_path}")
+
+    async def close(self):
+        if self.conn:
+            import sqlite_manager
+            await self.cursor.close()
+            await sqlite_manager.release(self.db_path)
+            self.conn = None
+
+    async def create_users_table(self):
+        await self.cursor.execute('''
 CREATE TABLE IF NOT EXISTS users (
 id INTEGER PRIMARY KEY,
 user TEXT NOT NULL,
@@ -29,83 +77,213 @@ discord_id INTEGER NOT NULL,
 UNIQUE(user, token)
 )
                         ''')
-
-
-# Initialize table
-logger.info("Initializing Sqlite DB")
-table_create()
-
-
-def insert_data(user: str, token: str, discord_id: int):
-    try:
-        cursor.execute('''
-        INSERT INTO users (user, token, discord_id) VALUES (?, ?, ?)''',
-                       (str(user), str(token), int(discord_id)))
-        conn.commit()
-        logger.info(f"Inserted: {user} with token and discord_id")
-        return True
-    except sqlite3.IntegrityError:
-        logger.warning(f"Failed to insert: {user}. User or token already exists.")
-        return False
-
-
-# Function to search for a specific user and token
-def search_user_db(discord_id=0, user='', token=''):
-    logger.info('Initializing sqlite db search')
+        await self.conn.commit()
+
+    async def insert_data(self, user: str, token: str, discord_id: int) -> bool:
+        try:
+            await self.cursor.execute('''
+            INSERT INTO users (user, token, discord_id) VALUES (?, ?, ?)''',
+                                      (str(user), str(token), int(discord_id)))
+            await self.conn.commit()
+            logger.info(f"Inserted: {user} with token and discord_id")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to insert: {user}. User or token already exists. {e}")
+            return False
+
+    async def search_user_db(self, discord_id: int = 0, user: str = '', token: str = ''):
+        query, params, fetch_all = _user_query(discord_id, user, token)
+        # Own cursor, autocomplete and commands search concurrently
+        async with self.conn.execute(query.replace('%s', '?'), params) as cursor:
+            if fetch_all:
+                return await cursor.fetchall()
+            return await cursor.fetchone()
+
+    async def remove_user_db(self, user: str) -> bool:
+        try:
+            await self.cursor.execute("DELETE FROM users WHERE user = ?", (user,))
+            await self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error while attempting to delete {user}: {e}")
+            return False
+
+
+# MariaDB Implementation
+class MariaDBUserDatabase(UserDatabaseInterface):
+    def __init__(self, host: str, port: int, user: str, password: str, database: str):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.database = database
+        self.pool = None
+
+    async def connect(self):
+        import aiomysql
+        self.pool = await aiomysql.create_pool(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            db=self.database,
+            autocommit=True
+        )
+        logger.info(f"Connected to MariaDB user database: {self.database}")
+
+    async def close(self):
+        if self.pool:
+            self.pool.close()
+            await self.pool.wait_closed()
+
+    async def create_users_table(self):
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS users (
+                        id INT AUTO_INCREMENT PRIMARY KEY,
+                        user VARCHAR(255) NOT NULL,
+                        token VARCHAR(512) NOT NULL UNIQUE,
+                        discord_id BIGINT NOT NULL,
+                        UNIQUE KEY unique_user_token (user, token)
+                    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                ''')
+
+    async def insert_data(self, user: str, token: str, discord_id: int) -> bool:
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute('''
+                        INSERT INTO users (user, token, discord_id) VALUES (%s, %s, %s)
+                    ''', (str(user), str(token), int(discord_id)))
+            logger.info(f"Inserted: {user} with token and discord_id")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to insert: {user}. User or token already exists. {e}")
+            return False
+
+    async def search_user_db(self, discord_id: int = 0, user: str = '', token: str = ''):
+        query, params, fetch_all = _user_query(discord_id, user, token)
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                if fetch_all:
+                    return await cursor.fetchall()
+                return await cursor.fetchone()
+
+    async def remove_user_db(self, user: str) -> bool:
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute("DELETE FROM users WHERE user = %s", (user,))
+            return True
+        except Exception as e:
+            logger.error(f"Error while attempting to delete {user}: {e}")
+            return False
+
+
+def _user_query(discord_id: int = 0, user: str = '', token: str = '') -> Tuple[str, tuple, bool]:
+    """The lookup search_user_db runs for the given arguments: query (%s placeholders), params, fetch all rows"""
     if discord_id != 0 and user == '':
         logger.info('Searching db using discord ID')
-        cursor.execute('''
-        SELECT token, user FROM users WHERE discord_id = ?
-        ''', (discord_id,))
-        rows = cursor.fetchall()
-        option = 1
+        return 'SELECT token, user FROM users WHERE discord_id = %s', (discord_id,), True
 
     elif token != '':
         logger.info('Searching db using ABS token')
-        cursor.execute('''
-                SELECT user FROM users WHERE token = ?
-                ''', (token,))
-        rows = cursor.fetchone()
-        option = 2
+        return 'SELECT user FROM users WHERE token = %s', (token,), False
 
     elif discord_id != 0 and user != '':
         logger.info('Searching db using discord ID and user')
-        cursor.execute('''
-                SELECT token FROM users WHERE discord_id = ? AND user = ?
-                ''', (discord_id, user))
-        rows = cursor.fetchone()
-        option = 3
+        return 'SELECT token FROM users WHERE discord_id = %s AND user = %s', (discord_id, user), False
+
     elif user != '':
         logger.info('Searching db using user')
-        cursor.execute('''SELECT token FROM users WHERE user = ?''', (user,))
-        rows = cursor.fetchone()
-        option = 4
+        return 'SELECT token FROM users WHERE user = %s', (user,), False
+
+    logger.info('Searching db for user and token using no arguments')
+    return 'SELECT user, token FROM users', (), True
 
+
+# Database Factory
+def create_user_database() -> UserDatabaseInterface:
+    if DB_TYPE == 'mariadb':
+        return MariaDBUserDatabase(DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME)
     else:
-        logger.info('Searching db for user and token using no arguments')
-        cursor.execute('''SELECT user, token FROM users''')
+        users_db_path = 'db/user_info.db'
+        return SQLiteUserDatabase(users_db_path)
+
+
+# Global database instance
+user_db: Optional[UserDatabaseInterface] = None
+
+# (token, user) rows per discord id, so commands don't hit the database for the same user every time
+_token_cache: Dict[int, List[Tuple]] = {}
+
+
+async def initialize_user_database():
+    global user_db
+    user_db = create_user_database()
+    await user_db.connect()
+    await user_db.create_users_table()
+    logger.info(f"Initialized users table using {DB_TYPE}")
+
 
-        rows = cursor.fetchall()
-        option = 5
+async def close_user_database():
+    global user_db
+    if user_db:
+        await user_db.close()
+        user_db = None
+    _token_cache.clear()
+
+
+@metrics.timed('db.query', db='users', query='insert_data')
+async def insert_data(user: str, token: str, discord_id: int) -> bool:
+    if user_db is None:
+        logger.error("User database not initialized, cannot store the user")
+        return False
+    inserted = await user_db.insert_data(user, token, discord_id)
+    if inserted:
+        _token_cache.pop(int(discord_id), None)
+    return inserted
+
+
+# Function to search for a specific user and token
+@metrics.timed('db.query', db='users', query='search_user_db')
+async def search_user_db(discord_id=0, user='', token=''):
+    logger.info('Initializing user db search')
+    if user_db is None:
+        logger.error("User database not initialized, cannot search for the user")
+        return None
+    if discord_id != 0 and token == '':
+        # Lookups by discord id are answered from the token cache
+        rows = _token_cache.get(discord_id)
+        if rows is None:
+            rows = list(await user_db.search_user_db(discord_id=discord_id))
+            _token_cache[discord_id] = rows
+        if user != '':
+            rows = next(((row_token,) for row_token, row_user in rows if row_user == user), None)
+    else:
+        rows = await user_db.search_user_db(discord_id=discord_id, user=user, token=token)
 
     if rows:
-        logger.info(f'Successfully found query using option: {option}')
+        logger.info('Successfully found user db query')
     else:
         logger.warning('Query returned null, an error may follow.')
 
     return rows
 
 
-def remove_user_db(user: str):
+@metrics.timed('db.query', db='users', query='remove_user_db')
+async def remove_user_db(user: str) -> bool:
     logger.warning(f'Attempting to delete user {user} from db!')
-    try:
-        cursor.execute("DELETE FROM users WHERE user = ?", (user,))
-        conn.commit()
-        logger.info(f"Successfully deleted user {user} from db!")
-        return True
-    except sqlite3.Error as e:
-        logger.error(f"Error while attempting to delete {user}: {e}")
+    if user_db is None:
+        logger.error("User database not initialized, cannot delete the user")
         return False
+    removed = await user_db.remove_user_db(user)
+    if removed:
+        _token_cache.clear()
+        logger.info(f"Successfully deleted user {user} from db!")
+    return removed
 
 
 class MultiUser(Extension):
@@ -150,7 +328,7 @@ class MultiUser(Extension):
             admin_user = True
 
         logger.info("Attempting to find logged in user...")
-        user_result = search_user_db(int(author_discord_id), abs_username)
+        user_result = await search_user_db(int(author_discord_id), abs_username)
         print(user_result)
 
         if not user_result:
@@ -159,7 +337,7 @@ class MultiUser(Extension):
             if abs_token != "":
                 logger.info(f"Registering user into sqlite db with username: {abs_username}, "
                             f"discord_id: {author_discord_id}")
-                insert_result = insert_data(abs_username, abs_token, author_discord_id)
+                insert_result = await insert_data(abs_username, abs_token, author_discord_id)
                 if insert_result:
                     await modal_ctx.send(f"Successfully logged in as {abs_username}, type: {abs_user_type}",
                                          ephemeral=True)
@@ -172,8 +350,7 @@ class MultiUser(Extension):
 
         else:
             logger.info("SQLite found associated token, proceeding to update ENV VARS...")
-            retrieved_token = [0][0]
-            retrieved_token = str(retrieved_token)
+            retrieved_token = str(user_result[0])
 
             abs_stored_token = os.environ.get('bookshelfToken')
 
@@ -205,7 +382,7 @@ class MultiUser(Extension):
             else:
                 logger.info('Option 4 executed')
                 os.environ['bookshelfToken'] = retrieved_token
-                info = search_user_db(int(author_discord_id))
+                info = await search_user_db(int(author_discord_id))
                 retrieved_user = info[0][1]
                 logger.warning(f'user {ctx.author} logged in to ABS, changing token to assigned user: {retrieved_user}')
                 await modal_ctx.send(content=f"Successfully logged in as {retrieved_user}.",
@@ -235,7 +412,7 @@ class MultiUser(Extension):
                                   ephemeral=True)
 
         abs_stored_token = os.getenv('bookshelfToken')
-        user_result = search_user_db(user=user)
+        user_result = await search_user_db(user=user)
 
         if user_result:
             token = user_result[0]
@@ -276,7 +453,7 @@ class MultiUser(Extension):
     @slash_option(name='user', description='Select which user to remove', autocomplete=True, required=True,
                   opt_type=OptionType.STRING)
     async def remove_db_user(self, ctx: SlashContext, user: str):
-        user_result = remove_user_db(user)
+        user_result = await remove_user_db(user)
         if user_result:
             await ctx.send(f'Successfully deleted user: {user} from database!', ephemeral=True)
         else:
@@ -286,7 +463,7 @@ class MultiUser(Extension):
     async def user_check(self, ctx: SlashContext):
         abs_stored_token = os.getenv('bookshelfToken')
         discord_id = ctx.author.id
-        result = search_user_db(token=abs_stored_token)
+        result = await search_user_db(token=abs_stored_token)
         if result:
             username = result[0]
             await ctx.send(content=f"user **{username}** is currently logged in.", ephemeral=True)
@@ -294,7 +471,7 @@ class MultiUser(Extension):
             user_call = c.bookshelf_user_login(token=abs_stored_token)
             username = user_call['username']
             if username != '':
-                user_insert = insert_data(discord_id=discord_id, token=abs_stored_token, user=username)
+                user_insert = await insert_data(discord_id=discord_id, token=abs_stored_token, user=username)
                 if user_insert:
                     await ctx.send(content=f"user **{username}** is currently logged in.", ephemeral=True)
             else:
@@ -307,7 +484,7 @@ class MultiUser(Extension):
     @remove_db_user.autocomplete(option_name="user")
     async def user_search_autocomplete(self, ctx: AutocompleteContext):
         choices = []
-        user_result = search_user_db()
+        user_result = await search_user_db()
         if user_result:
             for users in user_result:
                 username = users[0]
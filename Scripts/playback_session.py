@@ -0,0 +1,2505 @@
+"""
+Playback Session - per guild playback state for the audio extension.
+
+Every guild that plays something gets its own PlaybackSession with its own ABS session, sync loop,
+FFmpeg pipeline and voice connection, so several guilds can listen at the same time. The
+AudioPlayBack extension only routes commands and component callbacks to the session of the
+guild they came from.
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+import pytz
+from interactions import *
+
+import discord
+from main import voice_adapter
+from voice_adapter import PrimedSource
+
+import bookshelfAPI as c
+import metrics
+import settings as s
+from bookshelfAPI import time_converter
+from media_index import ChapterIndex, TrackIndex
+import series_index
+from session_sync import SessionSyncEngine
+from settings import TIMEZONE
+from ui_components import get_playback_rows, create_playback_embed
+
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger("bot")
+
+# Update Frequency for session sync
+updateFrequency = s.UPDATES
+
+# Inactivity check while paused
+AUTO_KILL_INTERVAL = 240
+
+# Protocols the concat demuxer may open for multi-file books
+CONCAT_PROTOCOLS = "file,http,https,tcp,tls,crypto"
+
+# Seconds before the end of a book or episode at which the next autoplay item is prepared
+PREFETCH_WINDOW = s.PREFETCH_WINDOW
+
+# Seconds before the end at which the prepared item's ABS session and FFmpeg input are opened, an idle
+# stream held open for longer may be closed by the server
+PREFETCH_STREAM_LEAD = 10
+
+# Seconds a seek waits for further seeks before the stream is moved, repeated taps are coalesced
+SEEK_DEBOUNCE = s.SEEK_DEBOUNCE
+
+# Timezone
+timeZone = pytz.timezone(TIMEZONE)
+
+
+class IntervalLoop:
+    """
+    Repeats a coroutine on a fixed interval for a single session.
+    Mirrors the start/stop/running interface of an interactions Task, which is bound to the extension
+    and can therefore only run once per bot.
+    """
+
+    def __init__(self, coro_func, seconds: float):
+        self.coro_func = coro_func
+        self.seconds = float(seconds)
+        self._task = None
+        self._stop_requested = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._stop_requested
+
+    def start(self):
+        self._stop_requested = False
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is None:
+            return
+        if self._task is asyncio.current_task():
+            # Called from inside the loop (e.g. cleanup after the last chapter), finish this iteration first
+            self._stop_requested = True
+        else:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        try:
+            while not self._stop_requested:
+                await asyncio.sleep(self.seconds)
+                if self._stop_requested:
+                    break
+                try:
+                    await self.coro_func()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error in {getattr(self.coro_func, '__name__', 'interval')} loop: {e}")
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+
+class PlaybackSession:
+    """
+    Playback state and logic for one guild.
+    """
+
+    def __init__(self, bot, guild_id, registry):
+        self.bot = bot
+        self.client = bot
+        self.guild_id = guild_id
+        self.registry = registry
+        # ABS Variables
+        self.cover_image = ''
+        self.bookItemID = ''
+        self.bookTitle = ''
+        self.bookDuration = None
+        self.bookFinished = False
+        # User Variables
+        self.username = ''
+        self.user_type = ''
+        self.current_channel = None
+        self.active_guild_id = None
+        # Session Variables
+        self.sessionID = ''
+        self.syncEngine = None
+        self.currentTime = 0.0
+        self.nextTime = None
+        self.activeSessions = 0
+        self.stream_started = False
+        self.sessionOwner = None
+        self.announcement_message = None
+        self.repeat_enabled = False
+        self.needs_restart = False
+        # Audio Variables
+        self.audio_source = None          # discord.PCMVolumeTransformer
+        self.trackIndex = None            # audio files of the current book
+        self.streamSource = None          # TrackIndex or stream url the FFmpeg input is opened from
+        self.concat_file = None           # ffconcat playlist of a multi-file book
+        self.context_voice_channel = None
+        self.current_playback_time = 0
+        self.audio_context = None
+        self.bitrate = 128000
+        self.volume = 0.5
+        self.placeholder = None
+        self.playbackSpeed = 1.0
+        self.updateFreqMulti = updateFrequency * self.playbackSpeed
+        self.play_state = 'stopped'
+        self.audio_message = None
+        self.needs_encoder = True
+        # Chapter Variables
+        self.currentChapter = None
+        self.chapterArray = None
+        self.chapterIndex = ChapterIndex()
+        self.currentChapterTitle = ''
+        self.newChapterTitle = ''
+        self.found_next_chapter = False
+        # Series Variables
+        self.currentSeries = None  # Series metadata
+        self.seriesAutoplay = True  # Auto-progression for book series
+        self.seriesList = []  # List of book IDs in series order
+        self.seriesIndex = None  # Current position in series
+        self.previousBookID = None
+        self.previousBookTime = None
+        self.isLastBookInSeries = False
+        self.isFirstBookInSeries = False
+        self.seriesBookCache = {}
+        # Podcast Variables
+        self.isPodcast = False
+        self.podcastAutoplay = True  # Auto-progression for podcast episodes
+        self.podcastEpisodes = []
+        self.currentEpisodeIndex = None
+        self.totalEpisodes = 0
+        self.isFirstEpisode = False
+        self.isLastEpisode = False
+        self.currentEpisodeTitle = ''
+        # Voice Variables
+        self.voice_state = None
+        self.audioObj = None
+        self.episodeInfo = None
+        self.episodeId = None
+        # Next autoplay item, prepared near the end of the current one
+        self.prefetched = None
+        self._prefetch_task = None
+        # Pending seek, coalesced until SEEK_DEBOUNCE passes without another one
+        self._seek_target = None
+        self._seek_timer = None
+        self._seek_future = None
+        self._seek_lock = asyncio.Lock()
+        # Loops
+        self.session_update = IntervalLoop(self._session_update, updateFrequency)
+        self.auto_kill_session = IntervalLoop(self._auto_kill_session, AUTO_KILL_INTERVAL)
+
+    # Tasks ---------------------------------
+
+    async def build_session(self, item_id: str, start_time: float = None, force_restart: bool = False,
+                            episode_index: int = 0):
+        """
+        Unified method to build audio session for any playback scenario.
+    
+        Parameters:
+        - item_id: The library item ID to build session for
+        - start_time: Optional time to start from (if None, uses server's current time)
+        - force_restart: If True, starts from beginning regardless of server progress
+        - episode_index: For podcasts, which episode to play (0 = newest)
+    
+        Returns:
+        - Tuple: (audio_object, current_time, session_id, book_title, book_duration)
+        """
+        prepared = await self.prepare_session(item_id, start_time, force_restart, episode_index)
+        return self.apply_session(prepared)
+
+    async def prepare_session(self, item_id: str, start_time: float = None, force_restart: bool = False,
+                              episode_index: int = 0) -> dict:
+        """
+        Open the ABS play session and the FFmpeg input for an item without touching the playing state,
+        so the next item can be prepared while the current one is still playing. See build_session.
+
+        Returns:
+        - dict consumed by apply_session
+        """
+        try:
+            # Handle force restart by resetting server progress first
+            if force_restart:
+                try:
+                    # First, check if this is a podcast by getting item details
+                    item_details = await c.bookshelf_get_item_details(item_id)
+                    media_type = item_details.get('mediaType', 'book')
+
+                    if media_type == 'podcast':
+                        # For podcasts, we need to get the episode list to find the episode ID
+                        if hasattr(self, 'podcastEpisodes') and self.podcastEpisodes and episode_index < len(
+                                self.podcastEpisodes):
+                            # Use existing episode data if available
+                            episode_id = self.podcastEpisodes[episode_index].get('id')
+                        else:
+                            # Get fresh episode data if not available
+                            episodes = await c.bookshelf_get_podcast_episodes(item_id)
+                            if episodes and episode_index < len(episodes):
+                                episode_id = episodes[episode_index].get('id')
+                            else:
+                                logger.warning(f"Could not find episode at index {episode_index} for podcast {item_id}")
+                                episode_id = None
+
+                        if episode_id:
+                            await c.bookshelf_mark_book_unfinished(item_id, episode_id)
+                            logger.info(f"Reset server progress for podcast episode {episode_id}")
+                        else:
+                            logger.warning(
+                                f"Could not determine episode ID for podcast restart, skipping unfinished marking")
+                    else:
+                        # For books, no episode ID needed
+                        await c.bookshelf_mark_book_unfinished(item_id)
+                        logger.info("Reset server progress to beginning for book restart")
+
+                except Exception as e:
+                    logger.warning(f"Failed to reset server progress for restart: {e}")
+
+            # Get fresh audio object and session
+            result = await c.bookshelf_audio_obj(item_id, episode_index)
+            if not result:
+                raise Exception("Failed to get audio object")
+
+            if len(result) == 7:  # Podcast with episode info
+                audio_obj, server_current_time, session_id, book_title, book_duration, episode_id, episode_info = result
+            else:
+                # Book
+                audio_obj, server_current_time, session_id, book_title, book_duration, episode_id = result
+                episode_id = None
+                episode_info = None
+
+            # Determine actual start time
+            if force_restart:
+                actual_start_time = 0.0
+                logger.info("Force restart enabled - starting from beginning")
+            elif start_time is not None:
+                actual_start_time = start_time
+                logger.info(f"Using provided start time: {actual_start_time}")
+            else:
+                actual_start_time = server_current_time
+
+                # Log meaningful information about the resume position
+                if server_current_time > 0:
+                    formatted_time = time_converter(int(server_current_time))
+                    logger.info(f"Respecting server progress - resuming at: {formatted_time} ({actual_start_time}s)")
+                else:
+                    logger.info("Starting from beginning - no previous progress found")
+
+            if s.FFMPEG_DEBUG:
+                # Create ffmpeg logs directory in appdata
+                ffmpeg_log_dir = os.path.join("db", "ffmpeg")
+                os.makedirs(ffmpeg_log_dir, exist_ok=True)
+
+                # Set FFmpeg report environment variable. level=24 for warning. 32 for info. 48 for debug.
+                os.environ["FFREPORT"] = f"file={ffmpeg_log_dir}/ffmpeg-%t.log:level=32"
+
+            # Build discord.py audio object
+            preserved_vol = self.volume if hasattr(self, 'volume') and self.volume is not None else 0.5
+
+            ffmpeg_audio, concat_file = self._open_ffmpeg_source(audio_obj, actual_start_time)
+
+            audio = discord.PCMVolumeTransformer(
+                ffmpeg_audio,
+                volume=preserved_vol
+            )
+
+            return {
+                'item_id': item_id,
+                'episode_index': episode_index,
+                'audio': audio,
+                'start_time': actual_start_time,
+                'session_id': session_id,
+                'title': book_title,
+                'duration': book_duration,
+                'episode_id': episode_id,
+                'episode_info': episode_info,
+                'source': audio_obj,
+                'track_index': audio_obj if isinstance(audio_obj, TrackIndex) else None,
+                'concat_file': concat_file
+            }
+
+        except Exception as e:
+            logger.error(f"Error building session for item {item_id}: {e}")
+            raise
+
+    def apply_session(self, prepared: dict):
+        """
+        Make a prepared session the playing one.
+        :param prepared: dict from prepare_session
+        :return: Tuple: (audio_object, current_time, session_id, book_title, book_duration)
+        """
+        # Reset stream detection for each new session
+        self.stream_started = False
+
+        # The previous playlist is no longer read once its FFmpeg process is replaced
+        self._remove_concat_file()
+        self.streamSource = prepared['source']
+        self.trackIndex = prepared['track_index']
+        self.concat_file = prepared['concat_file']
+
+        # The volume may have changed since a prefetched session was prepared
+        if self.volume is not None:
+            prepared['audio'].volume = self.volume
+        self.episodeInfo = prepared['episode_info']
+        self.episodeId = prepared['episode_id']
+
+        # Update instance variables
+        self.sessionID = prepared['session_id']
+        self.bookItemID = prepared['item_id']
+        self.bookTitle = prepared['title']
+        self.bookDuration = prepared['duration']
+        self.currentTime = prepared['start_time']
+        self.audioObj = prepared['audio']
+
+        # Every new ABS session gets its own sync state, starting from the position we stream from
+        self.syncEngine = SessionSyncEngine(self.sessionID, self.bookItemID, self.currentTime, self.bookDuration)
+
+        logger.info(f"Built session for '{self.bookTitle}' starting at {self.currentTime}s")
+
+        return self.audioObj, self.currentTime, self.sessionID, self.bookTitle, self.bookDuration
+
+    @staticmethod
+    def _open_ffmpeg_source(source, start_time: float):
+        """
+        Open the FFmpeg input for source at start_time.
+        :param source: stream url, or a TrackIndex for books
+        :param start_time: position in the book in seconds
+        :return: (discord.FFmpegPCMAudio, path of the ffconcat playlist or None)
+        """
+        metrics.inc('ffmpeg.starts')
+        if isinstance(source, TrackIndex):
+            if len(source) > 1:
+                # Start inside the right file and let the concat demuxer chain the rest without a gap
+                track, offset = source.locate(start_time)
+                logger.info(f"Streaming track {track + 1}/{len(source)} from {offset:.1f}s "
+                            f"(book position {start_time}s)")
+                with tempfile.NamedTemporaryFile('w', suffix='.ffconcat', prefix='traveller-',
+                                                 delete=False) as playlist:
+                    playlist.write(source.ffconcat(start_time))
+                ffmpeg_audio = discord.FFmpegPCMAudio(
+                    playlist.name,
+                    before_options=f"-re -f concat -safe 0 -protocol_whitelist {CONCAT_PROTOCOLS}",
+                    options=""
+                )
+                return ffmpeg_audio, playlist.name
+            source = source.tracks[0]['url']
+
+        ffmpeg_audio = discord.FFmpegPCMAudio(
+            source,
+            before_options=f"-re -ss {start_time}",
+            options=""
+        )
+        return ffmpeg_audio, None
+
+    @staticmethod
+    def _delete_file(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.debug(f"Could not remove concat playlist {path}: {e}")
+
+    def _remove_concat_file(self):
+        if self.concat_file:
+            self._delete_file(self.concat_file)
+            self.concat_file = None
+
+    # Prefetch ---------------------------------
+
+    def _next_autoplay_target(self):
+        """
+        :return: (item_id, episode_index, series_index) of the item autoplay moves to next, or None
+        """
+        if self.repeat_enabled:
+            return None
+        if self.isPodcast:
+            if self.podcastAutoplay and self.podcastEpisodes and self.currentEpisodeIndex is not None \
+                    and not self.isLastEpisode:
+                return self.bookItemID, self.currentEpisodeIndex + 1, None
+        elif self.seriesAutoplay and self.currentSeries and self.seriesList and self.seriesIndex is not None \
+                and not self.isLastBookInSeries:
+            return self.seriesList[self.seriesIndex + 1], 0, self.seriesIndex + 1
+        return None
+
+    async def _next_book_start_time(self, target_book_id: str):
+        """
+        Start position of the next series book: finished books start over, others resume at the server position.
+        :return: 0.0, or None to let build_session use the server position
+        """
+        try:
+            progress_data = await c.bookshelf_item_progress(target_book_id)
+            is_finished = progress_data.get('finished', 'False') == 'True'
+
+            if is_finished:
+                logger.info(f"Target book {target_book_id} is finished - starting from beginning")
+                return 0.0
+            logger.info(f"Target book {target_book_id} not finished - will respect server position")
+            return None
+
+        except Exception as e:
+            logger.warning(f"Error checking next book progress, defaulting to server position: {e}")
+            return None
+
+    def _maybe_prefetch(self):
+        """
+        Called on every playback tick. Within PREFETCH_WINDOW of the end the next autoplay item's metadata is
+        prepared, within PREFETCH_STREAM_LEAD its ABS session and FFmpeg input are opened. A prefetch that no
+        longer applies is dropped.
+        """
+        target = self._next_autoplay_target()
+        remaining = (self.bookDuration or 0) - (self.currentTime or 0)
+
+        if self.prefetched and (target is None or remaining > PREFETCH_WINDOW * 2 or
+                                (self.prefetched['item_id'], self.prefetched['episode_index']) != target[:2]):
+            # Autoplay was turned off, the listener seeked far back or the next item changed
+            asyncio.create_task(self.discard_prefetch("no longer next"))
+            return
+
+        if target is None or not self.bookDuration:
+            return
+        if self._prefetch_task and not self._prefetch_task.done():
+            return
+        if not self.prefetched:
+            if remaining <= PREFETCH_WINDOW:
+                self._prefetch_task = asyncio.create_task(self._prefetch(*target))
+        elif 'audio' not in self.prefetched and remaining <= PREFETCH_STREAM_LEAD:
+            self._prefetch_task = asyncio.create_task(self._prefetch_stream())
+
+    async def _prefetch(self, item_id: str, episode_index: int, series_index):
+        """
+        Prepare the metadata of the next item: start position, chapters and cover. Nothing is opened on the
+        server yet, see _prefetch_stream.
+        """
+        try:
+            logger.info(f"Prefetching next item {item_id} (episode index {episode_index})")
+            prepared = {'item_id': item_id, 'episode_index': episode_index, 'series_index': series_index,
+                        'title': item_id, 'start_time': None}
+
+            if series_index is not None:
+                prepared['start_time'] = await self._next_book_start_time(item_id)
+                prepared['cover'] = await c.bookshelf_cover_image(item_id)
+                # Loads the item document into the item cache, chapters are resolved from it at the handoff
+                await c.bookshelf_get_chapter_index(item_id)
+
+            if (item_id, episode_index) != (self._next_autoplay_target() or (None, None))[:2]:
+                # Playback moved on while we were preparing
+                return
+            self.prefetched = prepared
+            logger.info(f"Next item {item_id} is prepared, its stream opens {PREFETCH_STREAM_LEAD}s before the end")
+
+        except Exception as e:
+            logger.warning(f"Prefetch of {item_id} failed, autoplay will build it on demand: {e}")
+
+    async def _open_prefetched(self, prepared: dict) -> dict:
+        """
+        Open the ABS play session and FFmpeg input of a prepared item. One frame is read so FFmpeg has connected
+        and probed the stream before the handoff, the frame is played first.
+        :param prepared: metadata from _prefetch
+        :return: the prepared item, ready for apply_session
+        """
+        item_id = prepared['item_id']
+        opened = await self.prepare_session(item_id, prepared['start_time'], episode_index=prepared['episode_index'])
+        try:
+            if prepared['series_index'] is not None:
+                opened['chapters'] = await c.bookshelf_get_current_chapter(item_id, opened['start_time'])
+
+            volume_source = opened['audio']
+            frame = await asyncio.to_thread(volume_source.original.read)
+            opened['audio'] = discord.PCMVolumeTransformer(PrimedSource(volume_source.original, frame),
+                                                           volume=volume_source.volume)
+        except BaseException:
+            await self._release_prepared(opened)
+            raise
+        return {**prepared, **opened}
+
+    async def _prefetch_stream(self):
+        """
+        Open the stream of the prepared next item shortly before the handoff.
+        """
+        metadata = self.prefetched
+        try:
+            prepared = await self._open_prefetched(metadata)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Opening the stream of {metadata['item_id']} failed, autoplay will build it on demand: "
+                           f"{e}")
+            if self.prefetched is metadata:
+                self.prefetched = None
+            return
+
+        if self.prefetched is not metadata:
+            # Discarded or replaced while the stream was opening
+            await self._release_prepared(prepared)
+            return
+        self.prefetched = prepared
+        logger.info(f"Next item '{prepared['title']}' is ready for handoff")
+
+    async def _release_prepared(self, prepared: dict):
+        if 'audio' not in prepared:
+            # Only metadata, nothing was opened
+            return
+        try:
+            prepared['audio'].cleanup()
+        except Exception as e:
+            logger.debug(f"Error cleaning up prefetched audio: {e}")
+        if prepared.get('concat_file'):
+            self._delete_file(prepared['concat_file'])
+        try:
+            await c.bookshelf_close_session(prepared['session_id'])
+        except Exception as e:
+            logger.debug(f"Error closing prefetched session: {e}")
+
+    async def discard_prefetch(self, reason: str = ''):
+        """
+        Drop the prepared next item, closing its ABS session and FFmpeg process if they were opened.
+        :param reason: for logging only
+        """
+        if self._prefetch_task and not self._prefetch_task.done():
+            self._prefetch_task.cancel()
+        self._prefetch_task = None
+
+        prepared, self.prefetched = self.prefetched, None
+        if prepared is None:
+            return
+        logger.info(f"Discarding prefetched item '{prepared['title']}' ({reason})")
+        await self._release_prepared(prepared)
+
+    async def _take_prefetch(self, item_id: str, episode_index: int = 0):
+        """
+        :return: the prepared session if it is for item_id/episode_index, otherwise None (and it is discarded).
+            A prefetch that only has its metadata yet gets its stream opened now.
+        """
+        prepared = self.prefetched
+        if not (prepared and prepared['item_id'] == item_id and prepared['episode_index'] == episode_index):
+            await self.discard_prefetch("navigated elsewhere")
+            return None
+
+        if self._prefetch_task and not self._prefetch_task.done():
+            # The stream was still opening, open it here instead
+            self._prefetch_task.cancel()
+        self._prefetch_task = None
+        self.prefetched = None
+
+        if 'audio' not in prepared:
+            try:
+                prepared = await self._open_prefetched(prepared)
+            except Exception as e:
+                logger.warning(f"Opening the stream of {item_id} failed, building it on demand: {e}")
+                return None
+        return prepared
+
+    # Seeking ---------------------------------
+
+    async def seek_to(self, position: float) -> bool:
+        """
+        Move playback to position within the open ABS session. Seeks arriving within SEEK_DEBOUNCE of each
+        other are coalesced and only the last target is streamed, every caller waits for that one reposition.
+        currentTime is updated right away so a following seek builds on this one.
+        :param position: position in the book or episode in seconds
+        :return: True once the stream plays from the final target
+        """
+        self._seek_target = position
+        self.currentTime = position
+
+        if self._seek_future is None or self._seek_future.done():
+            self._seek_future = asyncio.get_running_loop().create_future()
+        future = self._seek_future
+
+        if self._seek_timer and not self._seek_timer.done():
+            self._seek_timer.cancel()
+        self._seek_timer = asyncio.create_task(self._debounced_reposition(future))
+
+        # A caller giving up must not cancel the reposition the others are waiting for
+        return await asyncio.shield(future)
+
+    async def _debounced_reposition(self, future):
+        try:
+            await asyncio.sleep(SEEK_DEBOUNCE)
+        except asyncio.CancelledError:
+            # A newer seek replaced this timer, it resolves the same future
+            return
+
+        # From here on a new seek starts a new round instead of cancelling this one
+        self._seek_timer = None
+        self._seek_future = None
+
+        result = False
+        try:
+            async with self._seek_lock:
+                target, self._seek_target = self._seek_target, None
+                # None means a seek queued behind the previous reposition was already served by it
+                result = True if target is None else await self.reposition(target)
+        except Exception as e:
+            logger.error(f"Error repositioning stream: {e}")
+        finally:
+            if not future.done():
+                future.set_result(result)
+
+    def _cancel_pending_seek(self, superseded: bool = False):
+        """
+        Drop a seek that is still waiting out SEEK_DEBOUNCE.
+        :param superseded: playback moved on to another position by other means, waiting callers succeed
+        """
+        if self._seek_timer and not self._seek_timer.done():
+            self._seek_timer.cancel()
+        self._seek_timer = None
+        self._seek_target = None
+        if self._seek_future and not self._seek_future.done():
+            self._seek_future.set_result(superseded)
+        self._seek_future = None
+
+    async def reposition(self, position: float) -> bool:
+        """
+        Restart the FFmpeg input at position and hand it to the voice client, keeping the open ABS session
+        and its sync state. Falls back to rebuilding the session if the stream can't be reopened.
+        :param position: position in the book or episode in seconds
+        :return: True if playback continues from position
+        """
+        started = time.perf_counter()
+        position = max(0.0, float(position))
+        if self.bookDuration:
+            position = min(position, float(self.bookDuration))
+
+        if self.streamSource is None or not self.sessionID:
+            with metrics.span('session.rebuild'):
+                return await self._rebuild_at(position)
+
+        try:
+            ffmpeg_audio, concat_file = self._open_ffmpeg_source(self.streamSource, position)
+        except Exception as e:
+            logger.warning(f"Could not reopen the stream at {position}s, rebuilding the session: {e}")
+            with metrics.span('session.rebuild'):
+                return await self._rebuild_at(position)
+
+        # The voice client stops and cleans up the previous source when it starts the new one
+        metrics.inc('ffmpeg.restarts', reason='seek')
+        self._remove_concat_file()
+        self.concat_file = concat_file
+        self.audioObj = discord.PCMVolumeTransformer(ffmpeg_audio, volume=self.volume)
+        self.currentTime = position
+
+        if self.syncEngine:
+            self.syncEngine.seek(position)
+        await self._play_current()
+        metrics.observe('session.reposition', (time.perf_counter() - started) * 1000)
+        logger.info(f"Repositioned '{self.bookTitle}' to {position}s in session {self.sessionID}")
+
+        await self.flush_session_sync("seek")
+        return True
+
+    async def _rebuild_at(self, position: float) -> bool:
+        """
+        Slow path of reposition: close the ABS session and open a new one at position.
+        """
+        metrics.inc('ffmpeg.restarts', reason='rebuild')
+        try:
+            if self.sessionID:
+                await c.bookshelf_close_session(self.sessionID)
+            await self.build_session(item_id=self.bookItemID, start_time=position,
+                                     episode_index=(self.currentEpisodeIndex or 0) if self.isPodcast else 0)
+            await self.flush_session_sync("seek")
+            await self._play_current()
+            return True
+        except Exception as e:
+            logger.error(f"Error rebuilding session at {position}s: {e}")
+            return False
+
+    async def _play_current(self):
+        if self.voice_state:
+            await self.voice_state.play(self.audioObj)
+
+    async def _session_update(self):
+        # Check for restart flag
+        if self.needs_restart:
+            self.needs_restart = False
+
+            restart_success = await self.restart_media_from_beginning()
+            if restart_success and self.audio_context and self.audio_context.voice_state:
+                try:
+                    await self.audio_context.voice_state.stop()
+                    await self.audio_context.voice_state.play(self.audioObj)
+                    # Task continues running normally
+                except Exception as e:
+                    logger.error(f"Error starting playback after restart: {e}")
+                    await self.cleanup_session("restart failed")
+            else:
+                logger.error("Restart failed - cleaning up session")
+                await self.cleanup_session("restart failed")
+
+            return  # Exit this iteration, but task keeps running
+
+        # Don't sync until FFmpeg is actually streaming
+        if not self.stream_started:
+            vc = voice_adapter.voice_clients.get(self.active_guild_id)
+            if vc and vc.is_playing():
+                self.stream_started = True
+                if self.syncEngine:
+                    self.syncEngine.start_clock()
+                logger.info("🎵 Playback confirmed (discord.py)")
+            else:
+                logger.info("Waiting for playback to begin...")
+                return
+
+        logger.debug(f"Initializing Session Sync, current refresh rate set to: {updateFrequency} seconds")
+        try:
+            self.current_playback_time = self.current_playback_time + updateFrequency
+            formatted_time = time_converter(self.current_playback_time)
+
+            # Advance the local clock, the sync engine decides whether this tick needs a round trip
+            synced = False
+            try:
+                if self.syncEngine and not self.syncEngine.clock_running:
+                    self.syncEngine.start_clock()
+
+                synced = await self.syncEngine.tick()
+                updatedTime = self.syncEngine.position
+                duration = self.syncEngine.duration
+                finished_book = self.syncEngine.finished
+
+                self.currentTime = updatedTime
+
+                if synced:
+                    logger.info(f"Session sync successful: {updatedTime} | Duration: {duration} | "
+                                f"Current Playback Time: {formatted_time} | session ID: {self.sessionID} | "
+                                f"next sync in {self.syncEngine.interval:.0f}s")
+
+                # If the local clock reached the end, check if we should let it finish naturally
+                if finished_book:
+                    time_remaining = duration - updatedTime if duration > 0 else 0
+
+                    if time_remaining <= 30.0:
+                        if time_remaining <= 0:
+                            # Book has truly reached the end
+                            if self.repeat_enabled:
+                                logger.info("Book completed with repeat enabled - triggering restart")
+                                self.needs_restart = True
+                                return  # Let the restart logic handle it
+
+
+                            elif self.podcastAutoplay and self.isPodcast and not self.isLastEpisode:
+                                logger.info("Episode completed - moving to next episode")
+
+                                # Move to next episode
+                                success = await self.move_to_podcast_episode(relative_move=1)
+                                if success:
+                                    logger.info("Successfully moved to next episode")
+                                    if self.voice_state:
+                                        await self.voice_state.play(self.audioObj)
+                                    return  # Continue with the new episode
+                                else:
+                                    logger.error("Failed to move to next episode")
+                                    await self.cleanup_session("episode progression failed")
+                                    return
+
+                            elif self.seriesAutoplay and self.currentSeries and not self.isLastBookInSeries:
+                                logger.info("Book completed - moving to next book in series")
+
+                                # Store current book as previous
+                                self.previousBookID = self.bookItemID
+                                self.previousBookTime = self.currentTime
+
+                                # Move to next book
+                                success = await self.move_to_series_book("next")
+                                if success:
+                                    logger.info("Successfully moved to next book in series")
+                                    if self.voice_state:
+                                        await self.voice_state.play(self.audioObj)
+                                    return  # Continue with the new book
+                                else:
+                                    logger.error("Failed to move to next book in series")
+                                    await self.cleanup_session("series progression failed")
+                                    return
+                            else:
+                                logger.info("Stream has reached the end - cleaning up")
+                                await self.cleanup_session("natural audio completion")
+                                return
+                        else:
+                            logger.info(
+                                f"ABS marked book finished with {time_remaining:.1f}s remaining - letting stream finish naturally")
+                            # Don't cleanup yet, let it play out completely
+                    else:
+                        logger.info("ABS marked book as finished - cleaning up")
+                        await self.cleanup_session("book completed by ABS")
+                        return
+
+            except (TypeError, AttributeError) as e:
+                logger.warning(f"Session update error: {e} - session may be invalid or closed")
+                # Continue with task to allow chapter update even if session update fails
+
+            self._maybe_prefetch()
+
+            # Resolve the current chapter from the local chapter index
+            try:
+                if not self.isPodcast:
+                    if self.chapterIndex.item_id != self.bookItemID:
+                        self.set_chapters(await c.bookshelf_get_chapter_index(self.bookItemID))
+
+                    current_chapter = self.chapterIndex.chapter_at(self.currentTime)
+                    if current_chapter:
+                        chapter_title = current_chapter.get('title', 'Chapter 1')
+                        logger.debug(f"Current Chapter Sync: {chapter_title}")
+                        chapter_changed = self.currentChapter and current_chapter.get('id') != self.currentChapter.get('id')
+                        self.currentChapter = current_chapter
+                        self.currentChapterTitle = chapter_title
+                        if chapter_changed and not synced:
+                            await self.flush_session_sync("chapter change")
+                    else:
+                        # Book has no chapters
+                        self.currentChapter = None
+                        self.currentChapterTitle = 'No Chapters'
+
+            except Exception as e:
+                logger.warning(f"Error getting current chapter: {e}")
+
+            # Update announcement message if it exists  
+            if self.announcement_message and self.context_voice_channel:
+                try:
+                    voice_channel = self.context_voice_channel
+                    guild_name = self.announcement_message.guild.name if self.announcement_message.guild else "Unknown Server"
+
+                    updated_embed = self.create_announcement_embed(voice_channel, guild_name)
+
+                    # Rate limit updating the card to 10 seconds
+                    now = datetime.now()
+                    msg_id = self.announcement_message.id
+                    if not hasattr(self, '_last_patch_timestamps'):
+                        self._last_patch_timestamps = {}
+                    last_update = self._last_patch_timestamps.get(msg_id,
+                                                                  now.replace(second=0, microsecond=0) - timedelta(
+                                                                      seconds=10))
+
+                    if (now - last_update).total_seconds() >= 10:
+                        updated_announcement = await self.announcement_message.edit(embed=updated_embed)
+                        self.announcement_message = updated_announcement
+                        self._last_patch_timestamps[msg_id] = now
+                        logger.debug("Updated announcement card")
+
+                except Exception as e:
+                    logger.warning(f"Failed to update announcement card: {e}")
+                    if "Unknown Message" in str(e) or "Not Found" in str(e) or "404" in str(e):
+                        logger.info("Announcement message no longer exists, clearing reference")
+                        self.announcement_message = None
+
+        except Exception as e:
+            logger.error(f"Unhandled error in session_update task: {e}")
+            # Don't stop the task on errors, let it continue for the next interval
+
+    async def flush_session_sync(self, reason: str):
+        """
+        Push the local position to ABS immediately (pause, seek, chapter change, cleanup).
+        :param reason:
+        """
+        if not self.syncEngine:
+            return
+        try:
+            await self.syncEngine.flush(reason)
+            self.currentTime = self.syncEngine.position
+        except Exception as e:
+            logger.warning(f"Error flushing session sync ({reason}): {e}")
+
+    def set_chapters(self, chapters):
+        """
+        Store the chapters of the current item and index them by start time.
+        :param chapters: list of chapter dicts, a ChapterIndex, or None to clear
+        """
+        if isinstance(chapters, ChapterIndex):
+            self.chapterIndex = chapters
+        else:
+            self.chapterIndex = ChapterIndex(self.bookItemID, chapters)
+        self.chapterArray = self.chapterIndex.chapters if chapters is not None else None
+
+    async def cleanup_session(self, reason="unknown"):
+        """Cleanup method that handles all session ending scenarios"""
+        logger.info(f"Cleaning up session - {reason}")
+
+        # Update the announcement card if it exists 
+        if self.announcement_message:
+            try:
+                now = datetime.now(tz=timeZone)
+                formatted_time = now.strftime("%m-%d %H:%M:%S")
+
+                # Calculate final progress if we have the data
+                final_progress = "Unknown"
+                if self.bookDuration and self.currentTime:
+                    progress_percentage = min(100, (self.currentTime / self.bookDuration) * 100)
+                    final_progress = f"{progress_percentage:.1f}%"
+
+                formatted_duration = time_converter(self.bookDuration) if self.bookDuration else "Unknown"
+                formatted_current = time_converter(self.currentTime) if self.currentTime else "Unknown"
+
+                stopped_embed = Embed(
+                    title="⏹️ Playback Stopped",
+                    description=f"**{self.bookTitle or 'Unknown'}** playback has ended.",
+                    color=0x95a5a6  # Gray color for stopped
+                )
+
+                # Add playback summary
+                playback_summary = (
+                    f"**Final Progress:** {final_progress}\n"
+                    f"**Time Reached:** {formatted_current}\n"
+                    f"**Total Duration:** {formatted_duration}\n"
+                    f"**Ended At:** {formatted_time}"
+                )
+                stopped_embed.add_field(name="📊 Session Summary", value=playback_summary, inline=False)
+
+                # Keep the cover image
+                if self.cover_image:
+                    stopped_embed.add_image(self.cover_image)
+
+                stopped_embed.footer = f"{s.bookshelf_traveller_footer} | Playback Ended"
+
+                await self.announcement_message.edit(embed=stopped_embed)
+                logger.debug("Updated announcement card to stopped state with summary")
+            except Exception as e:
+                logger.debug(f"Error updating announcement card: {e}")
+
+        # Stop tasks
+        if self.session_update.running:
+            self.session_update.stop()
+            logger.debug("Stopped session_update task")
+
+        if self.auto_kill_session.running:
+            self.auto_kill_session.stop()
+            logger.debug("Stopped auto_kill_session task")
+
+        # Stop voice playback if active
+        try:
+            if hasattr(self, 'audio_context') and self.audio_context and self.audio_context.voice_state:
+                self.voice_state.stop()
+                logger.debug("Stopped voice playback")
+        except Exception as e:
+            logger.debug(f"Error stopping voice playback: {e}")
+
+        # Clean up audio object
+        try:
+            if hasattr(self, 'audioObj') and self.audioObj:
+                self.audioObj.cleanup()
+                logger.debug("Cleaned up audio object")
+        except Exception as e:
+            logger.debug(f"Error cleaning audio object: {e}")
+        self._remove_concat_file()
+        self.trackIndex = None
+        self.streamSource = None
+        self._cancel_pending_seek()
+        await self.discard_prefetch("session ended")
+
+        # Disconnect from voice channel
+        try:
+            if hasattr(self, 'audio_context') and self.audio_context and self.audio_context.voice_state:
+                await self.audio_context.voice_state.channel.disconnect()
+                logger.debug("Disconnected from voice channel")
+        except Exception as e:
+            logger.debug(f"Error disconnecting from voice: {e}")
+
+        # Close ABS session and all sessions
+        if hasattr(self, 'sessionID') and self.sessionID:
+            if self.syncEngine:
+                self.syncEngine.stop_clock()
+                await self.flush_session_sync("cleanup")
+                logger.info(f"Session sync stats: {self.syncEngine.stats()}")
+            try:
+                await c.bookshelf_close_session(self.sessionID)
+                logger.debug(f"Closed ABS session: {self.sessionID}")
+            except Exception as e:
+                logger.debug(f"Error closing ABS session: {e}")
+
+        # Leave the registry, the next /play in this guild starts from a fresh session
+        self.registry.remove(self)
+
+        # Clear bot presence unless another guild is still listening
+        try:
+            if not self.registry.active_sessions():
+                await self.client.change_presence(activity=None)
+                logger.debug("Cleared bot presence")
+        except Exception as e:
+            logger.debug(f"Error clearing presence: {e}")
+
+        # Reset all state variables
+        try:
+            self.sessionID = ''
+            self.bookItemID = ''
+            self.bookTitle = ''
+            self.bookDuration = None
+            self.currentTime = 0.0
+            self.current_playback_time = 0
+            self.activeSessions = max(0, self.activeSessions - 1)  # Prevent negative
+            self.sessionOwner = None
+            self.play_state = 'stopped'
+            self.stream_started = False
+            self.repeat_enabled = False
+
+            # Clear message references
+            self.audio_message = None
+            self.announcement_message = None
+            self.context_voice_channel = None
+            self.current_channel = None
+            self.active_guild_id = None
+
+            # Reset chapter variables
+            self.currentChapter = None
+            self.set_chapters(None)
+            self.currentChapterTitle = ''
+            self.newChapterTitle = ''
+            self.found_next_chapter = False
+            self.bookFinished = False
+            self.nextTime = None
+            self.syncEngine = None
+
+            # Reset series context
+            self.seriesList = []
+            self.seriesIndex = None
+            self.previousBookID = None
+            self.previousBookTime = None
+            self.currentSeries = None
+            self.isLastBookInSeries = False
+            self.isFirstBookInSeries = False
+            self.seriesBookCache = {}
+
+            # Reset podcast context
+            self.podcastEpisodes = []
+            self.currentEpisodeIndex = None
+            self.totalEpisodes = 0
+            self.isFirstEpisode = False
+            self.isLastEpisode = False
+            self.currentEpisodeTitle = ''
+            self.episodeInfo = None
+
+            # Reset audio variables
+            self.volume = 0.5
+            self.audioObj = None
+            self.voice_state = None
+
+            logger.debug("Reset all state variables")
+        except Exception as e:
+            logger.error(f"Error resetting state variables: {e}")
+
+    async def _auto_kill_session(self):
+        if self.play_state == 'paused' and self.audio_message is not None:
+            logger.warning("Auto kill session task active! Playback was paused, verifying if session should be active.")
+            voice_state = self.bot.get_bot_voice_state(self.active_guild_id)
+            channel = await self.bot.fetch_channel(self.current_channel)
+
+            chan_msg = await channel.send(
+                f"Current playback of **{self.bookTitle}** will be stopped in **60 seconds** if no activity occurs.")
+            await asyncio.sleep(60)
+
+            if channel and voice_state and self.play_state == 'paused':
+                await chan_msg.edit(
+                    content=f'Current playback of **{self.bookTitle}** has been stopped due to inactivity.')
+                await voice_state.stop()
+                await voice_state.disconnect()
+                await c.bookshelf_close_session(self.sessionID)
+                logger.warning("audio session deleted due to timeout.")
+
+                # Reset Vars and close out loops
+                self.current_channel = None
+                self.play_state = 'stopped'
+                self.audio_message = None
+                self.activeSessions -= 1
+                self.sessionOwner = None
+                self.audioObj.cleanup()  # NOQA
+                self._remove_concat_file()
+                self._cancel_pending_seek()
+                await self.discard_prefetch("session timed out")
+                self.announcement_message = None
+                self.context_voice_channel = None
+
+                if self.session_update.running:
+                    self.session_update.stop()
+
+                self.registry.remove(self)
+
+            else:
+                logger.debug("Session resumed, aborting task and deleting message!")
+                await chan_msg.delete()
+
+            # End loop
+            self.auto_kill_session.stop()
+
+    async def restart_media_from_beginning(self):
+        """
+        Restart the current media (book/podcast) from the beginning while preserving session properties.
+        This method handles the complete restart process for both books and podcast episodes.
+        """
+        if not self.bookItemID:
+            logger.error("Cannot restart - no active media session")
+            return False
+
+        try:
+            # Store current session properties we want to preserve
+            preserved_book_id = self.bookItemID
+            preserved_title = self.bookTitle
+            preserved_duration = self.bookDuration
+            preserved_cover = self.cover_image
+            preserved_chapter_array = self.chapterArray
+            preserved_volume = self.volume
+            preserved_session_owner = self.sessionOwner
+            preserved_context = self.audio_context
+            preserved_voice_channel = self.context_voice_channel
+            preserved_current_channel = self.current_channel
+            preserved_active_guild_id = self.active_guild_id
+            preserved_username = self.username
+            preserved_user_type = self.user_type
+            preserved_current_playback_time = self.current_playback_time
+
+            # Preserve series variables
+            preserved_series = self.currentSeries
+            preserved_series_list = self.seriesList.copy()
+            preserved_series_index = self.seriesIndex
+            preserved_series_enabled = self.seriesAutoplay
+            preserved_is_first = self.isFirstBookInSeries
+            preserved_is_last = self.isLastBookInSeries
+
+            # Preserve podcast variables
+            preserved_is_podcast = self.isPodcast
+            preserved_podcast_episodes = self.podcastEpisodes.copy() if self.podcastEpisodes else []
+            preserved_current_episode_index = self.currentEpisodeIndex
+            preserved_total_episodes = self.totalEpisodes
+            preserved_is_first_episode = self.isFirstEpisode
+            preserved_is_last_episode = self.isLastEpisode
+            preserved_current_episode_title = self.currentEpisodeTitle
+            preserved_podcast_autoplay = self.podcastAutoplay
+            preserved_episode_info = getattr(self, 'episodeInfo', None)
+
+            # Close current session
+            self._cancel_pending_seek(superseded=True)
+            current_session_id = self.sessionID
+            if current_session_id:
+                logger.info(f"Closing current session {current_session_id} before restart")
+                await c.bookshelf_close_session(current_session_id)
+
+            # Use unified session builder to create new session from beginning
+            if preserved_is_podcast and preserved_current_episode_index is not None:
+                # For podcasts, restart the current episode
+                audio, actual_start_time, session_id, book_title, book_duration = await self.build_session(
+                    item_id=preserved_book_id,
+                    force_restart=True,
+                    episode_index=preserved_current_episode_index
+                )
+            else:
+                # For books, restart from beginning
+                audio, actual_start_time, session_id, book_title, book_duration = await self.build_session(
+                    item_id=preserved_book_id,
+                    force_restart=True
+                )
+
+            logger.info(f"New session created: {session_id} (was: {current_session_id})")
+
+            # Restore preserved properties
+            self.bookTitle = preserved_title
+            self.bookDuration = preserved_duration
+            self.cover_image = preserved_cover
+            self.set_chapters(preserved_chapter_array)
+            self.volume = preserved_volume
+            self.sessionOwner = preserved_session_owner
+            self.audio_context = preserved_context
+            self.context_voice_channel = preserved_voice_channel
+            self.current_channel = preserved_current_channel
+            self.active_guild_id = preserved_active_guild_id
+            self.username = preserved_username
+            self.user_type = preserved_user_type
+            self.isPodcast = preserved_is_podcast
+            self.current_playback_time = preserved_current_playback_time
+
+            # Restore series variables
+            self.currentSeries = preserved_series
+            self.seriesList = preserved_series_list
+            self.seriesIndex = preserved_series_index
+            self.seriesAutoplay = preserved_series_enabled
+            self.isFirstBookInSeries = preserved_is_first
+            self.isLastBookInSeries = preserved_is_last
+
+            # Restore podcast variables
+            self.podcastEpisodes = preserved_podcast_episodes
+            self.currentEpisodeIndex = preserved_current_episode_index
+            self.totalEpisodes = preserved_total_episodes
+            self.isFirstEpisode = preserved_is_first_episode
+            self.isLastEpisode = preserved_is_last_episode
+            self.currentEpisodeTitle = preserved_current_episode_title
+            self.podcastAutoplay = preserved_podcast_autoplay
+            if preserved_episode_info:
+                self.episodeInfo = preserved_episode_info
+
+            self.currentTime = 0.0
+
+            # Set to first chapter if it's a book with chapters
+            if not self.isPodcast and self.chapterArray and len(self.chapterArray) > 0:
+                self.chapterArray.sort(key=lambda x: float(x.get('start', 0)))
+                first_chapter = self.chapterArray[0]
+                self.currentChapter = first_chapter
+                self.currentChapterTitle = first_chapter.get('title', 'Chapter 1')
+            elif self.isPodcast:
+                # For podcasts, set the episode title
+                if self.currentEpisodeIndex is not None and self.podcastEpisodes:
+                    current_episode = self.podcastEpisodes[self.currentEpisodeIndex]
+                    episode_number = current_episode.get('episode')
+                    if episode_number is not None:
+                        self.currentChapterTitle = f"Episode {episode_number}"
+                    else:
+                        if self.currentEpisodeIndex == 0:
+                            self.currentChapterTitle = "Latest Episode"
+                        else:
+                            self.currentChapterTitle = f"Episode {self.currentEpisodeIndex + 1}"
+
+            # Reset playback state
+            self.play_state = 'playing'
+            self.audioObj = audio
+
+            # Apply preserved volume to new audio object
+            audio.volume = preserved_volume
+
+
+            logger.info(f"Successfully restarted media from beginning. New session: {self.sessionID}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error restarting media from beginning: {e}")
+            return False
+
+    # Random Functions ------------------------
+
+    # Change Chapter Function
+    async def move_chapter(self, target_index=None, relative_move=None):
+        """
+        Navigate to a chapter by absolute index or relative movement.
+    
+        Args:
+            target_index: Absolute chapter index (0-based) to navigate to
+            relative_move: Relative movement (+1 for next, -1 for previous)
+    
+        Note: Provide either target_index OR relative_move, not both.
+        Playback continues from the target chapter, chapter changes in quick succession add up and are
+        streamed once (see seek_to).
+        """
+        logger.info(f"Executing move_chapter with target_index={target_index}, relative_move={relative_move}")
+
+        # Check if chapter data exists
+        if not self.currentChapter or not self.chapterArray:
+            logger.warning("No chapter data available for this book. Cannot navigate chapters.")
+            self.found_next_chapter = False
+            return
+
+        # Check if bookFinished flag is set
+        if self.bookFinished:
+            logger.info("Book is already finished, cannot navigate chapters.")
+            self.found_next_chapter = False
+            return
+
+        try:
+            # Get current chapter index
+            current_chapter_id = int(self.currentChapter.get('id', 0))
+            current_index = next((i for i, ch in enumerate(self.chapterArray)
+                                  if int(ch.get('id', 0)) == current_chapter_id), 0)
+
+            # Calculate target index
+            if target_index is not None:
+                next_index = target_index
+            elif relative_move is not None:
+                next_index = current_index + relative_move
+            else:
+                logger.error("Must provide either target_index or relative_move")
+                self.found_next_chapter = False
+                return
+
+            # Handle boundary conditions
+            max_index = len(self.chapterArray) - 1
+
+            # Handle going past the end
+            if next_index > max_index:
+                if self.repeat_enabled:
+                    logger.info("Reached final chapter with repeat enabled - restarting book")
+
+                    # Stop the session update task before restart
+                    if self.session_update.running:
+                        self.session_update.stop()
+
+                    # Handle restart directly
+                    restart_success = await self.restart_media_from_beginning()
+                    if restart_success:
+                        # Send manual session sync
+                        await self.flush_session_sync("restart")
+                        self.nextTime = None
+
+                        # Set the chapter info for the UI callback to use
+                        if self.chapterArray and len(self.chapterArray) > 0:
+                            first_chapter = self.chapterArray[0]
+                            self.newChapterTitle = first_chapter.get('title', 'Chapter 1')
+                        else:
+                            self.newChapterTitle = 'Chapter 1'
+
+                        # Restart the session update task
+                        await self._play_current()
+                        self.session_update.start()
+                        self.found_next_chapter = True
+                        return
+                    else:
+                        logger.error("Restart failed during chapter navigation")
+                        await self.cleanup_session("restart failed")
+                        self.found_next_chapter = False
+                        return
+
+                elif self.seriesAutoplay and self.currentSeries and not self.isLastBookInSeries:
+                    logger.info(
+                        "Reached final chapter - moving to next book in series")  # Stop the session update task before moving to next book                                             if self.session_update.running:
+
+                    # Stop the session update task before moving to next book
+                    if self.session_update.running:
+                        self.session_update.stop()
+
+                    # Mark the book as complete
+                    try:
+                        await c.bookshelf_mark_book_finished(self.bookItemID, self.sessionID)
+                        logger.info(f"Successfully marked book {self.bookItemID} as finished before series progression")
+                    except Exception as e:
+                        logger.warning(f"Failed to mark book as finished before series progression: {e}")
+
+                    success = await self.move_to_series_book(
+                        "next")  # Move to next book in series                                                                         success = await self.move_to_next_book_in_series()
+                    if success:
+                        await self._play_current()
+                        # Set the chapter info for the UI callback to use
+                        self.newChapterTitle = self.currentChapterTitle
+                        self.found_next_chapter = True
+
+                        if self.seriesIndex is not None:
+                            self.isFirstBookInSeries = self.seriesIndex == 0
+                            self.isLastBookInSeries = self.seriesIndex == len(self.seriesList) - 1
+                            logger.info(
+                                f"Updated series position: book {self.seriesIndex + 1}/{len(self.seriesList)}, first={self.isFirstBookInSeries}, last={self.isLastBookInSeries}")
+
+                        return
+                    else:
+                        logger.error("Failed to move to next book in series")
+                        await self.cleanup_session("series progression failed")
+                        self.found_next_chapter = False
+                        return
+                else:
+                    # Normal completion handling
+                    logger.info("Skipped past final chapter - marking complete and cleaning up")
+                    await c.bookshelf_mark_book_finished(self.bookItemID, self.sessionID)
+                    await self.cleanup_session("completed via chapter skip")
+                    self.found_next_chapter = False
+                    return
+
+            # Handle going before the beginning
+            if next_index < 0:
+                logger.info("Attempting to go before first chapter, staying at first chapter")
+                next_index = 0
+
+            # Get target chapter
+            target_chapter = self.chapterArray[next_index]
+
+            # Stop current session update task
+            self.session_update.stop()
+
+            # Get chapter start time
+            chapter_start = float(target_chapter.get('start'))
+            self.newChapterTitle = target_chapter.get('title', 'Unknown Chapter')
+
+            logger.info(f"Selected Chapter: {self.newChapterTitle}, Starting at: {chapter_start}")
+
+            # Set the chapter before moving the stream so a following relative move builds on it
+            self.currentChapter = target_chapter
+            self.currentChapterTitle = target_chapter.get('title', 'Unknown Chapter')
+            logger.info(f"Updated current chapter to: {self.currentChapterTitle}")
+
+            # Move the open stream to the chapter start, the ABS session is kept and synced to it
+            if not await self.seek_to(chapter_start):
+                logger.error("Failed to move the stream to the selected chapter")
+                if self.sessionID:
+                    self.session_update.start()
+                self.found_next_chapter = False
+                return
+
+            # Clear nextTime
+            self.nextTime = None
+
+            # Verify chapter information against the chapter index
+            verified_chapter = self.chapterIndex.chapter_at(chapter_start)
+            if verified_chapter and verified_chapter.get('title') != self.currentChapterTitle:
+                verified_title = verified_chapter.get('title')
+                logger.warning(
+                    f"Chapter title mismatch! Selected: {self.currentChapterTitle}, Indexed: {verified_title}")
+                self.currentChapter = verified_chapter
+                self.currentChapterTitle = verified_title
+
+            self.session_update.start()
+            self.found_next_chapter = True
+
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error in move_chapter: {e}")
+            self.found_next_chapter = False
+
+    def modified_message(self, color, chapter):
+        now = datetime.now(tz=timeZone)
+        formatted_time = now.strftime("%m-%d %H:%M:%S")
+
+        # Calculate progress percentage and time progressed
+        progress_percentage = 0
+        if self.bookDuration and self.bookDuration > 0 and self.currentTime is not None:
+            safe_current_time = min(self.currentTime, self.bookDuration)
+            progress_percentage = (safe_current_time / self.bookDuration) * 100
+            progress_percentage = round(progress_percentage, 1)
+            progress_percentage = max(0, min(100, progress_percentage))
+
+        formatted_duration = time_converter(self.bookDuration) if self.bookDuration else "Unknown"
+        formatted_current = time_converter(self.currentTime) if self.currentTime is not None else "Unknown"
+
+        # Prepare series/episode info if available
+        series_info = None
+        if self.isPodcast and hasattr(self, 'currentEpisodeIndex') and self.currentEpisodeIndex is not None:
+            # Get actual episode number if available
+            current_episode = self.podcastEpisodes[self.currentEpisodeIndex]
+            episode_number = current_episode.get('episode')
+
+            # Position in chronological order (1 = newest, 2 = second newest, etc.)
+            position_in_list = self.currentEpisodeIndex + 1
+
+            if episode_number is not None:
+                try:
+                    # Use actual episode number with chronological position
+                    episode_display = f"Episode {episode_number} ({position_in_list} of {self.totalEpisodes})"
+                except (ValueError, TypeError):
+                    # Fallback to position-based
+                    episode_display = f"Episode {position_in_list} ({position_in_list} of {self.totalEpisodes})"
+            else:
+                # No episode number available, use position-based with context
+                if self.currentEpisodeIndex == 0:
+                    episode_display = f"Latest Episode (1 of {self.totalEpisodes})"
+                else:
+                    episode_display = f"Episode {position_in_list} ({position_in_list} of {self.totalEpisodes})"
+
+            series_info = {
+                'name': episode_display,
+                'current': self.currentEpisodeIndex + 1,
+                'total': self.totalEpisodes
+            }
+        elif self.currentSeries and self.seriesIndex is not None:
+            series_info = {
+                'name': self.currentSeries['name'],
+                'current': self.seriesIndex + 1,
+                'total': len(self.seriesList)
+            }
+
+        return create_playback_embed(
+            book_title=self.bookTitle or "Unknown Book",
+            chapter_title=chapter or "Unknown Chapter",
+            progress=f"{progress_percentage}%",
+            current_time=formatted_current,
+            duration=formatted_duration,
+            username=self.username or "Unknown User",
+            user_type=self.user_type or "user",
+            cover_image=self.cover_image or "",
+            color=color,
+            volume=self.volume or 0.0,
+            timestamp=formatted_time,
+            version=s.versionNumber,
+            repeat_enabled=self.repeat_enabled,
+            series_info=series_info,
+            is_podcast=self.isPodcast
+        )
+    def create_announcement_embed(self, voice_channel, guild_name):
+        """Create the announcement embed with current playback info"""
+        now = datetime.now(tz=timeZone)
+        formatted_time = now.strftime("%m-%d %H:%M:%S")
+
+        # Calculate progress percentage
+        progress_percentage = 0
+        if self.bookDuration and self.bookDuration > 0:
+            safe_current_time = min(self.currentTime, self.bookDuration)
+            progress_percentage = (safe_current_time / self.bookDuration) * 100
+            progress_percentage = round(progress_percentage, 1)
+            progress_percentage = max(0, min(100, progress_percentage))
+
+        # Format duration and current time
+        formatted_duration = time_converter(self.bookDuration)
+        formatted_current = time_converter(self.currentTime)
+
+        # Dynamic status for title
+        status_emoji = {
+            'playing': '▶️',
+            'paused': '⏸️',
+            'stopped': '⏹️'
+        }
+        current_emoji = status_emoji.get(self.play_state, '🎧')
+
+        # Create announcement embed
+        embed_message = Embed(
+            title=f"{current_emoji} {self.play_state.upper()}",
+            description=f"**{self.bookTitle}**",
+            color=0x3498db if self.play_state == 'playing' else (0xe67e22 if self.play_state == 'paused' else 0x95a5a6)
+        )
+
+        # Get proper chapter/episode display
+        if self.isPodcast:
+            current_episode = self.podcastEpisodes[self.currentEpisodeIndex]
+            episode_number = current_episode.get('episode')
+            position_in_list = self.currentEpisodeIndex + 1
+
+            if episode_number is not None:
+                chapter_display = f"Episode {episode_number}"
+            else:
+                if self.currentEpisodeIndex == 0:
+                    chapter_display = "Latest Episode"
+                else:
+                    chapter_display = f"Episode {position_in_list}"
+        else:
+            chapter_display = self.currentChapterTitle
+
+        # Add playbook information
+        playback_info = (
+            f"**Status:** {self.play_state.title()}\n"
+            f"**Progress:** {progress_percentage}%\n"
+            f"**{'Episode' if self.isPodcast else 'Chapter'}:** {chapter_display}\n"
+            f"**Current Time:** {formatted_current}\n"
+            f"**Total Duration:** {formatted_duration}"
+        )
+        embed_message.add_field(name="📖 Playback Status", value=playback_info, inline=True)
+
+        try:
+            listener_count = len(voice_channel.voice_members) - 1 if voice_channel else 0  # L - 1 since the bot was counted previously
+            channel_info = (
+                f"**Channel:** {voice_channel.mention if voice_channel else 'Unknown'}\n"
+                f"**Server:** {guild_name}\n"
+                f"**Listeners:** {listener_count}\n"  
+                f"Click channel name above to join!"
+            )
+            embed_message.add_field(name="🔊 Channel Info", value=channel_info, inline=True)
+        except Exception:
+            channel_info = (
+                f"**Channel:** Voice channel unavailable\n"
+                f"**Server:** {guild_name}\n"
+                f"**Status:** Playback active"
+            )
+            embed_message.add_field(name="🔊 Channel Info", value=channel_info, inline=True)
+
+        # Add cover image if available
+        if self.cover_image:
+            embed_message.add_image(self.cover_image)
+
+        # Add footer
+        embed_message.footer = f"Powered by Bookshelf Traveller 🕮 | {s.versionNumber}\nDisplay Last Updated: {formatted_time}"
+
+        return embed_message
+
+    # Series Functions ---------------------------
+
+    async def get_series_info(self, item_id: str):
+        """
+        Fetch series information for a given book.
+        Returns: (series_data, series_books_list) or (None, None) if not in series
+        """
+        try:
+            # The item document is cached, its series entry carries the series id
+            data = await c.bookshelf_get_item(item_id)
+            series_raw = data.get('media', {}).get('metadata', {}).get('series') or [] if data else []
+
+            if not series_raw:
+                logger.debug(f"Book {item_id} is not part of a series")
+                return None, None
+
+            series_id = series_raw[0].get('id')
+            series_name = series_raw[0].get('name', '').strip()
+            logger.info(f"Searching for all books in series: '{series_name}'")
+
+            series = await series_index.get_series(series_id=series_id, name=series_name)
+
+            if not series:
+                logger.warning(f"Could not find series ID for '{series_name}'")
+                return None, None
+
+            # Books are already sorted by sequence
+            series_books = series['books']
+            if not series_books:
+                logger.warning(f"No books found in series '{series_name}'")
+                return None, None
+
+            series_data = {
+                'id': series['id'],
+                'name': series['name'],
+                'total_books': len(series_books)
+            }
+
+            logger.info(f"Found series '{series['name']}' with {len(series_books)} books")
+            return series_data, series_books
+
+        except Exception as e:
+            logger.error(f"Error getting series info for {item_id}: {e}")
+            return None, None
+
+    async def setup_series_context(self, item_id: str):
+        """Setup series information for the current book"""
+        series_data, series_books = await self.get_series_info(item_id)
+
+        if series_data and series_books:
+            self.currentSeries = series_data
+            self.seriesList = [book['id'] for book in series_books]
+
+            # Find current book's position in series
+            try:
+                self.seriesIndex = self.seriesList.index(item_id)
+                self.isFirstBookInSeries = self.seriesIndex == 0
+                self.isLastBookInSeries = self.seriesIndex == len(self.seriesList) - 1
+
+                # Cache series book data for dropdown
+                await self._cache_series_book_data()
+
+                logger.info(f"Book {self.seriesIndex + 1}/{len(self.seriesList)} in series '{series_data['name']}'")
+                return True
+            except ValueError:
+                logger.warning(f"Current book {item_id} not found in series list")
+                return False
+        else:
+            # Reset series context if book is not in a series
+            self.currentSeries = None
+            self.seriesList = []
+            self.seriesIndex = None
+            self.isFirstBookInSeries = False
+            self.isLastBookInSeries = False
+            self.seriesBookCache = {}
+            return False
+
+    async def move_to_series_book(self, direction=None, target_index=None):
+        """
+        Move to another book in the series - supports both direction and index patterns
+
+        Args:
+            direction: "next" or "previous" for sequential navigation (optional)
+            target_index: Specific index to jump to for menu selection (optional)
+
+        Note: Provide either direction OR target_index, not both
+
+        Returns:
+            bool: True if successful, False if failed or at series boundary
+        """
+        if not self.seriesList or self.seriesIndex is None:
+            logger.warning(f"No series context available for {direction} book")
+            return False
+
+        # Determine target index based on input pattern
+        if direction is not None and target_index is None:
+            # Direction-based navigation
+            if direction == "next":
+                if self.seriesIndex >= len(self.seriesList) - 1:
+                    logger.info("Already at the last book in series")
+                    return False
+                new_index = self.seriesIndex + 1
+            elif direction == "previous":
+                if self.seriesIndex <= 0:
+                    logger.info("Already at the first book in series")
+                    return False
+                new_index = self.seriesIndex - 1
+            else:
+                logger.error(f"Invalid direction: {direction}")
+                return False
+        elif target_index is not None and direction is None:
+            # Index-based navigation for menu selection
+            if target_index < 0 or target_index >= len(self.seriesList):
+                logger.warning(f"Series book index {target_index} out of range (0-{len(self.seriesList) - 1})")
+                return False
+            new_index = target_index
+        else:
+            logger.error("Must provide either direction OR target_index, not both or neither")
+            return False
+
+        target_book_id = self.seriesList[new_index]
+        logger.info(f"Moving to series book at index {new_index}: {target_book_id}")
+
+        try:
+            prepared = await self._take_prefetch(target_book_id)
+
+            # Determine start time based on navigation type
+            if prepared:
+                start_time = prepared['start_time']
+                logger.info(f"Using prefetched session for {target_book_id}")
+
+            elif direction == "next":
+                # Check if the target book is finished - if so, start from beginning
+                # Otherwise, let build_session respect the server's current position
+                start_time = await self._next_book_start_time(target_book_id)
+
+            elif direction == "previous":
+                # For previous books, check if we have stored progress or if it's finished
+                try:
+                    progress_data = await c.bookshelf_item_progress(target_book_id)
+                    is_finished = progress_data.get('finished', 'False') == 'True'
+
+                    if is_finished:
+                        start_time = 0.0
+                        logger.info(f"Target book {target_book_id} is finished - starting from beginning")
+                    elif target_book_id == self.previousBookID and self.previousBookTime:
+                        start_time = self.previousBookTime
+                        logger.info(f"Resuming previous book at {start_time}s")
+                    else:
+                        start_time = 0.0
+                        logger.info(f"No stored progress for previous book - starting from beginning")
+
+                except Exception as e:
+                    logger.warning(f"Error checking book progress, defaulting to beginning: {e}")
+                    start_time = 0.0
+            else:
+                # For direct index navigation, respect server position
+                start_time = None
+                logger.debug(f"Direct index navigation - respecting server position")
+
+            # Stop current session, a seek still waiting would land in the new item
+            if self.session_update.running:
+                self.session_update.stop()
+            self._cancel_pending_seek(superseded=True)
+            await c.bookshelf_close_session(self.sessionID)
+
+            # Build session for target book, or hand off to the prefetched one
+            if prepared:
+                audio, currentTime, sessionID, bookTitle, bookDuration = self.apply_session(prepared)
+            else:
+                audio, currentTime, sessionID, bookTitle, bookDuration = await self.build_session(
+                    item_id=target_book_id,
+                    start_time=start_time
+                )
+
+            # Update series position
+            self.seriesIndex = new_index
+            self.isFirstBookInSeries = self.seriesIndex == 0
+            self.isLastBookInSeries = self.seriesIndex == len(self.seriesList) - 1
+
+            # Update audio state
+            self.audioObj = audio
+            self.currentTime = currentTime
+            self.bookItemID = target_book_id
+            self.bookTitle = bookTitle
+            self.bookDuration = bookDuration
+            self.play_state = 'playing'
+            self.nextTime = None
+
+            # Set up chapter info for target book
+            if prepared and prepared.get('chapters'):
+                current_chapter, chapter_array, bookFinished, isPodcast = prepared['chapters']
+            else:
+                current_chapter, chapter_array, bookFinished, isPodcast = await c.bookshelf_get_current_chapter(
+                    target_book_id, start_time)
+            self.currentChapter = current_chapter
+            self.set_chapters(chapter_array)
+
+            if current_chapter and chapter_array and len(chapter_array) > 0:
+                self.currentChapterTitle = current_chapter.get('title', 'Chapter 1')
+            else:
+                self.currentChapterTitle = 'No Chapters'
+
+            self.isPodcast = isPodcast
+            self.bookFinished = False
+
+            # Update cover image
+            if prepared and prepared.get('cover'):
+                self.cover_image = prepared['cover']
+            else:
+                self.cover_image = await c.bookshelf_cover_image(target_book_id)
+
+            self.session_update.start()
+            return True
+
+        except Exception as e:
+            logger.error(f"Error moving to {direction} book in series: {e}")
+            return False
+
+    # Podcast Functions ---------------------------
+
+    async def setup_podcast_context(self, item_id: str, episode_index: int = 0):
+        """Setup podcast episode context"""
+        try:
+            episodes = await c.bookshelf_get_podcast_episodes(item_id)
+            if not episodes:
+                return False
+
+            self.podcastEpisodes = episodes
+            self.currentEpisodeIndex = episode_index
+            self.totalEpisodes = len(episodes)
+            self.isFirstEpisode = episode_index == 0
+            self.isLastEpisode = episode_index >= len(episodes) - 1
+
+            current_episode = episodes[episode_index]
+            self.currentEpisodeTitle = current_episode.get('title', 'Unknown Episode')
+
+            logger.info(f"Setup podcast context: Episode {episode_index + 1}/{len(episodes)}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error setting up podcast context: {e}")
+            return False
+
+    async def move_to_podcast_episode(self, target_index=None, relative_move=None):
+        """
+        Move to an episode by absolute index or relative movement.
+
+        Args:
+            target_index: Absolute episode index (0-based) to navigate to
+            relative_move: Relative movement (+1 for next, -1 for previous)
+
+        Note: Provide either target_index OR relative_move, not both
+
+        Returns:
+            bool: True if successful, False if failed or at episode boundary
+        """
+        if not self.podcastEpisodes or self.currentEpisodeIndex is None:
+            logger.warning(f"No podcast context available for {direction} episode")
+            return False
+
+        # Calculate target index based on input
+        if target_index is not None:
+            new_index = target_index
+            operation_desc = f"episode {target_index + 1}"
+        elif relative_move is not None:
+            if relative_move == 1:  # next
+                if self.currentEpisodeIndex >= len(self.podcastEpisodes) - 1:
+                    logger.info("Already at the last episode")
+                    return False
+                new_index = self.currentEpisodeIndex + 1
+                operation_desc = "next episode"
+            elif relative_move == -1:  # previous
+                if self.currentEpisodeIndex <= 0:
+                    logger.info("Already at the first episode")
+                    return False
+                new_index = self.currentEpisodeIndex - 1
+                operation_desc = "previous episode"
+            else:
+                logger.error(f"Invalid relative_move: {relative_move}")
+                return False
+        else:
+            logger.error("Must provide either target_index or relative_move")
+            return False
+
+        # Validate the target index
+        if new_index < 0 or new_index >= len(self.podcastEpisodes):
+            logger.warning(f"Episode index {new_index} out of range (0-{len(self.podcastEpisodes) - 1})")
+            return False
+
+        target_episode = self.podcastEpisodes[new_index]
+        target_episode_id = target_episode.get('id')
+        logger.info(f"Moving to {operation_desc}: {target_episode.get('title')}")
+
+        try:
+            # Stop current session, a seek still waiting would land in the new item
+            if self.session_update.running:
+                self.session_update.stop()
+            self._cancel_pending_seek(superseded=True)
+            await c.bookshelf_close_session(self.sessionID)
+
+            # Build session for target episode - respects server position like series books
+            prepared = await self._take_prefetch(self.bookItemID, new_index)
+            if prepared:
+                logger.info(f"Using prefetched session for episode {new_index + 1}")
+                audio, currentTime, sessionID, episodeTitle, episodeDuration = self.apply_session(prepared)
+            else:
+                audio, currentTime, sessionID, episodeTitle, episodeDuration = await self.build_session(
+                    item_id=self.bookItemID,
+                    episode_index=new_index
+                )
+
+            # Update episode position
+            self.currentEpisodeIndex = new_index
+            self.isFirstEpisode = self.currentEpisodeIndex == 0
+            self.isLastEpisode = self.currentEpisodeIndex >= len(self.podcastEpisodes) - 1
+
+            # Update audio state
+            self.audioObj = audio
+            self.currentTime = currentTime
+            self.sessionID = sessionID
+            self.bookTitle = episodeTitle  # Update title to episode title
+            self.bookDuration = episodeDuration
+            self.play_state = 'playing'
+            self.nextTime = None
+
+            # Clear chapter info (podcasts don't have chapters)
+            self.currentChapter = None
+            self.set_chapters(None)
+
+            # Set proper episode title for currentChapterTitle
+            episode_number = target_episode.get('episode')
+            position_in_list = new_index + 1
+
+            if episode_number is not None:
+                self.currentChapterTitle = f"Episode {episode_number}"
+            else:
+                if new_index == 0:
+                    self.currentChapterTitle = "Latest Episode"
+                else:
+                    self.currentChapterTitle = f"Episode {position_in_list}"
+
+            # Update episode title
+            self.currentEpisodeTitle = target_episode.get('title', 'Unknown Episode')
+
+            # Update cover image (could be episode-specific or podcast-general)
+            self.cover_image = await c.bookshelf_cover_image(self.bookItemID)
+
+            self.session_update.start()
+            return True
+
+        except Exception as e:
+            logger.error(f"Error moving to {direction} episode: {e}")
+            return False
+
+    # Component Callbacks Functions------------------
+
+    def get_current_playback_buttons(self):
+        """Get the current playback buttons based on current state"""
+        logger.debug(f"get_current_playback_buttons called: seriesIndex={getattr(self, 'seriesIndex', None)}")
+
+        # First check for chapters
+        has_chapters = False
+        if not self.isPodcast:  # Only books can have chapters
+            has_chapters = bool(
+                self.currentChapter and
+                self.chapterArray and
+                len(self.chapterArray) > 1
+            )
+
+        # Generate dropdown options
+        episode_options = None
+        series_options = None
+
+        if self.isPodcast:
+            # Generate episode options
+            episode_options = self._create_episode_options()
+            logger.debug(f"Generated {len(episode_options) if episode_options else 0} episode options")
+
+            # Podcasts get episode navigation
+            return get_playback_rows(
+                play_state=self.play_state,
+                repeat_enabled=self.repeat_enabled,
+                is_podcast=True,
+                has_chapters=False,  # Podcasts never have chapters
+                is_series=False,  # Podcasts don't use series navigation
+                is_first_episode=self.isFirstEpisode,
+                is_last_episode=self.isLastEpisode,
+                podcast_autoplay=self.podcastAutoplay,
+                episode_options=episode_options
+            )
+        else:
+            # Books get series navigation
+            is_series = bool(self.currentSeries and len(self.seriesList) > 1)
+
+            if is_series:
+                # Generate series options
+                series_options = self._create_series_options()
+                logger.debug(f"Generated {len(series_options) if series_options else 0} series options")
+
+            return get_playback_rows(
+                play_state=self.play_state,
+                repeat_enabled=self.repeat_enabled,
+                is_podcast=False,
+                has_chapters=has_chapters,
+                is_series=is_series,
+                is_first_book=self.isFirstBookInSeries,
+                is_last_book=self.isLastBookInSeries,
+                series_autoplay=self.seriesAutoplay,
+                series_options=series_options
+            )
+
+    async def update_callback_embed(self, ctx, update_buttons=True, stop_auto_kill=False):
+        """
+        Update playback embed for component callbacks with proper chapter/episode display
+    
+        Args:
+            ctx: Component context
+            update_buttons: Whether to update the button components as well
+            stop_auto_kill: Whether to stop the auto-kill session task
+        """
+        # Get proper display title
+        if self.isPodcast:
+            current_episode = self.podcastEpisodes[self.currentEpisodeIndex]
+            episode_number = current_episode.get('episode')
+            position_in_list = self.currentEpisodeIndex + 1
+
+            if episode_number is not None:
+                display_chapter = f"Episode {episode_number}"
+            else:
+                if self.currentEpisodeIndex == 0:
+                    display_chapter = "Latest Episode"
+                else:
+                    display_chapter = f"Episode {position_in_list}"
+        else:
+            display_chapter = self.currentChapterTitle
+
+        # Generate embed
+        embed_message = self.modified_message(color=ctx.author.accent_color, chapter=display_chapter)
+
+        # Stop auto kill session task if requested
+        if stop_auto_kill and self.auto_kill_session.running:
+            logger.info("Stopping auto kill session backend task.")
+            self.auto_kill_session.stop()
+
+        # Update UI
+        if update_buttons:
+            await ctx.edit_origin(embed=embed_message, components=self.get_current_playback_buttons())
+        else:
+            await ctx.edit_origin(embed=embed_message)
+
+    def _create_media_options(self, media_type="series"):
+        """
+        Common function to create selection menus for both series and episodes
+    
+        Args:
+            media_type: "series" or "episode"
+    
+        Returns:
+            list: StringSelectOption objects for the dropdown
+        """
+        options = []
+
+        if media_type == "series":
+            if not self.currentSeries or not self.seriesList:
+                return None
+
+            media_list = self.seriesList
+            current_index = self.seriesIndex
+            cached_data = getattr(self, 'seriesBookCache', {})  # We'll need to add this cache
+
+        elif media_type == "episode":
+            if not self.isPodcast or not self.podcastEpisodes:
+                return None
+
+            media_list = self.podcastEpisodes
+            current_index = self.currentEpisodeIndex
+            cached_data = None  # Episodes have all data already
+        else:
+            return None
+
+        options = []
+
+        for index, item in enumerate(media_list):
+            if media_type == "series":
+                # Series book handling
+                book_id = item  # seriesList contains book IDs
+
+                # Use cached data if available, otherwise use basic info
+                if book_id in cached_data:
+                    title = cached_data[book_id].get('title', 'Unknown Book')
+                    author = cached_data[book_id].get('author', 'Unknown Author')
+                else:
+                    # Fallback if not cached
+                    if index == current_index:
+                        title = self.bookTitle
+                        author = "Current Book"
+                    else:
+                        title = "Unknown Book"
+                        author = "Unknown Author"
+
+                display_prefix = f"Book {index + 1}"
+                extra_info = author
+
+            else:
+                # Episode handling
+                episode = item  # podcastEpisodes contains episode objects
+                title = episode.get('title', 'Unknown Episode')
+                episode_number = episode.get('episode')
+
+                # Get Duration
+                audio_file = episode.get('audioFile', {})
+                episode_duration = audio_file.get('duration', 0) if audio_file else 0
+
+                # Format duration
+                if episode_duration and episode_duration > 0:
+                    extra_info = time_converter(int(episode_duration))
+                else:
+                    extra_info = "Unknown Duration"
+
+                # Create episode display prefix
+                position_in_list = index + 1
+                if episode_number is not None:
+                    display_prefix = f"Episode {episode_number}"
+                else:
+                    if index == 0:
+                        display_prefix = "Latest Episode"
+                    else:
+                        display_prefix = f"Episode {position_in_list}"
+
+            # Mark current item
+            is_current = index == current_index
+
+            if media_type == "episode":
+                # For episodes: use episode title as label, episode number + duration as description
+                display_title = title
+                if len(display_title) > 100:
+                    display_title = display_title[:97] + "..."
+
+                label = display_title
+                if is_current:
+                    label = f"⭐ {label}"
+
+                if episode_number is not None:
+                    description = f"Episode {episode_number} • {extra_info}"
+                else:
+                    if index == 0:
+                        description = f"Latest Episode • {extra_info}"
+                    else:
+                        description = f"Episode {index + 1} • {extra_info}"
+            else:
+                # For series: use book number + title as label, author + duration as description
+                display_title = title
+                book_number = index + 1
+
+                # Format as "Book # - Title"
+                full_label = f"Book {book_number} - {display_title}"
+                if len(full_label) > 100:
+                    # Truncate the title part if too long
+                    available_length = 100 - len(f"Book {book_number} - ") - 3
+                    display_title = display_title[:available_length] + "..."
+                    full_label = f"Book {book_number} - {display_title}"
+
+                label = full_label
+                if is_current:
+                    label = f"⭐ {label}"
+
+                # Get book duration from cached data if available
+                book_id = item
+                book_duration = ""
+                if book_id in cached_data and 'duration' in cached_data[book_id]:
+                    duration_seconds = cached_data[book_id]['duration']
+                    book_duration = f" • {time_converter(int(duration_seconds))}"
+
+                description = f"{extra_info}{book_duration}"
+
+            # Ensure label isn't too long (Discord limit is 100 chars)
+            if len(label) > 100:
+                label = label[:97] + "..."
+
+            options.append(StringSelectOption(
+                label=label,
+                value=str(index),
+                description=description,
+            ))
+
+        # Discord select menus are limited to 25 options
+        if len(options) > 25:
+            current_idx = current_index if current_index is not None else 0
+
+            # Show items around current selection
+            start_idx = max(0, current_idx - 12)  # 12 before + 1 current + 12 after = 25
+            end_idx = min(len(options), start_idx + 25)
+
+            # If we're near the end, adjust start to show last 25 items
+            if end_idx - start_idx < 25:
+                start_idx = max(0, end_idx - 25)
+
+            options = options[start_idx:end_idx]
+
+        return options
+
+    def _create_episode_options(self):
+        """Create episode dropdown options"""
+        return self._create_media_options("episode")
+
+    def _create_series_options(self):
+        """Create series book dropdown options"""
+        return self._create_media_options("series")
+
+    async def _cache_series_book_data(self):
+        """Cache book titles and authors for series dropdown"""
+        if not self.currentSeries or not self.seriesList:
+            return
+
+        self.seriesBookCache = {}
+
+        # Shared with every other session in the same series, usually built from the series payload alone
+        series = await series_index.get_series(series_id=self.currentSeries.get('id'),
+                                               name=self.currentSeries.get('name'))
+        if series is None:
+            return
+        self.seriesBookCache = await series_index.get_book_data(series)
+
+    async def shared_seek(self, seek_amount, is_forward=True):
+        """
+        Move playback forward or backward with chapter boundary awareness.
+
+        Parameters:
+        - seek_amount: Number of seconds to seek (positive value)
+        - is_forward: True for forward seeking, False for rewinding
+
+        Playback continues from the new position within the same ABS session, seeks in quick succession
+        add up and are streamed once (see seek_to).
+
+        Returns the audio object now playing, or None if the seek ended the session.
+        """
+        # Stop session update, it would move currentTime while seeks are being coalesced
+        self.session_update.stop()
+
+        # Use our current tracked position as the baseline for seeking
+        current_time = self.currentTime
+
+        # Format timestamps for better readability in logs
+        def format_time(seconds):
+            minutes = int(seconds) // 60
+            secs = int(seconds) % 60
+            return f"{minutes}m {secs}s ({seconds:.2f}s)"
+
+        if self.currentTime is None:
+            raise RuntimeError("shared_seek called with currentTime=None")
+
+        if self.currentChapter is None or self.chapterArray is None:
+            # No chapter data, perform simple seek
+            logger.warning("No chapter metadata, falling back to simple seek.")
+
+            if is_forward:
+                potential_time = self.currentTime + seek_amount
+                if potential_time >= self.bookDuration:
+                    if self.repeat_enabled:
+                        logger.info("Seeked past book end (no chapters, repeat enabled) - restarting book")
+
+                        # Handle restart directly
+                        restart_success = await self.restart_media_from_beginning()
+                        if restart_success:
+                            # Send manual session sync
+                            await self.flush_session_sync("restart")
+                            self.nextTime = None
+                            logger.info(f"Manual sync after restart: {self.currentTime}")
+
+                            # Restart the session update task
+                            await self._play_current()
+                            self.session_update.start()
+                            return self.audioObj
+                        else:
+                            logger.error("Restart failed during seek")
+                            await self.cleanup_session("restart failed")
+                            return None
+
+                    elif self.podcastAutoplay and self.isPodcast and not self.isLastEpisode:
+                        # Handle podcast episode progression
+                        logger.info("Seeked past episode end - moving to next episode")
+
+                        if self.session_update.running:
+                            self.session_update.stop()
+
+                        # Mark current episode as finished
+                        episode_id = getattr(self, 'episodeId', None)
+                        try:
+                            await c.bookshelf_mark_book_finished(self.bookItemID, self.sessionID, episode_id)
+                            logger.info(f"Successfully marked episode {episode_id} as finished before progression")
+                        except Exception as e:
+                            logger.warning(f"Failed to mark episode as finished before progression: {e}")
+
+                        # Move to next episode
+                        success = await self.move_to_podcast_episode(relative_move=1)
+                        if success:
+                            await self._play_current()
+                            self.session_update.start()
+                            return self.audioObj
+                        else:
+                            logger.error("Failed to move to next episode")
+                            await self.cleanup_session("episode progression failed")
+                            return None
+
+                    elif self.seriesAutoplay and self.currentSeries and not self.isLastBookInSeries:
+                        logger.info("Seeked past book end (with chapters) - moving to next book in series")
+
+                        if self.session_update.running:
+                            self.session_update.stop()
+
+                        success = await self.move_to_series_book("next")
+                        if success:
+                            await self._play_current()
+                            self.session_update.start()
+                            return self.audioObj
+                        else:
+                            logger.error("Failed to move to next book in series during seek")
+                            await self.cleanup_session("series progression failed")
+                            return None
+
+                    else:
+                        # Final fallback - mark as complete and cleanup
+                        if self.isPodcast:
+                            logger.info("Seeked past final episode - marking complete and cleaning up")
+                        else:
+                            logger.info("Seeked past book end - marking complete and cleaning up")
+
+                        # Mark as finished while we still have session info
+                        episode_id = getattr(self, 'episodeId', None) if self.isPodcast else None
+                        try:
+                            await c.bookshelf_mark_book_finished(self.bookItemID, self.sessionID, episode_id)
+                            logger.info(
+                                f"Successfully marked {'episode' if episode_id else 'book'} as finished via session sync")
+                        except Exception as e:
+                            logger.warning(f"Failed to mark as finished via session sync: {e}")
+
+                        await self.cleanup_session("completed via seek past end")
+                        return None
+
+                self.nextTime = self.currentTime + seek_amount
+            else:
+                self.nextTime = max(0.0, self.currentTime - seek_amount)
+
+        else:
+            # Chapter data is available
+            current_chapter = self.currentChapter
+            current_index = next(
+                (i for i, ch in enumerate(self.chapterArray) if ch.get('id') == current_chapter.get('id')), None)
+            prev_chapter = self.chapterArray[
+                current_index - 1] if current_index is not None and current_index > 0 else None
+            next_chapter = self.chapterArray[current_index + 1] if current_index is not None and current_index < len(
+                self.chapterArray) - 1 else None
+
+            chapter_start = float(current_chapter.get("start", 0.0))
+            time_from_chapter_start = self.currentTime - chapter_start
+
+            if is_forward:
+                if next_chapter and (chapter_start + seek_amount) > float(next_chapter.get("start", 0.0)):
+                    self.nextTime = float(next_chapter.get("start", 0.0))
+                    self.currentChapter = next_chapter
+                    self.currentChapterTitle = next_chapter.get("title", "Unknown Chapter")
+                    logger.debug("Forward: crossing into next chapter")
+                else:
+                    # Check if seeking would go past book end BEFORE setting nextTime
+                    potential_time = self.currentTime + seek_amount
+                    if potential_time >= self.bookDuration:
+                        if self.repeat_enabled:
+                            logger.info("Seeked past book end (with chapters, repeat enabled) - restarting book")
+
+                            # Handle restart directly
+                            restart_success = await self.restart_media_from_beginning()
+                            if restart_success:
+                                await self.flush_session_sync("restart")
+                                self.nextTime = None
+                                logger.info(f"Manual sync after restart (no chapters): {self.currentTime}")
+
+                                # Restart the session update task
+                                await self._play_current()
+                                self.session_update.start()
+                                return self.audioObj
+                            else:
+                                logger.error("Restart failed during seek")
+                                await self.cleanup_session("restart failed")
+                                return None
+
+                        # Note no podcast logic here as they don't have chapters
+                        elif self.seriesAutoplay and self.currentSeries and not self.isLastBookInSeries:
+                            logger.info("Seeked past book end (with chapters) - moving to next book in series")
+
+                            if self.session_update.running:
+                                self.session_update.stop()
+
+                            success = await self.move_to_series_book("next")
+                            if success:
+                                await self._play_current()
+                                self.session_update.start()
+                                return self.audioObj
+                            else:
+                                logger.error("Failed to move to next book in series during seek")
+                                await self.cleanup_session("series progression failed")
+                                return None
+
+                        else:
+                            logger.info(
+                                "Seeked past book end (with chapters, no repeat) - marking complete and cleaning up")
+                            await c.bookshelf_mark_book_finished(self.bookItemID, self.sessionID)
+                            await self.cleanup_session("completed via seek past end")
+                            return None
+
+                    self.nextTime = min(self.bookDuration, self.currentTime + seek_amount)
+                    logger.debug("Forward: simple time advance")
+            else:
+                # Backward seeking logic
+                if time_from_chapter_start <= 5.0 and prev_chapter:
+                    prev_start = float(prev_chapter.get("start", 0.0))
+                    prev_end = chapter_start
+                    back_time = seek_amount - time_from_chapter_start
+                    self.nextTime = max(0.0, prev_end - back_time)
+                    self.currentChapter = prev_chapter
+                    self.currentChapterTitle = prev_chapter.get("title", "Unknown Chapter")
+                    logger.debug("Rewind: jumping into previous chapter")
+                elif time_from_chapter_start <= 30.0:
+                    self.nextTime = max(0.0, chapter_start)
+                    logger.debug("Rewind: returning to start of current chapter")
+                else:
+                    self.nextTime = max(0.0, self.currentTime - seek_amount)
+                    logger.debug("Rewind: simple time rewind")
+
+        # Move the open stream, the ABS session is kept
+        if not await self.seek_to(self.nextTime):
+            if self.sessionID:
+                logger.error("Seek failed")
+                await self.cleanup_session("seek failed")
+            return None
+
+        # Do an explicit check to make sure we have the latest chapter info
+        # This is especially important after moving across chapter boundaries
+        if not self.isPodcast:
+            current_chapter = self.chapterIndex.chapter_at(self.currentTime)
+            if current_chapter:
+                self.currentChapter = current_chapter
+                self.currentChapterTitle = current_chapter.get('title', 'Unknown Chapter')
+                logger.info(f"Final chapter verification: {self.currentChapterTitle}")
+
+        self.nextTime = None
+
+        self.session_update.start()
+        return self.audioObj
+
+
+class PlaybackRegistry:
+    """
+    Playback sessions keyed by guild ID.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._sessions = {}
+        metrics.register_collector(self._session_metrics)
+
+    def _session_metrics(self):
+        states = {'playing': 0, 'paused': 0}
+        for session in self.active_sessions():
+            state = 'paused' if session.play_state == 'paused' else 'playing'
+            states[state] += 1
+        for state, count in states.items():
+            yield 'gauge', 'voice.sessions', {'state': state}, count
+        yield 'gauge', 'voice.prefetched', {}, sum(1 for session in self._sessions.values() if session.prefetched)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, guild_id):
+        return guild_id in self._sessions
+
+    def get(self, guild_id) -> PlaybackSession:
+        """
+        :param guild_id:
+        :return: the session of guild_id, or an idle session that is not registered if the guild isn't playing
+        """
+        session = self._sessions.get(guild_id)
+        if session is None:
+            session = PlaybackSession(self.bot, guild_id, self)
+        return session
+
+    def get_or_create(self, guild_id) -> PlaybackSession:
+        """
+        :param guild_id:
+        :return: the registered session of guild_id, created if needed
+        """
+        session = self._sessions.get(guild_id)
+        if session is None:
+            session = PlaybackSession(self.bot, guild_id, self)
+            self._sessions[guild_id] = session
+            logger.debug(f"Created playback session for guild {guild_id}")
+        return session
+
+    def remove(self, session: PlaybackSession):
+        """
+        Unregister session, a newer session of the same guild is left alone.
+        :param session:
+        """
+        if self._sessions.get(session.guild_id) is session:
+            del self._sessions[session.guild_id]
+            logger.debug(f"Removed playback session for guild {session.guild_id}")
+
+    def values(self):
+        return list(self._sessions.values())
+
+    def active_sessions(self) -> list:
+        """
+        :return: sessions that are currently connected and playing or paused
+        """
+        return [session for session in self._sessions.values() if session.activeSessions > 0]
@@ -0,0 +1,355 @@
+"""
+Search Index - in-process title/author/series/narrator search over the library mirror.
+
+Text is accent-folded and split into tokens, each token keeps an inverted list of the items containing it.
+Tokens are kept sorted so the last, partially typed word of a query matches by prefix. The index is loaded
+once from the library mirror and then updated incrementally whenever the mirror writes or removes items.
+"""
+import heapq
+import logging
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Optional
+
+logger = logging.getLogger("bot")
+
+# Relative weight of a match in each field
+FIELD_WEIGHTS = {
+    'title': 4.0,
+    'series': 2.5,
+    'author': 2.0,
+    'narrator': 1.0,
+}
+
+# A whole-word match beats a prefix match of the same field
+EXACT_MATCH_BONUS = 1.5
+
+# Added when the title starts with the query as typed
+TITLE_PREFIX_BONUS = 3.0
+
+# Seconds the libraries a token can see are remembered, results are limited to them
+VISIBLE_LIBRARIES_TTL = 300
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def fold(text: str) -> str:
+    """
+    Lowercase and strip accents, e.g. 'Brontë' -> 'bronte'.
+    :param text:
+    :return: folded text
+    """
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokenize(text: str) -> list:
+    """
+    :param text:
+    :return: folded tokens of text
+    """
+    return _TOKEN_PATTERN.findall(fold(text))
+
+
+class SearchIndex:
+    """
+    Inverted index of library items keyed by item id.
+    """
+
+    def __init__(self):
+        self._docs = {}
+        # item id -> {token: best field weight}
+        self._doc_tokens = {}
+        # token -> set of item ids
+        self._postings = {}
+        # Sorted distinct tokens, prefix lookups are a bisect plus a scan of the matching range
+        self._tokens = []
+        # First character of each title -> item ids, drives one-letter queries
+        self._initials = {}
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, item_id):
+        return item_id in self._docs
+
+    def add(self, item: dict, _keep_sorted: bool = True):
+        """
+        Index an item, replacing any previous version of it.
+        :param item: library item dict as returned by the library mirror
+        """
+        item_id = item.get('id')
+        if not item_id:
+            return
+        if item_id in self._docs:
+            self.remove(item_id)
+
+        tokens = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(item.get(field)):
+                if weight > tokens.get(token, 0):
+                    tokens[token] = weight
+
+        self._docs[item_id] = {
+            'id': item_id,
+            'title': item.get('title') or 'Untitled',
+            'author': item.get('author') or '',
+            'series': item.get('series') or '',
+            'narrator': item.get('narrator') or '',
+            'mediaType': item.get('mediaType', 'book'),
+            'libraryId': item.get('libraryId'),
+            '_folded_title': fold(item.get('title'))
+        }
+        self._doc_tokens[item_id] = tokens
+
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                if _keep_sorted:
+                    self._tokens.insert(bisect_left(self._tokens, token), token)
+            postings.add(item_id)
+
+        initial = self._docs[item_id]['_folded_title'][:1]
+        if initial:
+            self._initials.setdefault(initial, set()).add(item_id)
+
+    def remove(self, item_id: str):
+        """
+        :param item_id:
+        """
+        doc = self._docs.pop(item_id, None)
+        if doc is None:
+            return
+        for token in self._doc_tokens.pop(item_id, {}):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(item_id)
+            if not postings:
+                del self._postings[token]
+                position = bisect_left(self._tokens, token)
+                if position < len(self._tokens) and self._tokens[position] == token:
+                    del self._tokens[position]
+
+        initial = doc['_folded_title'][:1]
+        if initial in self._initials:
+            self._initials[initial].discard(item_id)
+
+    def clear(self):
+        self.__init__()
+
+    def load(self, items: list):
+        """
+        Replace the whole index, sorting the token list once instead of on every insert.
+        :param items:
+        """
+        self.clear()
+        for item in items:
+            self.add(item, _keep_sorted=False)
+        self._tokens = sorted(self._postings)
+        self.loaded = True
+
+    def _expand(self, prefix: str) -> list:
+        """
+        :param prefix:
+        :return: every indexed token starting with prefix
+        """
+        start = bisect_left(self._tokens, prefix)
+        matches = []
+        for token in self._tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+    def _candidates(self, term: str) -> set:
+        if len(term) == 1:
+            # A single letter would match most of the library, only look at titles starting with it
+            candidates = set(self._initials.get(term, ()))
+            candidates.update(self._postings.get(term, ()))
+            return candidates
+
+        candidates = set()
+        for token in self._expand(term):
+            candidates.update(self._postings[token])
+        return candidates
+
+    @staticmethod
+    def _term_score(term: str, tokens: dict) -> float:
+        exact = tokens.get(term)
+        if exact:
+            return exact * EXACT_MATCH_BONUS
+        best = 0.0
+        for token, weight in tokens.items():
+            if weight > best and token.startswith(term):
+                best = weight
+        return best
+
+    def search(self, query: str, limit: int = 10, media_type: str = None, library_ids=None) -> list:
+        """
+        Every word of the query has to match a word of the item, the last one may be a prefix.
+        :param query:
+        :param limit:
+        :param media_type: restrict to 'book' or 'podcast'
+        :param library_ids: restrict to items of these libraries
+        :return: best matching items, highest score first
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        # The longest term is usually the most selective, the others are checked on its candidates only
+        driver = max(terms, key=len)
+        folded_query = fold(query).strip()
+
+        scored = []
+        for item_id in self._candidates(driver):
+            doc = self._docs[item_id]
+            if media_type and doc['mediaType'] != media_type:
+                continue
+            if library_ids is not None and doc['libraryId'] not in library_ids:
+                continue
+
+            tokens = self._doc_tokens[item_id]
+            score = 0.0
+            for term in terms:
+                term_score = self._term_score(term, tokens)
+                if not term_score:
+                    break
+                score += term_score
+            else:
+                if doc['_folded_title'].startswith(folded_query):
+                    score += TITLE_PREFIX_BONUS
+                scored.append((-score, doc['_folded_title'], item_id))
+
+        return [self._public(self._docs[item_id]) for _, _, item_id in heapq.nsmallest(limit, scored)]
+
+    @staticmethod
+    def _public(doc: dict) -> dict:
+        return {key: value for key, value in doc.items() if not key.startswith('_')}
+
+
+# Global index instance
+index = SearchIndex()
+
+# Updates received while the initial load is running, applied once it finishes
+_pending = None
+
+# token -> (expires, library ids the token can see)
+_visible_libraries = {}
+
+
+def index_items(items: list):
+    """
+    Called by the library mirror after items were written. Ebooks are not playable and are dropped.
+    :param items: library item dicts
+    """
+    if _pending is not None:
+        _pending.append(('add', items))
+        return
+    if not index.loaded:
+        return
+    for item in items:
+        if item.get('ebook'):
+            index.remove(item.get('id'))
+        else:
+            index.add(item)
+
+
+def remove_items(item_ids):
+    """
+    Called by the library mirror after items were deleted.
+    :param item_ids:
+    """
+    if _pending is not None:
+        _pending.append(('remove', list(item_ids)))
+        return
+    if not index.loaded:
+        return
+    for item_id in item_ids:
+        index.remove(item_id)
+
+
+async def ensure_loaded() -> bool:
+    """
+    Build the index from the library mirror on first use.
+    :return: True if the index can answer queries
+    """
+    global _pending
+    if index.loaded:
+        return True
+    if _pending is not None:
+        # Another caller is loading, don't block an autocomplete on it
+        return False
+
+    import library_mirror
+    if not library_mirror.is_available():
+        return False
+
+    _pending = []
+    try:
+        items = await library_mirror.get_items(stale_ok=True)
+        if items is None:
+            return False
+        index.load(items)
+
+        pending, _pending = _pending, None
+        for action, payload in pending:
+            if action == 'add':
+                index_items(payload)
+            else:
+                remove_items(payload)
+        logger.info(f"Search index loaded with {len(index)} items")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to load search index: {e}")
+        return False
+    finally:
+        _pending = None
+
+
+async def visible_libraries() -> Optional[set]:
+    """
+    :return: ids of the libraries the current ABS token can see, None if they could not be listed
+    """
+    import bookshelfAPI as c
+    token = c.current_token()
+    cached = _visible_libraries.get(token)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    try:
+        libraries = await c.bookshelf_libraries()
+    except Exception as e:
+        logger.warning(f"Could not list the libraries of the current user: {e}")
+        return None
+    if not libraries:
+        return None
+    library_ids = {library_id for library_id, audiobooks_only in libraries.values()}
+    _visible_libraries[token] = (time.monotonic() + VISIBLE_LIBRARIES_TTL, library_ids)
+    return library_ids
+
+
+async def search(query: str, limit: int = 10, media_type: str = None) -> Optional[list]:
+    """
+    The index covers every mirrored library, results are limited to the libraries of the calling user.
+    :param query:
+    :param limit:
+    :param media_type: restrict to 'book' or 'podcast'
+    :return: matching items (id, title, author, series, narrator, mediaType, libraryId),
+        or None if the index is not available and the caller should search the server instead
+    """
+    if not await ensure_loaded():
+        return None
+    library_ids = await visible_libraries()
+    if library_ids is None:
+        return None
+    import library_mirror
+    library_mirror.schedule_refresh()
+    return index.search(query, limit=limit, media_type=media_type, library_ids=library_ids)
@@ -0,0 +1,306 @@
+"""
+Series Index - every series of every library, loaded page by page and kept in memory.
+
+Series are looked up by id or by normalized name, their books come sorted by sequence, so finding the series of
+the playing book is a dict lookup instead of downloading and scanning the series list on every /play.
+Each library is reloaded after SERIES_INDEX_TTL, or as soon as the library mirror sees its items change.
+The index is shared by every user: libraries are loaded under a token that lists them, and lookups only return
+series from the libraries the current token can see.
+"""
+import asyncio
+import logging
+import re
+import time
+from typing import Optional
+
+import bookshelfAPI as c
+import search_index
+import settings as s
+from search_index import fold
+
+logger = logging.getLogger("bot")
+
+_SEQUENCE_IN_NAME = re.compile(r"#\s*([\d.]+)\s*$")
+
+# Concurrent item requests when the batch endpoint isn't available
+BOOK_DATA_FALLBACK_CONCURRENCY = 8
+
+
+def normalize_name(name: str) -> str:
+    """
+    Accent-folded, lowercase series name with collapsed whitespace.
+    :param name:
+    :return: normalized name
+    """
+    return ' '.join(fold(name).split())
+
+
+def _to_sequence(value) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _book_sequence(book: dict, series_id: str, series_key: str) -> float:
+    """
+    Sequence of a book within one series, from the series payload or the book's own series metadata.
+    """
+    if book.get('sequence') is not None:
+        return _to_sequence(book.get('sequence'))
+
+    metadata = book.get('media', {}).get('metadata', {})
+    for entry in metadata.get('series') or []:
+        if entry.get('id') == series_id or normalize_name(entry.get('name', '')) == series_key:
+            return _to_sequence(entry.get('sequence'))
+
+    # Minified items only carry "Series Name #3"
+    match = _SEQUENCE_IN_NAME.search(metadata.get('seriesName') or '')
+    return _to_sequence(match.group(1)) if match else 0.0
+
+
+def _series_entry(library_id: str, series: dict) -> dict:
+    series_id = series.get('id')
+    name = series.get('name', '').strip()
+    key = normalize_name(name)
+
+    books = []
+    for book in series.get('books') or []:
+        metadata = book.get('media', {}).get('metadata', {})
+        books.append({
+            'id': book.get('id'),
+            'title': metadata.get('title', ''),
+            'author': metadata.get('authorName') or '',
+            'duration': book.get('media', {}).get('duration', 0) or 0,
+            'sequence': _book_sequence(book, series_id, key),
+            'series_name': name
+        })
+    # Sort books by sequence number, ties keep the server order
+    books.sort(key=lambda x: x['sequence'])
+
+    return {'id': series_id, 'name': name, 'key': key, 'library_id': library_id, 'books': books}
+
+
+class SeriesIndex:
+    """
+    Series of all libraries keyed by id and by normalized name.
+    A library no token lists anymore keeps its series until remove_library, lookups filter by library.
+    """
+
+    def __init__(self, ttl: float = None, page_size: int = None):
+        self.ttl = ttl if ttl is not None else s.SERIES_INDEX_TTL
+        self.page_size = page_size or s.SERIES_INDEX_PAGE_SIZE
+        self._by_id = {}
+        self._by_name = {}
+        # library id -> monotonic time it was loaded
+        self._loaded = {}
+        # Libraries in the order they were first listed, the first visible library wins when two share a series name
+        self._library_order = []
+        self._lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def _stale_libraries(self, library_ids) -> list:
+        now = time.monotonic()
+        return [library_id for library_id in library_ids
+                if now - self._loaded.get(library_id, float('-inf')) >= self.ttl]
+
+    async def _fetch_library(self, library_id: str, name: str) -> list:
+        """
+        Every series of a library, page by page.
+        :return: list of series entries
+        """
+        entries = []
+        page = 0
+        while True:
+            endpoint = f"/libraries/{library_id}/series"
+            params = f"&limit={self.page_size}&page={page}"
+            r = await c.bookshelf_conn(endpoint=endpoint, GET=True, params=params)
+            if r.status_code != 200:
+                raise RuntimeError(f"series page {page} returned status {r.status_code}")
+
+            data = r.json()
+            results = data.get('results', [])
+            entries.extend(_series_entry(library_id, series) for series in results)
+
+            total = data.get('total', 0)
+            if len(results) < self.page_size or len(entries) >= total:
+                break
+            page += 1
+
+        logger.info(f"Series index: loaded {len(entries)} series from library '{name}'")
+        return entries
+
+    def _replace_library(self, library_id: str, entries: list):
+        for series_id in [sid for sid, entry in self._by_id.items() if entry['library_id'] == library_id]:
+            del self._by_id[series_id]
+        for entry in entries:
+            self._by_id[entry['id']] = entry
+        self._loaded[library_id] = time.monotonic()
+        self._rebuild_names()
+
+    def _rebuild_names(self):
+        order = {library_id: position for position, library_id in enumerate(self._library_order)}
+        by_name = {}
+        for entry in sorted(self._by_id.values(), key=lambda e: order.get(e['library_id'], len(order))):
+            by_name.setdefault(entry['key'], []).append(entry)
+        self._by_name = by_name
+
+    async def ensure_loaded(self, library_ids: set, force: bool = False):
+        """
+        Load the given libraries of the current user that were never loaded, expired or were invalidated.
+        Libraries of other users are left as they are, they are reloaded under a token that lists them.
+        :param library_ids: libraries the current token can see
+        :param force: reload every library of the current user
+        """
+        if not force and not self._stale_libraries(library_ids):
+            return
+
+        async with self._lock:
+            libraries = await c.bookshelf_libraries()
+            if not libraries:
+                return
+
+            listed = [library_id for name, (library_id, audiobooks_only) in libraries.items()]
+            added = [library_id for library_id in listed if library_id not in self._library_order]
+            if added:
+                self._library_order.extend(added)
+                self._rebuild_names()
+
+            stale = set(listed) if force else set(self._stale_libraries(listed))
+            if not stale:
+                return
+            stale_libraries = {name: value for name, value in libraries.items() if value[0] in stale}
+
+            for library_id, name, entries in await c.bookshelf_library_fanout(self._fetch_library,
+                                                                              stale_libraries):
+                self._replace_library(library_id, entries)
+
+    def invalidate(self, library_id: str = None):
+        """
+        Mark a library, or every library, for reload on the next lookup.
+        :param library_id:
+        """
+        if library_id is None:
+            self._loaded.clear()
+        else:
+            self._loaded.pop(library_id, None)
+
+    def remove_library(self, library_id: str):
+        """
+        Drop the series of a library that no longer exists.
+        :param library_id:
+        """
+        self._replace_library(library_id, [])
+        self._loaded.pop(library_id, None)
+        if library_id in self._library_order:
+            self._library_order.remove(library_id)
+
+    def get(self, series_id: str, library_ids: set) -> Optional[dict]:
+        entry = self._by_id.get(series_id)
+        return entry if entry is not None and entry['library_id'] in library_ids else None
+
+    def find(self, name: str, library_ids: set) -> Optional[dict]:
+        for entry in self._by_name.get(normalize_name(name), []):
+            if entry['library_id'] in library_ids:
+                return entry
+        return None
+
+
+# Global index instance
+index = SeriesIndex()
+
+
+async def get_series(series_id: str = None, name: str = None) -> Optional[dict]:
+    """
+    Look up a series by id, falling back to its name.
+    :param series_id:
+    :param name:
+    :return: dict with id, name, library_id and books (id, title, author, duration, sequence, series_name)
+        sorted by sequence, or None if not found
+    """
+    library_ids = await search_index.visible_libraries()
+    if library_ids is None:
+        logger.warning("Series index: could not list the libraries of the current user")
+        return None
+
+    try:
+        await index.ensure_loaded(library_ids)
+    except Exception as e:
+        logger.error(f"Series index: failed to load: {e}")
+
+    entry = index.get(series_id, library_ids) if series_id else None
+    if entry is None and name:
+        entry = index.find(name, library_ids)
+    return entry
+
+
+def invalidate(library_id: str = None):
+    index.invalidate(library_id)
+
+
+def remove_library(library_id: str):
+    index.remove_library(library_id)
+
+
+def _unknown_book() -> dict:
+    return {'title': 'Unknown Book', 'author': 'Unknown Author', 'duration': 0}
+
+
+async def get_book_data(series: dict) -> dict:
+    """
+    Title, author and duration of every book of a series, for the series dropdown.
+    Built once per loaded series and stored on the series entry, so every session playing it shares the result.
+    Books the series payload doesn't describe are fetched with one batch request, then concurrently one by one.
+    :param series: series entry from get_series
+    :return: dict of book id -> {title, author, duration}
+    """
+    cached = series.get('book_data')
+    if cached is not None:
+        return cached
+
+    book_data = {}
+    missing = []
+    for book in series['books']:
+        if book['title'] and book['author']:
+            book_data[book['id']] = {'title': book['title'], 'author': book['author'], 'duration': book['duration']}
+        else:
+            missing.append(book['id'])
+
+    if missing:
+        items = await c.bookshelf_batch_items(missing)
+        for item in items or []:
+            media = item.get('media', {})
+            metadata = media.get('metadata', {})
+            authors = metadata.get('authorName') or ', '.join(a.get('name', '') for a in metadata.get('authors', []))
+            book_data[item.get('id')] = {
+                'title': metadata.get('title') or 'Unknown Book',
+                'author': authors or 'Unknown Author',
+                'duration': media.get('duration', 0) or 0
+            }
+
+    still_missing = [book_id for book_id in missing if book_id not in book_data]
+    if still_missing:
+        semaphore = asyncio.Semaphore(BOOK_DATA_FALLBACK_CONCURRENCY)
+
+        async def fetch(book_id):
+            async with semaphore:
+                try:
+                    book_details = await c.bookshelf_get_item_details(book_id)
+                    book_data[book_id] = {
+                        'title': book_details.get('title', 'Unknown Book'),
+                        'author': book_details.get('author', 'Unknown Author'),
+                        'duration': book_details.get('duration', 0)
+                    }
+                except Exception as e:
+                    logger.error(f"Error caching series book data for {book_id}: {e}")
+                    book_data[book_id] = _unknown_book()
+
+        await asyncio.gather(*(fetch(book_id) for book_id in still_missing))
+
+    for book in series['books']:
+        book_data.setdefault(book['id'], _unknown_book())
+
+    series['book_data'] = book_data
+    return book_data
@@ -0,0 +1,232 @@
+"""
+Session Sync - keeps an Audiobookshelf playback session in step with the local playback clock.
+
+The local clock is trusted: syncs are POST-only, the server session is only read back after a failed
+sync, and while playback runs uninterrupted the interval between syncs stretches up to SYNC_MAX_INTERVAL.
+Pause, seek, chapter changes and cleanup flush immediately.
+"""
+import logging
+import time
+from collections import defaultdict
+
+import bookshelfAPI as c
+import metrics
+import settings as s
+
+logger = logging.getLogger("bot")
+
+# Counters summed over every engine since startup
+_totals = defaultdict(float)
+
+
+def sync_totals() -> dict:
+    """
+    :return: counters of all sync engines since startup, see SessionSyncEngine.stats()
+    """
+    return _summarize(_totals)
+
+
+def _summarize(counters) -> dict:
+    listened_hours = counters['listened'] / 3600
+    # The previous implementation did a GET /session plus a POST /sync on every tick
+    legacy_round_trips = counters['ticks'] * 2
+    round_trips = counters['syncs'] + counters['errors'] + counters['session_reads']
+    saved = max(0.0, legacy_round_trips - round_trips)
+    return {
+        'ticks': int(counters['ticks']),
+        'syncs': int(counters['syncs']),
+        'flushes': int(counters['flushes']),
+        'coalesced': int(counters['coalesced']),
+        'session_reads': int(counters['session_reads']),
+        'errors': int(counters['errors']),
+        'listened_seconds': round(counters['listened'], 1),
+        'round_trips': int(round_trips),
+        'round_trips_saved': int(saved),
+        'round_trips_saved_per_hour': round(saved / listened_hours, 1) if listened_hours else 0.0
+    }
+
+
+def _sync_metrics():
+    totals = sync_totals()
+    for name in ('syncs', 'errors', 'flushes', 'session_reads'):
+        yield 'counter', f'sync.{name}', {}, totals[name]
+    yield 'counter', 'sync.listened_seconds', {}, totals['listened_seconds']
+
+
+metrics.register_collector(_sync_metrics)
+
+
+class SessionSyncEngine:
+    """
+    Sync state for a single ABS playback session.
+    """
+
+    def __init__(self, session_id: str, item_id: str, position: float = 0.0, duration: float = 0.0,
+                 base_interval: float = None, max_interval: float = None):
+        self.session_id = session_id
+        self.item_id = item_id
+        self.position = float(position or 0.0)
+        self.duration = float(duration or 0.0)
+        self.base_interval = float(base_interval if base_interval is not None else s.UPDATES)
+        self.max_interval = float(max_interval if max_interval is not None else s.SYNC_MAX_INTERVAL)
+        self.max_interval = max(self.max_interval, self.base_interval)
+        self.interval = self.base_interval
+        self.finished = self.duration > 0 and self.position >= self.duration
+        self.session_lost = False
+        self._end_attempted = False
+        self._pending_listened = 0.0
+        self._since_sync = 0.0
+        self._clock = None
+        self._counters = defaultdict(float)
+
+    def _count(self, name: str, amount: float = 1):
+        self._counters[name] += amount
+        _totals[name] += amount
+
+    # Local clock ---------------------------------
+
+    def start_clock(self):
+        """Start accounting listened time, called once audio is actually streaming."""
+        if self._clock is None:
+            self._clock = time.monotonic()
+
+    def stop_clock(self):
+        """Account the time played so far and stop the clock, e.g. on pause."""
+        self._advance_clock()
+        self._clock = None
+
+    @property
+    def clock_running(self) -> bool:
+        return self._clock is not None
+
+    def _advance_clock(self):
+        if self._clock is None:
+            return
+        now = time.monotonic()
+        self.advance(now - self._clock)
+        self._clock = now
+
+    def advance(self, seconds: float):
+        """
+        Move the local position forward by seconds of playback.
+        :param seconds:
+        """
+        if self.duration > 0:
+            # Nothing is listened past the end of the media
+            seconds = min(seconds, self.duration - self.position)
+            if self.position + seconds >= self.duration:
+                self.finished = True
+        if seconds <= 0:
+            return
+        self.position += seconds
+        self._pending_listened += seconds
+        self._since_sync += seconds
+        self._count('listened', seconds)
+
+    def seek(self, position: float):
+        """
+        Jump to an absolute position. Time played before the jump is kept for the next sync.
+        :param position:
+        """
+        self._advance_clock()
+        position = max(0.0, float(position))
+        if self.duration > 0:
+            position = min(position, self.duration)
+        self.position = position
+        self.finished = self.duration > 0 and position >= self.duration
+        self._end_attempted = False
+
+    # Syncing ---------------------------------
+
+    def due(self) -> bool:
+        # Reaching the end of the media syncs right away, retries after that wait for the interval
+        if self.finished and not self._end_attempted:
+            return True
+        return self._since_sync >= self.interval
+
+    async def tick(self) -> bool:
+        """
+        Called from the playback loop. Advances the local clock and syncs only when the interval has elapsed.
+        :return: True if a sync was sent successfully on this tick
+        """
+        self._count('ticks')
+        self._advance_clock()
+        if not self.due():
+            self._count('coalesced')
+            return False
+
+        synced = await self._sync()
+        if synced:
+            # Playback is steady, stretch the interval until something interrupts it
+            self.interval = min(self.interval * 2, self.max_interval)
+        return synced
+
+    async def flush(self, reason: str = '') -> bool:
+        """
+        Sync the local position right away and fall back to the base interval.
+        :param reason: for logging only (pause, seek, chapter, cleanup...)
+        :return: True if the sync succeeded
+        """
+        self._count('flushes')
+        self._advance_clock()
+        self.interval = self.base_interval
+        logger.debug(f"Flushing session sync for {self.session_id} ({reason}) at {self.position:.1f}s")
+        return await self._sync()
+
+    async def _sync(self) -> bool:
+        status = await c.bookshelf_session_sync(self.session_id, self.position, self._pending_listened,
+                                                self.duration)
+        if status == 200:
+            self._count('syncs')
+            self._pending_listened = 0.0
+            self._since_sync = 0.0
+            self.session_lost = False
+            self._end_attempted = self.finished
+            return True
+
+        self._count('errors')
+        self._since_sync = 0.0
+        self._end_attempted = self.finished
+        if self.session_lost:
+            # Already known to be gone, only retry the sync once per max_interval until it comes back
+            self.interval = self.max_interval
+            return False
+
+        self.interval = self.base_interval
+        if not await self.resync():
+            self.interval = self.max_interval
+        return False
+
+    async def resync(self) -> bool:
+        """
+        Re-read the server session after a failed sync to find out whether it still matches local state.
+        :return: True if the session is still open and belongs to the playing item
+        """
+        self._count('session_reads')
+        data = await c.bookshelf_get_session(self.session_id)
+        if data is None:
+            logger.warning(f"Session {self.session_id} could not be read back, it may have been closed")
+            self.session_lost = True
+            return False
+
+        if data.get('libraryItemId') != self.item_id:
+            logger.warning(f"Session {self.session_id} belongs to {data.get('libraryItemId')}, "
+                           f"expected {self.item_id}")
+            self.session_lost = True
+            return False
+
+        server_duration = float(data.get('duration') or 0.0)
+        if server_duration > 0 and abs(server_duration - self.duration) > 1:
+            logger.info(f"Adopting server duration {server_duration}s for session {self.session_id}")
+            self.duration = server_duration
+
+        self.session_lost = False
+        return True
+
+    def stats(self) -> dict:
+        """
+        :return: counters for this session; round_trips_saved compares against a GET + POST on every tick
+        """
+        stats = _summarize(self._counters)
+        stats['interval'] = self.interval
+        return stats
@@ -61,6 +61,42 @@ TASK_FREQUENCY = int(os.getenv('TASK_FREQUENCY', 5))
 # Update Frequency for internal tasks, default 5 seconds
 UPDATES = os.getenv('UPDATES', 5)
 
+# Longest gap between playback syncs while playback is steady, default 30 seconds
+SYNC_MAX_INTERVAL = int(os.getenv('SYNC_MAX_INTERVAL', 30))
+
+# Keep a local mirror of the library items for random/discover/recent/new book lookups
+LIBRARY_MIRROR = str2bool(os.getenv('LIBRARY_MIRROR', "True"))
+
+# Seconds before the library mirror is incrementally refreshed, default 5 minutes
+LIBRARY_MIRROR_TTL = int(os.getenv('LIBRARY_MIRROR_TTL', 300))
+
+# Items requested per page while refreshing the library mirror
+LIBRARY_MIRROR_PAGE_SIZE = int(os.getenv('LIBRARY_MIRROR_PAGE_SIZE', 500))
+
+# Seconds before the series of a library are reloaded, default 10 minutes
+SERIES_INDEX_TTL = int(os.getenv('SERIES_INDEX_TTL', 600))
+
+# Series requested per page while loading the series index
+SERIES_INDEX_PAGE_SIZE = int(os.getenv('SERIES_INDEX_PAGE_SIZE', 100))
+
+# Items requested per page by the new book check, pages stop once the last seen book is reached
+NEW_BOOK_PAGE_SIZE = int(os.getenv('NEW_BOOK_PAGE_SIZE', 25))
+
+# Seconds before the end of a book or episode at which the next autoplay item is prepared, default 3 minutes
+PREFETCH_WINDOW = int(os.getenv('PREFETCH_WINDOW', 180))
+
+# Seconds seek buttons wait for further taps before repositioning the stream, default 0.35 seconds
+SEEK_DEBOUNCE = float(os.getenv('SEEK_DEBOUNCE', 0.35))
+
+# Seconds between writes of the metrics snapshot read by the web UI (/api/status, /metrics)
+METRICS_SNAPSHOT_INTERVAL = int(os.getenv('METRICS_SNAPSHOT_INTERVAL', 30))
+
+# SQLite tuning shared by every local database (page cache per connection in KiB, lock wait in ms,
+# prepared statements kept per connection)
+SQLITE_CACHE_KB = int(os.getenv('SQLITE_CACHE_KB', 8192))
+SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))
+SQLITE_STATEMENT_CACHE = int(os.getenv('SQLITE_STATEMENT_CACHE', 256))
+
 # TEST ENV1
 TEST_ENV1 = os.getenv('TEST_ENV1')
 
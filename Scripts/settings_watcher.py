@@ -182,3 +182,7 @@ async def reload_bot_components():
     logger.info("Reloading bot components...")
     # Add any bot-specific reload logic here
     # For example: reload extensions, update global variables, etc.
+
+    # Server or token may have changed, cached item documents are no longer trustworthy
+    import bookshelfAPI
+    bookshelfAPI.invalidate_item_cache()
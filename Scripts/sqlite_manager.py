@@ -0,0 +1,83 @@
+"""
+SQLite Manager - one tuned, shared aiosqlite connection per database file.
+
+Modules that keep their data in SQLite ask this module for their connection instead of opening their own. A file
+opened by several modules shares one connection, and every connection runs in WAL mode with synchronous=NORMAL,
+so readers no longer wait on writers. Statements are kept in the sqlite3 statement cache and reused across calls.
+"""
+import asyncio
+import logging
+import os
+import weakref
+
+import settings as s
+
+logger = logging.getLogger("bot")
+
+# {event loop: {path: [connection, users]}}, a connection belongs to the loop that opened it
+_connections = weakref.WeakKeyDictionary()
+_locks = weakref.WeakKeyDictionary()
+
+
+def pragmas() -> str:
+    """The PRAGMA statements applied to every connection, as one script"""
+    return (
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        f"PRAGMA cache_size=-{s.SQLITE_CACHE_KB};"
+        f"PRAGMA busy_timeout={s.SQLITE_BUSY_TIMEOUT};"
+        "PRAGMA temp_store=MEMORY;"
+    )
+
+
+async def connect(db_path: str):
+    """
+    Shared connection to a database file, opened and tuned on first use. Every call must be paired with release().
+    :param db_path:
+    :return: aiosqlite.Connection
+    """
+    import aiosqlite
+
+    loop = asyncio.get_running_loop()
+    lock = _locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        connections = _connections.setdefault(loop, {})
+        entry = connections.get(db_path)
+        if entry is None:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            conn = await aiosqlite.connect(db_path, timeout=s.SQLITE_BUSY_TIMEOUT / 1000,
+                                           cached_statements=s.SQLITE_STATEMENT_CACHE)
+            await conn.executescript(pragmas())
+            entry = connections[db_path] = [conn, 0]
+            logger.debug(f"Opened shared SQLite connection: {db_path}")
+        entry[1] += 1
+        return entry[0]
+
+
+async def release(db_path: str):
+    """
+    Give back a connection from connect(), it is closed once its last user released it.
+    :param db_path:
+    """
+    loop = asyncio.get_running_loop()
+    lock = _locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        connections = _connections.get(loop, {})
+        entry = connections.get(db_path)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del connections[db_path]
+            await entry[0].close()
+            logger.debug(f"Closed shared SQLite connection: {db_path}")
+
+
+async def close_all():
+    """Close every connection of the running loop, whoever still uses them"""
+    connections = _connections.pop(asyncio.get_running_loop(), {})
+    for db_path, (conn, _) in connections.items():
+        try:
+            await conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing SQLite connection {db_path}: {e}")
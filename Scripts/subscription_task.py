@@ -4,10 +4,11 @@ import logging
 import sys
 import asyncio
 import uuid
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 from abc import ABC, abstractmethod
 
 import bookshelfAPI as c
+import metrics
 import settings as s
 from multi_user import search_user_db
 from wishlist import search_wishlist_db, mark_book_as_downloaded
@@ -27,6 +28,29 @@ logger = logging.getLogger("bot")
 # Task configuration
 TASK_FREQUENCY = 5  # Task execution interval in minutes
 
+# Watermark scope of the new book check, the newest addedAt seen per library
+NEW_BOOK_WATERMARKS = 'new-book'
+
+# Watermark scope of the finished book check, the newest progress lastUpdate processed per user
+FINISHED_BOOK_WATERMARKS = 'finished-book'
+
+# Users whose progress is fetched at once by the finished book check
+USER_FETCH_CONCURRENCY = 4
+
+# Subscribed channels notified at once by the new and finished book checks
+CHANNEL_FANOUT_CONCURRENCY = 4
+
+# Messages a channel may receive per window (seconds), Discord allows 5 messages per 5 seconds per channel
+CHANNEL_MESSAGE_BURST = 5
+CHANNEL_MESSAGE_WINDOW = 5.0
+
+# Days sent messages are remembered for duplicate prevention, older records are purged every few hours
+MESSAGE_TRACKING_RETENTION_DAYS = 7
+MESSAGE_TRACKING_PURGE_HOURS = 6
+
+# Messages checked or recorded per statement, keeps bulk queries below the bound parameter limits
+MESSAGE_TRACKING_BATCH = 300
+
 # Generate unique instance ID for distributed locking
 INSTANCE_ID = str(uuid.uuid4())
 
@@ -81,6 +105,18 @@ class TaskDatabaseInterface(ABC):
     async def mark_message_as_sent(self, channel_id: int, book_id: str, message_type: str):
         pass
 
+    @abstractmethod
+    async def sent_messages(self, messages: List[Tuple[int, str, str]]) -> set:
+        pass
+
+    @abstractmethod
+    async def mark_messages_as_sent(self, messages: List[Tuple[int, str, str]]):
+        pass
+
+    @abstractmethod
+    async def purge_sent_messages(self, older_than: int) -> int:
+        pass
+
     @abstractmethod
     async def search_version_db(self) -> List[Tuple]:
         pass
@@ -106,6 +142,18 @@ class TaskDatabaseInterface(ABC):
     async def check_lock_owner(self, task_name: str) -> bool:
         pass
 
+    @abstractmethod
+    async def create_watermark_table(self):
+        pass
+
+    @abstractmethod
+    async def get_watermarks(self, scope: str) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    async def set_watermarks(self, scope: str, values: Dict[str, int]):
+        pass
+
 
 # SQLite Implementation for Tasks
 class SQLiteTaskDatabase(TaskDatabaseInterface):
@@ -115,15 +163,17 @@ class SQLiteTaskDatabase(TaskDatabaseInterface):
         self.cursor = None
 
     async def connect(self):
-        import aiosqlite
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        self.conn = await aiosqlite.connect(self.db_path)
+        import sqlite_manager
+        self.conn = await sqlite_manager.connect(self.db_path)
         self.cursor = await self.conn.cursor()
         logger.info(f"Connected to SQLite task database: {self.db_path}")
 
     async def close(self):
         if self.conn:
-            await self.conn.close()
+            import sqlite_manager
+            await self.cursor.close()
+            await sqlite_manager.release(self.db_path)
+            self.conn = None
 
     async def create_tasks_table(self):
         await self.cursor.execute('''
@@ -189,12 +239,6 @@ class SQLiteTaskDatabase(TaskDatabaseInterface):
 
     async def has_message_been_sent(self, channel_id: int, book_id: str, message_type: str) -> bool:
         """Check if a message has already been sent for this book in this channel"""
-        # Clean up old tracking records (older than 7 days)
-        seven_days_ago = int((datetime.now() - timedelta(days=7)).timestamp())
-        await self.cursor.execute('DELETE FROM message_tracking WHERE sent_at < ?', (seven_days_ago,))
-        await self.conn.commit()
-
-        # Check if message exists
         await self.cursor.execute('''
             SELECT 1 FROM message_tracking 
             WHERE channel_id = ? AND book_id = ? AND message_type = ?
@@ -215,6 +259,35 @@ class SQLiteTaskDatabase(TaskDatabaseInterface):
             # Already exists, that's fine
             logger.debug(f"Message already tracked: {e}")
 
+    async def sent_messages(self, messages: List[Tuple[int, str, str]]) -> set:
+        """The (channel_id, book_id, message_type) tuples of messages that were already sent"""
+        sent = set()
+        for start in range(0, len(messages), MESSAGE_TRACKING_BATCH):
+            batch = messages[start:start + MESSAGE_TRACKING_BATCH]
+            values = ', '.join(['(?, ?, ?)'] * len(batch))
+            # Own cursor, channels are checked concurrently
+            async with self.conn.execute(f'''
+                SELECT channel_id, book_id, message_type FROM message_tracking
+                WHERE (channel_id, book_id, message_type) IN (VALUES {values})
+            ''', [value for message in batch for value in message]) as cursor:
+                sent.update(tuple(row) for row in await cursor.fetchall())
+        return sent
+
+    async def mark_messages_as_sent(self, messages: List[Tuple[int, str, str]]):
+        """Mark several messages as sent in one transaction, messages already tracked are left alone"""
+        now = int(datetime.now().timestamp())
+        await self.cursor.executemany('''
+            INSERT OR IGNORE INTO message_tracking (channel_id, book_id, message_type, sent_at)
+            VALUES (?, ?, ?, ?)
+        ''', [(channel_id, book_id, message_type, now) for channel_id, book_id, message_type in messages])
+        await self.conn.commit()
+
+    async def purge_sent_messages(self, older_than: int) -> int:
+        """Delete tracked messages sent before the timestamp, returns the number of rows removed"""
+        await self.cursor.execute('DELETE FROM message_tracking WHERE sent_at < ?', (older_than,))
+        await self.conn.commit()
+        return self.cursor.rowcount
+
     async def acquire_lock(self, task_name: str, lock_duration_seconds: int = 30) -> bool:
         """Attempt to acquire a lock for a task"""
         now = int(datetime.now().timestamp())
@@ -259,6 +332,30 @@ class SQLiteTaskDatabase(TaskDatabaseInterface):
         result = await self.cursor.fetchone()
         return result and result[0] == INSTANCE_ID
 
+    async def create_watermark_table(self):
+        """Create table for the progress markers of the notification tasks"""
+        await self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS task_watermarks (
+                scope TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value INTEGER NOT NULL,
+                PRIMARY KEY (scope, name)
+            )
+        ''')
+        await self.conn.commit()
+
+    async def get_watermarks(self, scope: str) -> Dict[str, int]:
+        """Every watermark of a scope, keyed by name"""
+        await self.cursor.execute('SELECT name, value FROM task_watermarks WHERE scope = ?', (scope,))
+        return {name: int(value) for name, value in await self.cursor.fetchall()}
+
+    async def set_watermarks(self, scope: str, values: Dict[str, int]):
+        """Store several watermarks of a scope in one transaction"""
+        await self.cursor.executemany('''
+            INSERT OR REPLACE INTO task_watermarks (scope, name, value) VALUES (?, ?, ?)
+        ''', [(scope, name, int(value)) for name, value in values.items()])
+        await self.conn.commit()
+
     async def insert_data(self, discord_id: int, channel_id: int, task: str, server_name: str, token: str) -> bool:
         try:
             await self.cursor.execute('''
@@ -456,11 +553,6 @@ class MariaDBTaskDatabase(TaskDatabaseInterface):
         """Check if a message has already been sent for this book in this channel"""
         async with self.pool.acquire() as conn:
             async with conn.cursor() as cursor:
-                # Clean up old tracking records (older than 7 days)
-                seven_days_ago = int((datetime.now() - timedelta(days=7)).timestamp())
-                await cursor.execute('DELETE FROM message_tracking WHERE sent_at < %s', (seven_days_ago,))
-
-                # Check if message exists
                 await cursor.execute('''
                     SELECT 1 FROM message_tracking 
                     WHERE channel_id = %s AND book_id = %s AND message_type = %s
@@ -482,6 +574,37 @@ class MariaDBTaskDatabase(TaskDatabaseInterface):
             # Already exists, that's fine
             logger.debug(f"Message already tracked: {e}")
 
+    async def sent_messages(self, messages: List[Tuple[int, str, str]]) -> set:
+        """The (channel_id, book_id, message_type) tuples of messages that were already sent"""
+        sent = set()
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                for start in range(0, len(messages), MESSAGE_TRACKING_BATCH):
+                    batch = messages[start:start + MESSAGE_TRACKING_BATCH]
+                    values = ', '.join(['(%s, %s, %s)'] * len(batch))
+                    await cursor.execute(f'''
+                        SELECT channel_id, book_id, message_type FROM message_tracking
+                        WHERE (channel_id, book_id, message_type) IN ({values})
+                    ''', [value for message in batch for value in message])
+                    sent.update(tuple(row) for row in await cursor.fetchall())
+        return sent
+
+    async def mark_messages_as_sent(self, messages: List[Tuple[int, str, str]]):
+        """Mark several messages as sent in one transaction, messages already tracked are left alone"""
+        now = int(datetime.now().timestamp())
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany('''
+                    INSERT IGNORE INTO message_tracking (channel_id, book_id, message_type, sent_at)
+                    VALUES (%s, %s, %s, %s)
+                ''', [(channel_id, book_id, message_type, now) for channel_id, book_id, message_type in messages])
+
+    async def purge_sent_messages(self, older_than: int) -> int:
+        """Delete tracked messages sent before the timestamp, returns the number of rows removed"""
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                return await cursor.execute('DELETE FROM message_tracking WHERE sent_at < %s', (older_than,))
+
     async def acquire_lock(self, task_name: str, lock_duration_seconds: int = 30) -> bool:
         """Attempt to acquire a lock for a task"""
         now = int(datetime.now().timestamp())
@@ -529,6 +652,34 @@ class MariaDBTaskDatabase(TaskDatabaseInterface):
                 result = await cursor.fetchone()
                 return result and result[0] == INSTANCE_ID
 
+    async def create_watermark_table(self):
+        """Create table for the progress markers of the notification tasks"""
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS task_watermarks (
+                        scope VARCHAR(64) NOT NULL,
+                        name VARCHAR(255) NOT NULL,
+                        value BIGINT NOT NULL,
+                        PRIMARY KEY (scope, name)
+                    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                ''')
+
+    async def get_watermarks(self, scope: str) -> Dict[str, int]:
+        """Every watermark of a scope, keyed by name"""
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute('SELECT name, value FROM task_watermarks WHERE scope = %s', (scope,))
+                return {name: int(value) for name, value in await cursor.fetchall()}
+
+    async def set_watermarks(self, scope: str, values: Dict[str, int]):
+        """Store several watermarks of a scope in one transaction"""
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany('''
+                    REPLACE INTO task_watermarks (scope, name, value) VALUES (%s, %s, %s)
+                ''', [(scope, name, int(value)) for name, value in values.items()])
+
     async def insert_data(self, discord_id: int, channel_id: int, task: str, server_name: str, token: str) -> bool:
         try:
             async with self.pool.acquire() as conn:
@@ -667,6 +818,7 @@ async def initialize_task_database():
     await task_db.create_version_table()
     await task_db.create_task_locks_table()
     await task_db.create_message_tracking_table()
+    await task_db.create_watermark_table()
     logger.info(f"Initialized tasks database using {DB_TYPE}")
     logger.info(f"Instance ID: {INSTANCE_ID}")
 
@@ -678,52 +830,158 @@ async def close_task_database():
 
 
 # Wrapper functions for backward compatibility
+@metrics.timed('db.query', db='tasks', query='insert_data')
 async def insert_data(discord_id: int, channel_id: int, task: str, server_name: str, token: str) -> bool:
     return await task_db.insert_data(discord_id, channel_id, task, server_name, token)
 
 
+@metrics.timed('db.query', db='tasks', query='insert_version')
 async def insert_version(version: str) -> bool:
     return await task_db.insert_version(version)
 
 
+@metrics.timed('db.query', db='tasks', query='search_version_db')
 async def search_version_db() -> List[Tuple]:
     return await task_db.search_version_db()
 
 
+@metrics.timed('db.query', db='tasks', query='remove_task_db')
 async def remove_task_db(task: str = '', discord_id: int = 0, db_id: int = 0) -> bool:
     return await task_db.remove_task_db(task, discord_id, db_id)
 
 
+@metrics.timed('db.query', db='tasks', query='search_task_db')
 async def search_task_db(discord_id: int = 0, task: str = '', channel_id: int = 0,
                          override_response: str = '') -> Optional[List[Tuple]]:
     return await task_db.search_task_db(discord_id, task, channel_id, override_response)
 
 
+@metrics.timed('db.query', db='tasks', query='acquire_task_lock')
 async def acquire_task_lock(task_name: str, lock_duration_seconds: int = 30) -> bool:
     """Acquire a distributed lock for a task"""
     return await task_db.acquire_lock(task_name, lock_duration_seconds)
 
 
+@metrics.timed('db.query', db='tasks', query='release_task_lock')
 async def release_task_lock(task_name: str):
     """Release a distributed lock for a task"""
     await task_db.release_lock(task_name)
 
 
+@metrics.timed('db.query', db='tasks', query='check_task_lock_owner')
 async def check_task_lock_owner(task_name: str) -> bool:
     """Check if this instance owns the task lock"""
     return await task_db.check_lock_owner(task_name)
 
 
+@metrics.timed('db.query', db='tasks', query='has_message_been_sent')
 async def has_message_been_sent(channel_id: int, book_id: str, message_type: str) -> bool:
     """Check if a message has already been sent"""
     return await task_db.has_message_been_sent(channel_id, book_id, message_type)
 
 
+@metrics.timed('db.query', db='tasks', query='mark_message_as_sent')
 async def mark_message_as_sent(channel_id: int, book_id: str, message_type: str):
     """Mark a message as sent"""
     await task_db.mark_message_as_sent(channel_id, book_id, message_type)
 
 
+@metrics.timed('db.query', db='tasks', query='sent_messages')
+async def sent_messages(messages: List[Tuple[int, str, str]]) -> set:
+    """Check a batch of (channel_id, book_id, message_type) messages, returns those already sent"""
+    if not messages:
+        return set()
+    return await task_db.sent_messages(messages)
+
+
+@metrics.timed('db.query', db='tasks', query='mark_messages_as_sent')
+async def mark_messages_as_sent(messages: List[Tuple[int, str, str]]):
+    """Mark a batch of (channel_id, book_id, message_type) messages as sent"""
+    if messages:
+        await task_db.mark_messages_as_sent(messages)
+
+
+@metrics.timed('db.query', db='tasks', query='purge_sent_messages')
+async def purge_sent_messages(retention_days: int = MESSAGE_TRACKING_RETENTION_DAYS) -> int:
+    """Forget messages sent more than retention_days ago"""
+    older_than = int((datetime.now() - timedelta(days=retention_days)).timestamp())
+    return await task_db.purge_sent_messages(older_than)
+
+
+async def filter_unsent_messages(channel_id: int, book_ids: List[str], message_type: str) -> List[str]:
+    """The book ids no message of this type was sent for yet in the channel, in their original order"""
+    sent = await sent_messages([(channel_id, book_id, message_type) for book_id in book_ids])
+    unsent = []
+    for book_id in book_ids:
+        if (channel_id, book_id, message_type) in sent:
+            logger.debug(f"Skipping duplicate for book {book_id} in channel {channel_id}")
+        else:
+            unsent.append(book_id)
+    return unsent
+
+
+@metrics.timed('db.query', db='tasks', query='get_watermarks')
+async def get_watermarks(scope: str) -> Dict[str, int]:
+    """Get the stored watermarks of a task, e.g. the newest addedAt seen per library"""
+    return await task_db.get_watermarks(scope)
+
+
+@metrics.timed('db.query', db='tasks', query='set_watermarks')
+async def set_watermarks(scope: str, values: Dict[str, int]):
+    """Store watermarks of a task"""
+    if values:
+        await task_db.set_watermarks(scope, values)
+
+
+class ChannelRateLimiter:
+    """Spaces out the messages sent to each channel, every channel has its own bucket"""
+
+    def __init__(self, burst: int = CHANNEL_MESSAGE_BURST, window: float = CHANNEL_MESSAGE_WINDOW):
+        self.burst = burst
+        self.window = window
+        self._sent: Dict[int, List[float]] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    async def acquire(self, channel_id: int):
+        """Wait until another message may be sent to the channel"""
+        lock = self._locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            sent = self._sent.setdefault(channel_id, [])
+            now = time.monotonic()
+            sent[:] = [stamp for stamp in sent if now - stamp < self.window]
+            if len(sent) >= self.burst:
+                await asyncio.sleep(self.window - (now - sent[0]))
+                sent.pop(0)
+            sent.append(time.monotonic())
+
+
+async def fan_out_channels(channel_ids: List[int], handler, concurrency: int = CHANNEL_FANOUT_CONCURRENCY) -> dict:
+    """
+    Run handler(channel_id) for every channel, at most concurrency at once. A failing or slow channel
+    does not hold up the others.
+
+    Args:
+        channel_ids: Channels to handle, duplicates are handled once
+        handler: Coroutine function taking the channel id
+        concurrency: Channels handled at once
+
+    Returns:
+        dict: Result of the handler per channel, channels that failed are left out
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(channel_id):
+        async with semaphore:
+            try:
+                return channel_id, await handler(channel_id)
+            except Exception as e:
+                logger.error(f"Error while notifying channel {channel_id}: {e}", exc_info=True)
+                return channel_id, None
+
+    results = await asyncio.gather(*(run(channel_id) for channel_id in dict.fromkeys(channel_ids)))
+    return {channel_id: result for channel_id, result in results if result is not None}
+
+
 async def conn_test():
     """
     Test Audiobookshelf connection and verify user permissions.
@@ -749,12 +1007,49 @@ async def conn_test():
     return ADMIN_USER
 
 
-async def newBookList(task_frequency=TASK_FREQUENCY) -> list:
+async def _library_additions(library_id: str, since: int) -> Tuple[list, int]:
     """
-    Retrieve books added within the specified time period.
+    Items added to a library after since, read newest first one small page at a time.
+
+    Args:
+        library_id: Library to check
+        since: addedAt in milliseconds, paging stops at the first item added at or before it
+
+    Returns:
+        tuple: (items newest first, newest addedAt seen or since when nothing was added)
+    """
+    items = []
+    newest = since
+    page = 0
+    while True:
+        endpoint = f"/libraries/{library_id}/items"
+        params = f"&sort=addedAt&desc=1&minified=1&limit={s.NEW_BOOK_PAGE_SIZE}&page={page}"
+        r = await c.bookshelf_conn(GET=True, endpoint=endpoint, params=params)
+        if r.status_code != 200:
+            raise RuntimeError(f"page {page} returned status {r.status_code}")
+
+        data = r.json()
+        results = data.get('results', [])
+        for item in results:
+            added_at = int(item.get('addedAt') or 0)
+            if added_at <= since:
+                return items, newest
+            newest = max(newest, added_at)
+            items.append(item)
+
+        if len(results) < s.NEW_BOOK_PAGE_SIZE or (page + 1) * s.NEW_BOOK_PAGE_SIZE >= data.get('total', 0):
+            return items, newest
+        page += 1
+
+
+async def newBookList(task_frequency=TASK_FREQUENCY, watermarks: Dict[str, int] = None) -> list:
+    """
+    Retrieve books added within the specified time period, or since the last check.
 
     Args:
         task_frequency: Lookback period in minutes (default: TASK_FREQUENCY)
+        watermarks: newest addedAt already seen per library id. Libraries without one fall back to the
+            lookback period. Updated in place with the newest addedAt found, see NEW_BOOK_WATERMARKS
 
     Returns:
         list: Books added within the time period with metadata
@@ -763,28 +1058,30 @@ async def newBookList(task_frequency=TASK_FREQUENCY) -> list:
     items_added = []
     current_time = datetime.now()
 
-    libraries = await c.bookshelf_libraries()
-    library_count = len(libraries)
-    logger.debug(f'Found {library_count} libraries')
-
     time_minus_delta = current_time - timedelta(minutes=task_frequency)
     timestamp_minus_delta = int(time.mktime(time_minus_delta.timetuple()) * 1000)
 
-    for name, (library_id, audiobooks_only) in libraries.items():
-        library_items = await c.bookshelf_all_library_items(library_id, params="sort=addedAt&desc=1")
+    async def library_additions(library_id, name):
+        since = timestamp_minus_delta
+        if watermarks is not None:
+            since = watermarks.get(library_id, timestamp_minus_delta)
+        return await _library_additions(library_id, since)
+
+    # Every library at once, a library that fails keeps its watermark and is checked again next tick
+    results = await c.bookshelf_library_fanout(library_additions)
+
+    for library_id, name, (library_items, newest) in results:
+        if watermarks is not None:
+            watermarks[library_id] = newest
+        logger.debug(f'Found {len(library_items)} items added to {name}')
 
         for item in library_items:
-            latest_item_time_added = int(item.get('addedTime'))
-            latest_item_title = item.get('title')
-            latest_item_type = item.get('mediaType')
-            latest_item_author = item.get('author')
-            latest_item_bookID = item.get('id')
-            try:
-                latest_item_provider_id = item.get('asin')
-            except Exception as e:
-                latest_item_provider_id = ''
-                logger.debug("Couldn't fetch asin from item. Likely was not set with metadata.")
-                logger.debug(f"Error: {e}")
+            metadata = item.get('media', {}).get('metadata', {})
+            latest_item_title = metadata.get('title') or 'Untitled'
+            latest_item_time_added = int(item.get('addedAt'))
+
+            if item.get('mediaType') != 'book':
+                continue
 
             if "(Abridged)" in latest_item_title:
                 latest_item_title = latest_item_title.replace("(Abridged)", '').strip()
@@ -795,12 +1092,11 @@ async def newBookList(task_frequency=TASK_FREQUENCY) -> list:
             formatted_time = datetime.fromtimestamp(formatted_time)
             formatted_time = formatted_time.strftime('%Y/%m/%d %H:%M')
 
-            if latest_item_time_added >= timestamp_minus_delta and latest_item_type == 'book':
-                items_added.append({"title": latest_item_title, "addedTime": formatted_time,
-                                    "author": latest_item_author, "id": latest_item_bookID,
-                                    "provider_id": latest_item_provider_id})
+            items_added.append({"title": latest_item_title, "addedTime": formatted_time,
+                                "author": metadata.get('authorName') or 'Unknown Author', "id": item.get('id'),
+                                "provider_id": metadata.get('asin') or ''})
 
-        return items_added
+    return items_added
 
 
 class SubscriptionTask(Extension):
@@ -813,6 +1109,52 @@ class SubscriptionTask(Extension):
         self.admin_token = None
         self.previous_token = None
         self.bot.admin_token = None
+        self.channels = {}
+        self.rate_limiter = ChannelRateLimiter()
+
+    async def get_task_channel(self, channel_id: int):
+        """Channel object of a subscribed channel, fetched once and reused by later ticks"""
+        channel = self.channels.get(channel_id)
+        if channel is None:
+            channel = await self.bot.fetch_channel(channel_id=channel_id)
+            if channel:
+                self.channels[channel_id] = channel
+        return channel
+
+    async def send_task_embeds(self, channel_id: int, content: str, embeds: list) -> bool:
+        """
+        Send notification embeds to a subscribed channel, within its rate limit.
+
+        Args:
+            channel_id: Channel to notify
+            content: Message the embeds are attached to
+            embeds: Embeds to send, more than 9 are sent one message each
+
+        Returns:
+            bool: False if the channel could not be fetched
+        """
+        channel = await self.get_task_channel(channel_id)
+        if not channel:
+            logger.warning(f"Could not fetch channel {channel_id}")
+            return False
+
+        logger.debug(f"Attempting to send messages to channel: {channel_id}")
+        try:
+            await self.rate_limiter.acquire(channel_id)
+            if len(embeds) < 10:
+                msg = await channel.send(content=content)
+                await self.rate_limiter.acquire(channel_id)
+                await msg.edit(embeds=embeds)
+            else:
+                await channel.send(content=content)
+                for embed in embeds:
+                    await self.rate_limiter.acquire(channel_id)
+                    await channel.send(embed=embed)
+        except Exception:
+            # The channel may be gone or its permissions changed, fetch it again next time
+            self.channels.pop(channel_id, None)
+            raise
+        return True
 
     async def get_server_name_db(self, discord_id: int, task: str = "new-book-check") -> str:
         server_name = os.getenv("DEFAULT_SERVER_NAME", "Audiobookshelf")
@@ -869,13 +1211,16 @@ class SubscriptionTask(Extension):
         else:
             await user.send(content=msg, embeds=embed)
 
-    async def NewBookCheckEmbed(self, task_frequency=TASK_FREQUENCY, enable_notifications=False):
+    async def NewBookCheckEmbed(self, task_frequency=TASK_FREQUENCY, enable_notifications=False, items_added=None,
+                                notified: set = None):
         """
         Create embed messages for newly added books.
 
         Args:
             task_frequency: Lookback period in minutes
             enable_notifications: Whether to send wishlist notifications
+            items_added: Books from newBookList, looked up with task_frequency when not given
+            notified: Book ids whose wishlist notifications were already sent, updated with the ones sent now
 
         Returns:
             list: Discord embed messages for new books
@@ -886,7 +1231,8 @@ class SubscriptionTask(Extension):
         if not self.ServerNickName:
             self.ServerNickName = "Audiobookshelf"
 
-        items_added = await newBookList(task_frequency) or []
+        if items_added is None:
+            items_added = await newBookList(task_frequency) or []
 
         if items_added:
             count = 0
@@ -934,6 +1280,11 @@ class SubscriptionTask(Extension):
 
                 embeds.append(embed_message)
 
+                if wl_search and notified is not None:
+                    if bookID in notified:
+                        continue
+                    notified.add(bookID)
+
                 if wl_search:
                     for user in wl_search:
                         discord_id = user[0]
@@ -947,9 +1298,14 @@ class SubscriptionTask(Extension):
             return embeds
 
     @staticmethod
-    async def getFinishedBooks():
+    async def getFinishedBooks(watermarks: Dict[str, int] = None):
         """
-        Retrieve books that users have finished within the task frequency period.
+        Retrieve books that users have finished since the last check, or within the task frequency period.
+        Users are fetched concurrently and only progress updated after a user's watermark is looked at.
+
+        Args:
+            watermarks: newest progress lastUpdate already processed per user id. Users without one fall back
+                to the task frequency period. Updated in place, see FINISHED_BOOK_WATERMARKS
 
         Returns:
             list: Finished books with user and completion information
@@ -957,49 +1313,63 @@ class SubscriptionTask(Extension):
         current_time = datetime.now()
         book_list = []
         try:
-            books = await c.bookshelf_get_valid_books()
             users = await c.get_users()
 
             time_minus_delta = current_time - timedelta(minutes=TASK_FREQUENCY)
             timestamp_minus_delta = int(time.mktime(time_minus_delta.timetuple()) * 1000)
 
-            count = 0
-            if users and books:
-
-                for user in users['users']:
-                    user_id = user.get('id')
-                    username = user.get('username')
-
-                    endpoint = f'/users/{user_id}'
-                    r = await c.bookshelf_conn(endpoint=endpoint, GET=True)
-                    if r.status_code == 200:
-                        user_data = r.json()
-
-                        for media in user_data['mediaProgress']:
-
-                            media_type = media['mediaItemType']
-                            libraryItemId = media['libraryItemId']
-                            displayTitle = media.get('displayTitle')
-                            finished = bool(media.get('isFinished'))
-
-                            # Only process finished books (not podcasts)
-                            if media_type == 'book' and finished:
-
-                                finishedAtTime = int(media.get('finishedAt'))
-
-                                # Format timestamp for display
-                                formatted_time = finishedAtTime / 1000
-                                formatted_time = datetime.fromtimestamp(formatted_time)
-                                formatted_time = formatted_time.strftime('%Y/%m/%d %H:%M')
-
-                                if finishedAtTime >= timestamp_minus_delta:
-                                    count += 1
-                                    media['username'] = username
-                                    book_list.append(media)
-                                    logger.info(
-                                        f'User {username}, finished Book: {displayTitle} with  ID: {libraryItemId} at {formatted_time}')
+            if not users:
+                return book_list
+
+            semaphore = asyncio.Semaphore(USER_FETCH_CONCURRENCY)
+
+            async def user_finished_books(user):
+                user_id = user.get('id')
+                username = user.get('username')
+                since = timestamp_minus_delta
+                if watermarks is not None:
+                    since = watermarks.get(user_id, timestamp_minus_delta)
+
+                async with semaphore:
+                    r = await c.bookshelf_conn(endpoint=f'/users/{user_id}', GET=True)
+                if r.status_code != 200:
+                    logger.warning(f"Could not fetch progress of user {username}, status {r.status_code}")
+                    return user_id, None, []
+
+                finished_books = []
+                newest = since
+                for media in r.json().get('mediaProgress', []):
+                    last_update = int(media.get('lastUpdate') or 0)
+                    if last_update <= since:
+                        continue
+                    newest = max(newest, last_update)
+
+                    # Only process finished books (not podcasts)
+                    finishedAtTime = int(media.get('finishedAt') or 0)
+                    if media.get('mediaItemType') == 'book' and media.get('isFinished') and finishedAtTime > since:
+                        media['username'] = username
+                        finished_books.append(media)
+
+                        # Format timestamp for display
+                        formatted_time = datetime.fromtimestamp(finishedAtTime / 1000).strftime('%Y/%m/%d %H:%M')
+                        logger.info(f"User {username}, finished Book: {media.get('displayTitle')} "
+                                    f"with  ID: {media.get('libraryItemId')} at {formatted_time}")
+
+                return user_id, newest, finished_books
+
+            results = await asyncio.gather(*(user_finished_books(user) for user in users.get('users', [])),
+                                           return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(f"Error while checking finished books of a user: {result}")
+                    continue
+                user_id, newest, finished_books = result
+                # A user that could not be fetched keeps its watermark and is checked again next time
+                if watermarks is not None and newest is not None:
+                    watermarks[user_id] = newest
+                book_list.extend(finished_books)
 
-                logger.info(f"Total Found Books: {count}")
+            logger.info(f"Total Found Books: {len(book_list)}")
 
         except Exception as e:
             logger.error(f"Error occurred while attempting to get finished book: {e}")
@@ -1084,7 +1454,26 @@ class SubscriptionTask(Extension):
 
         return selected_color
 
+    @Task.create(trigger=IntervalTrigger(hours=MESSAGE_TRACKING_PURGE_HOURS))
+    @metrics.timed('task.run', task='message_tracking_purge')
+    async def messageTrackingMaintenance(self):
+        """Forget sent messages past their retention, duplicate checks no longer purge on every lookup"""
+        task_name = "message-tracking-purge"
+
+        if not await acquire_task_lock(task_name, lock_duration_seconds=60):
+            logger.debug(f"Another instance is already running {task_name}, skipping...")
+            return
+
+        try:
+            purged = await purge_sent_messages()
+            logger.info(f"Purged {purged} sent message records older than {MESSAGE_TRACKING_RETENTION_DAYS} days")
+        except Exception as e:
+            logger.error(f"Error in messageTrackingMaintenance: {e}", exc_info=True)
+        finally:
+            await release_task_lock(task_name)
+
     @Task.create(trigger=IntervalTrigger(minutes=TASK_FREQUENCY))
+    @metrics.timed('task.run', task='new_book_check')
     async def newBookTask(self):
         task_name = "new-book-check-execution"
 
@@ -1109,85 +1498,85 @@ class SubscriptionTask(Extension):
 
             logger.debug(f"Search result: {search_result}")
 
-            previous_token = os.getenv("bookshelfToken")
-
-            for result in search_result:
-                channel_id = int(result[1])
-                self.admin_token = result[3]
-
-                logger.info(f"Applying active admin token ({len(self.admin_token)} chars)")
-                os.environ["bookshelfToken"] = self.admin_token
-
-                # --- Fetch list of new books
-                new_titles = await newBookList()
+            # --- Detection, once per token and all tokens at once: channels set up with the same user share the
+            # result. Every token continues from the same watermarks, they are advanced once all channels are done
+            watermarks = await get_watermarks(NEW_BOOK_WATERMARKS)
+            advanced = {}
+
+            async def detect(token):
+                token_watermarks = dict(watermarks)
+                with c.use_token(token):
+                    return await newBookList(watermarks=token_watermarks), token_watermarks
+
+            tokens = list(dict.fromkeys(result[3] for result in search_result))
+            detected = {}
+            for token, (new_titles, token_watermarks) in zip(tokens, await asyncio.gather(*map(detect, tokens))):
+                detected[token] = new_titles
+                for library_id, newest in token_watermarks.items():
+                    advanced[library_id] = max(newest, advanced.get(library_id, 0))
+
+            # --- Embeds are rendered once per detection result, before any channel is notified
+            rendered = {}
+            notified = set()
+            for token, new_titles in detected.items():
                 if not new_titles:
-                    logger.info(f"No new books found for channel {channel_id}")
                     continue
-
                 if len(new_titles) > 10:
                     logger.warning("Found more than 10 titles")
+                # Cover links carry the token
+                with c.use_token(token):
+                    rendered[token] = await self.NewBookCheckEmbed(enable_notifications=True,
+                                                                   items_added=new_titles, notified=notified)
+
+            channel_tokens = {int(result[1]): result[3] for result in search_result}
 
-                # --- Generate embeds (must match titles)
-                embeds = await self.NewBookCheckEmbed(enable_notifications=True)
+            async def notify(channel_id):
+                token = channel_tokens[channel_id]
+                new_titles = detected[token]
+                if not new_titles:
+                    logger.info(f"No new books found for channel {channel_id}")
+                    return False
+
+                embeds = rendered[token]
                 if not embeds:
                     logger.warning("New books exist but no embeds were generated.")
-                    continue
+                    return False
 
                 # Assert correct alignment
                 if len(new_titles) != len(embeds):
                     logger.error("Mismatch between new_titles and embeds. Duplicate prevention disabled for this run.")
-                    continue
-
-                # --- Fetch the channel
-                channel_query = await self.bot.fetch_channel(channel_id=channel_id, force=True)
-                if not channel_query:
-                    logger.warning(f"Could not fetch channel {channel_id}")
-                    continue
-
-                logger.debug(f"Found Channel: {channel_id}")
-                logger.debug(f"Attempting to send messages to channel: {channel_id}")
-
-                # ==========================
-                #   DEDUP FIX STARTS HERE
-                # ==========================
-
-                books_to_send = []
-                embeds_to_send = []
-
-                for idx, item in enumerate(new_titles):
-                    book_id = item.get("id")
+                    return False
 
-                    already_sent = await has_message_been_sent(channel_id, book_id, "new-book")
-
-                    if not already_sent:
-                        books_to_send.append(book_id)
-                        embeds_to_send.append(embeds[idx])
-                    else:
-                        logger.debug(f"Skipping duplicate for book {book_id} in channel {channel_id}")
+                # --- Skip books this channel was already told about
+                unsent = set(await filter_unsent_messages(channel_id, [item.get("id") for item in new_titles],
+                                                          "new-book"))
+                books_to_send = [item.get("id") for item in new_titles if item.get("id") in unsent]
+                embeds_to_send = [embed for item, embed in zip(new_titles, embeds) if item.get("id") in unsent]
 
                 if not books_to_send:
                     logger.info(f"All new books already sent for channel {channel_id}")
-                    continue
+                    return False
 
                 # --- Send notifications
-                if len(embeds_to_send) < 10:
-                    msg = await channel_query.send(content="New books have been added to your library!")
-                    await msg.edit(embeds=embeds_to_send)
-                else:
-                    await channel_query.send(content="New books have been added to your library!")
-                    for embed in embeds_to_send:
-                        await channel_query.send(embed=embed)
+                if not await self.send_task_embeds(channel_id, "New books have been added to your library!",
+                                                   embeds_to_send):
+                    return False
 
                 logger.info(f"Sent {len(embeds_to_send)} new book notifications to channel {channel_id}")
 
                 # Mark books as sent **after** successful send
-                for book_id in books_to_send:
-                    await mark_message_as_sent(channel_id, book_id, "new-book")
+                await mark_messages_as_sent([(channel_id, book_id, "new-book") for book_id in books_to_send])
+                return True
+
+            # --- Fan-out, every channel is notified on its own. Watermarks advance whatever a channel's outcome,
+            # so one broken channel can't hold back the others, the sent messages keep retries from repeating
+            handled = await fan_out_channels(list(channel_tokens), notify)
+            failed = [channel_id for channel_id in channel_tokens if channel_id not in handled]
+            if failed:
+                logger.warning(f"New books could not be sent to channels {failed}")
 
-            # Restore token
-            os.environ["bookshelfToken"] = previous_token or ""
-            self.previous_token = None
-            self.admin_token = None
+            await set_watermarks(NEW_BOOK_WATERMARKS, {library_id: newest for library_id, newest in advanced.items()
+                                                       if newest != watermarks.get(library_id)})
 
             logger.info("Successfully completed new-book-check task!")
 
@@ -1199,6 +1588,7 @@ class SubscriptionTask(Extension):
             logger.debug(f"Released lock for {task_name}")
 
     @Task.create(trigger=IntervalTrigger(minutes=TASK_FREQUENCY))
+    @metrics.timed('task.run', task='finished_book_check')
     async def finishedBookTask(self):
         task_name = 'finished-book-check-execution'
 
@@ -1214,75 +1604,65 @@ class SubscriptionTask(Extension):
             search_result = await search_task_db(task='finished-book-check')
 
             if search_result:
-                self.previous_token = os.getenv('bookshelfToken')
-
-                for result in search_result:
-                    channel_id = int(result[1])
+                # --- Detection, once per token: channels set up with the same user share the result. Every token
+                # continues from the same watermarks, they are advanced once all channels are done
+                watermarks = await get_watermarks(FINISHED_BOOK_WATERMARKS)
+                advanced = {}
+                channel_tokens = {int(result[1]): result[3] for result in search_result}
+
+                detected = {}
+                for token in dict.fromkeys(channel_tokens.values()):
+                    token_watermarks = dict(watermarks)
+                    # As the user the channels were set up with, cover links carry the token
+                    with c.use_token(token):
+                        book_list = await self.getFinishedBooks(token_watermarks)
+                        embeds = await self.FinishedBookEmbeds(book_list) if book_list else []
+                    detected[token] = book_list, embeds
+                    for user_id, newest in token_watermarks.items():
+                        advanced[user_id] = max(newest, advanced.get(user_id, 0))
+
+                async def notify(channel_id):
                     logger.info(f'Channel ID: {channel_id}')
-                    self.admin_token = result[3]
-                    masked = len(self.admin_token)
-                    logger.info(f"Appending Active Token! {masked}")
-                    os.environ['bookshelfToken'] = self.admin_token
-
-                    # Fetch finished books
-                    book_list = await self.getFinishedBooks()
+                    book_list, embeds = detected[channel_tokens[channel_id]]
                     if not book_list:
                         logger.info('No finished books found for this channel.')
-                        continue
+                        return False
 
-                    embeds = await self.FinishedBookEmbeds(book_list)
                     if not embeds:
                         logger.warning("No embeds created despite having finished books")
-                        continue
-
-                    channel_query = await self.bot.fetch_channel(channel_id=channel_id, force=True)
-                    if not channel_query:
-                        logger.warning(f"Could not fetch channel {channel_id}")
-                        continue
-
-                    logger.debug(f"Found Channel: {channel_id}")
-                    logger.debug(f"Bot will now attempt to send a message to channel id: {channel_id}")
+                        return False
 
                     # Check message tracking to prevent duplicate notifications
-                    books_to_send = []
-                    for idx, item in enumerate(book_list):
-                        book_id = item.get('libraryItemId')
-                        already_sent = await has_message_been_sent(channel_id, book_id, 'finished-book')
-
-                        if not already_sent:
-                            books_to_send.append(idx)
-                            await mark_message_as_sent(channel_id, book_id, 'finished-book')
-                        else:
-                            logger.debug(
-                                f"Skipping duplicate message for finished book {book_id} in channel {channel_id}")
+                    book_ids = [item.get('libraryItemId') for item in book_list]
+                    unsent = set(await filter_unsent_messages(channel_id, book_ids, 'finished-book'))
+                    books_to_send = [idx for idx, book_id in enumerate(book_ids)
+                                     if book_id in unsent and book_id not in book_ids[:idx]]
 
                     # Send only unsent finished book notifications
-                    if books_to_send:
-                        embeds_to_send = [embeds[i] for i in books_to_send if i < len(embeds)]
-
-                        if len(embeds_to_send) < 10:
-                            msg = await channel_query.send(
-                                content="These books have been recently finished in your library!")
-                            await msg.edit(embeds=embeds_to_send)
-                        else:
-                            await channel_query.send(
-                                content="These books have been recently finished in your library!")
-                            for embed in embeds_to_send:
-                                await channel_query.send(embed=embed)
-
-                        logger.info(f"Sent {len(embeds_to_send)} finished book notifications to channel {channel_id}")
-                    else:
+                    if not books_to_send:
                         logger.info(f"All finished books already sent to channel {channel_id}, skipping message")
+                        return False
 
-                # Reset Vars - moved outside the loop with None check
-                if self.previous_token is not None:
-                    os.environ['bookshelfToken'] = self.previous_token
-                    logger.info(f'Returned Active Token to: {self.previous_token}')
-                else:
-                    logger.warning("Previous token was None, skipping token restoration")
+                    embeds_to_send = [embeds[i] for i in books_to_send if i < len(embeds)]
+                    if not await self.send_task_embeds(
+                            channel_id, "These books have been recently finished in your library!", embeds_to_send):
+                        return False
+
+                    logger.info(f"Sent {len(embeds_to_send)} finished book notifications to channel {channel_id}")
+
+                    # Mark books as sent **after** successful send
+                    await mark_messages_as_sent([(channel_id, book_ids[idx], 'finished-book') for idx in books_to_send])
+                    return True
+
+                # Watermarks advance even when a channel failed, see newBookTask
+                handled = await fan_out_channels(list(channel_tokens), notify)
+                failed = [channel_id for channel_id in channel_tokens if channel_id not in handled]
+                if failed:
+                    logger.warning(f"Finished books could not be sent to channels {failed}")
+
+                await set_watermarks(FINISHED_BOOK_WATERMARKS, {user_id: newest for user_id, newest in advanced.items()
+                                                                if newest != watermarks.get(user_id)})
 
-                self.previous_token = None
-                self.admin_token = None
                 logger.info("Successfully completed finished-book-check task!")
 
             else:
@@ -1393,13 +1773,8 @@ class SubscriptionTask(Extension):
         task_instruction = ''
         task_num = int(task)
 
-        # Check if search_user_db is async or sync
         try:
-            import inspect
-            if inspect.iscoroutinefunction(search_user_db):
-                user_result = await search_user_db(user=user)
-            else:
-                user_result = search_user_db(user=user)
+            user_result = await search_user_db(user=user)
         except Exception as e:
             logger.error(f"Error searching user db: {e}")
             await ctx.send("Failed to retrieve user information. Please check logs.", ephemeral=True)
@@ -1533,13 +1908,8 @@ class SubscriptionTask(Extension):
         """Provide stored users for task assignment autocomplete."""
         choices = []
         users_ = []
-        # Check if search_user_db is async or sync for compatibility
         try:
-            import inspect
-            if inspect.iscoroutinefunction(search_user_db):
-                user_result = await search_user_db()
-            else:
-                user_result = search_user_db()
+            user_result = await search_user_db()
         except Exception as e:
             logger.error(f"Error searching user db: {e}")
             user_result = None
@@ -1576,6 +1946,14 @@ class SubscriptionTask(Extension):
 
         init_msg = bool(os.getenv('INITIALIZED_MSG', False))
 
+        # Sent message records are purged periodically, run once now to catch up after downtime
+        if not self.messageTrackingMaintenance.running:
+            self.messageTrackingMaintenance.start()
+            try:
+                await purge_sent_messages()
+            except Exception as e:
+                logger.error(f"Could not purge sent message records: {e}")
+
         # Check for version updates
         version_result = await search_version_db()
         version_list = [v[1] for v in version_result]
@@ -1,4 +1,4 @@
-import time
+import asyncio
 import logging
 from functools import wraps
 
@@ -50,6 +50,23 @@ async def is_playback_manager(ctx):
     return False
 
 
+def get_guild_session(ctx, audio_extension):
+    """
+    Resolve the playback session of the guild ctx was invoked in.
+
+    Args:
+        ctx: Discord context
+        audio_extension: The audio extension instance
+
+    Returns:
+        The guild's PlaybackSession, or audio_extension itself if it doesn't keep per guild sessions
+    """
+    sessions = getattr(audio_extension, 'sessions', None)
+    if sessions is None:
+        return audio_extension
+    return sessions.get(ctx.guild_id)
+
+
 async def can_control_session(ctx, audio_extension, action="control"):
     """
     Universal permission check for session actions.
@@ -66,21 +83,24 @@ async def can_control_session(ctx, audio_extension, action="control"):
     if await is_playback_manager(ctx):
         return True
 
+    # Playback state is kept per guild
+    session = get_guild_session(ctx, audio_extension)
+
     if action == "start":
         # If OWNER_ONLY is enabled, only privileged users can start
         if settings.OWNER_ONLY:
             return False
 
         # Regular users can start IF no active session
-        if not hasattr(audio_extension, 'activeSessions') or audio_extension.activeSessions == 0:
+        if not hasattr(session, 'activeSessions') or session.activeSessions == 0:
             return True
 
         return False
 
     elif action in ["control", "announce"]:
         # Session owner can control/announce their own session
-        if (hasattr(audio_extension, 'sessionOwner') and
-                audio_extension.sessionOwner == ctx.author.username):
+        if (hasattr(session, 'sessionOwner') and
+                session.sessionOwner == ctx.author.username):
             return True
 
         return False
@@ -102,11 +122,12 @@ def check_session_control(action="control"):
             if not await can_control_session(ctx, self, action):
                 # Customize message based on action
                 if action == "start":
-                    if hasattr(self, 'activeSessions') and self.activeSessions >= 1:
+                    session = get_guild_session(ctx, self)
+                    if hasattr(session, 'activeSessions') and session.activeSessions >= 1:
                         if await is_playback_manager(ctx):
-                            message = f"A session is currently active (owner: {self.sessionOwner}). You can control it or use `/stop` first if you want to start a new session."
+                            message = f"A session is currently active (owner: {session.sessionOwner}). You can control it or use `/stop` first if you want to start a new session."
                         else:
-                            message = f"A session is currently active (owner: {self.sessionOwner}). Please wait for it to end or ask a manager to stop it."
+                            message = f"A session is currently active (owner: {session.sessionOwner}). Please wait for it to end or ask a manager to stop it."
                     else:
                         message = "You don't have permission to start playback sessions."
                 elif action == "announce":
@@ -125,6 +146,48 @@ def check_session_control(action="control"):
     return decorator
 
 
+# Concurrent /me/progress requests when the bulk progress map can't be fetched
+PROGRESS_FALLBACK_CONCURRENCY = 8
+
+
+def _progress_key(choice):
+    """
+    :return: (item_id, episode_id) for choices that can carry a ✅, None for special entries
+    """
+    item_id = choice.get('value')
+    name = choice.get('name', '')
+    # Skip special items like "random" or items already with checkmarks
+    if not item_id or item_id == "random" or "📚" in name or name.startswith('✅'):
+        return None
+    return item_id, choice.get('episode_id')
+
+
+async def _collect_finished(keys, finished: set):
+    """
+    Fill finished with the keys that are finished, from one /me request or concurrent per-item requests.
+    Results land in finished as they arrive so a timeout still keeps the ones already known.
+    """
+    progress_map = await c.bookshelf_progress_map()
+    if progress_map is not None:
+        for key in keys:
+            progress = progress_map.get(key)
+            if progress and progress.get('isFinished'):
+                finished.add(key)
+        return
+
+    semaphore = asyncio.Semaphore(PROGRESS_FALLBACK_CONCURRENCY)
+
+    async def check(key):
+        async with semaphore:
+            try:
+                if await c.bookshelf_item_finished(*key):
+                    finished.add(key)
+            except Exception as e:
+                logger.debug(f"Error checking progress for {key[0]}: {e}")
+
+    await asyncio.gather(*(check(key) for key in keys))
+
+
 async def add_progress_indicators(choices, timeout_seconds=2.5):
     """
     Add ✅ to finished books in autocomplete choices.
@@ -133,63 +196,42 @@ async def add_progress_indicators(choices, timeout_seconds=2.5):
     if not choices:
         return choices, False
 
-    start_time = time.time()
-    updated_choices = []
+    keys = {key for key in (_progress_key(choice) for choice in choices) if key}
+    if not keys:
+        return choices, False
+
+    finished = set()
     timed_out = False
-    completed_checks = 0
-    finished_count = 0
-
-    for i, choice in enumerate(choices):
-        # Check timeout
-        elapsed = time.time() - start_time
-        if elapsed > timeout_seconds:
-            logger.warning(
-                f"Progress check timeout after {elapsed:.2f}s - processed {completed_checks}/{len(choices)} items")
-            timed_out = True
-            updated_choices.extend(choices[i:])  # Add remaining without checkmarks
-            break
-
-        item_id = choice.get('value')
-        original_name = choice.get('name', '')
-        episode_id = choice.get('episode_id')
-
-        # Skip special items like "random" or items already with checkmarks
-        if not item_id or item_id == "random" or "📚" in original_name or original_name.startswith('✅'):
-            updated_choices.append(choice)
-            continue
+    try:
+        await asyncio.wait_for(_collect_finished(keys, finished), timeout_seconds)
+    except asyncio.TimeoutError:
+        logger.warning(f"Progress check timeout after {timeout_seconds}s - "
+                       f"{len(finished)}/{len(keys)} items known to be finished")
+        timed_out = True
+    except Exception as e:
+        logger.debug(f"Error checking progress: {e}")
 
-        try:
-            progress_data = await c.bookshelf_item_progress(item_id, episode_id)
-            is_finished = progress_data.get('finished', 'False') == 'True'
-
-            if is_finished:
-                new_name = f"✅ {original_name}"
-
-                # If too long, truncate to fit
-                if len(new_name) > 100:
-                    # "✅ " = 2 chars, so we have 98 chars left for the name
-                    new_name = f"✅ {original_name[:98]}"
-
-                # Preserve episode_id if it exists
-                updated_choice = {"name": new_name, "value": item_id}
-                if episode_id:
-                    updated_choice["episode_id"] = episode_id
-                choice = updated_choice
-                finished_count += 1
-
-            updated_choices.append(choice)
-            completed_checks += 1
-
-        except Exception as e:
-            logger.debug(f"Error checking progress for {item_id}: {e}")
-            updated_choices.append(choice)
-            completed_checks += 1
-
-    # Only log if we found finished books or had issues
-    if finished_count > 0:
-        logger.info(f"Found {finished_count} finished books in autocomplete")
-    elif timed_out:
-        pass  # Already logged the timeout above
+    updated_choices = []
+    for choice in choices:
+        key = _progress_key(choice)
+        if key in finished:
+            item_id, episode_id = key
+            new_name = f"✅ {choice.get('name', '')}"
+
+            # If too long, truncate to fit
+            if len(new_name) > 100:
+                # "✅ " = 2 chars, so we have 98 chars left for the name
+                new_name = f"✅ {choice.get('name', '')[:98]}"
+
+            # Preserve episode_id if it exists
+            choice = {"name": new_name, "value": item_id}
+            if episode_id:
+                choice["episode_id"] = episode_id
+        updated_choices.append(choice)
+
+    # Only log if we found finished books
+    if finished:
+        logger.info(f"Found {len(finished)} finished books in autocomplete")
 
     return updated_choices, timed_out
 
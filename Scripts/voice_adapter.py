@@ -2,9 +2,61 @@
 import discord
 import logging
 import threading
+import time
+
+import metrics
 
 logger = logging.getLogger("bot")
 
+
+class FirstAudioProbe(discord.AudioSource):
+    """
+    Passes a source through to the voice client and records how long it took to deliver its first frame,
+    which covers starting FFmpeg and opening the stream.
+    """
+
+    def __init__(self, source: discord.AudioSource):
+        self.source = source
+        self._requested = time.perf_counter()
+        self._seen = False
+
+    def read(self) -> bytes:
+        data = self.source.read()
+        if data and not self._seen:
+            self._seen = True
+            metrics.observe('voice.first_audio', (time.perf_counter() - self._requested) * 1000)
+        return data
+
+    def is_opus(self) -> bool:
+        return self.source.is_opus()
+
+    def cleanup(self):
+        self.source.cleanup()
+
+
+class PrimedSource(discord.AudioSource):
+    """
+    Hands out a frame that was already read from source before passing the rest of it through, so a source
+    probed ahead of playback doesn't lose its first frame.
+    """
+
+    def __init__(self, source: discord.AudioSource, frame: bytes):
+        self.source = source
+        self._frame = frame
+
+    def read(self) -> bytes:
+        if self._frame is not None:
+            frame, self._frame = self._frame, None
+            return frame
+        return self.source.read()
+
+    def is_opus(self) -> bool:
+        return self.source.is_opus()
+
+    def cleanup(self):
+        self.source.cleanup()
+
+
 class VoiceAdapter:
     """
     Voice runs ONLY on the discord.py client's event loop.
@@ -89,6 +141,13 @@ class VoiceAdapter:
         return ev.wait(timeout)
 
     def play(self, guild_id: int, source: discord.AudioSource):
+        source = FirstAudioProbe(source)
+
+        def _after(err):
+            if err:
+                metrics.inc('voice.playback_errors')
+            logger.info(f"[VOICE] Playback ended (guild {guild_id}) err={err}")
+
         def _do():
             vc = self.voice_clients.get(guild_id)
             if not vc or not vc.is_connected():
@@ -98,12 +157,7 @@ class VoiceAdapter:
             try:
                 if vc.is_playing() or vc.is_paused():
                     vc.stop()
-                vc.play(
-                    source,
-                    after=lambda err: logger.info(
-                        f"[VOICE] Playback ended (guild {guild_id}) err={err}"
-                    )
-                )
+                vc.play(source, after=_after)
             except Exception as e:
                 logger.exception(f"[VOICE] Play failed: {e}")
 
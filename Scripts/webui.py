@@ -11,11 +11,12 @@ from contextlib import asynccontextmanager
 from abc import ABC, abstractmethod
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv, set_key
 
 import bookshelfAPI as c
+import metrics
 
 # Logger Config
 logger = logging.getLogger("webui")
@@ -37,9 +38,14 @@ DB_PASSWORD = os.getenv('DB_PASSWORD', '')
 DB_NAME = os.getenv('DB_NAME', 'bookshelf')
 DB_PATH = 'db/settings.db'
 
+# Seconds the ABS connection check of /api/status is reused, the dashboard polls every 30 seconds
+ABS_STATUS_TTL = 60
+
 # Global state
 startup_time = datetime.now()
 db_instance = None
+# (checked at, (connected, username, user type))
+abs_status_cache = None
 
 
 # ============== Database Abstract Interface ==============
@@ -76,15 +82,16 @@ class SQLiteSettingsDB(SettingsDBInterface):
         self.conn = None
 
     async def connect(self):
-        import aiosqlite
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        self.conn = await aiosqlite.connect(self.db_path)
+        import sqlite_manager
+        self.conn = await sqlite_manager.connect(self.db_path)
         await self.create_settings_table()
         logger.info(f"Connected to SQLite settings database: {self.db_path}")
 
     async def close(self):
         if self.conn:
-            await self.conn.close()
+            import sqlite_manager
+            await sqlite_manager.release(self.db_path)
+            self.conn = None
 
     async def create_settings_table(self):
         await self.conn.execute('''
@@ -315,6 +322,7 @@ async def lifespan(app: FastAPI):
     # Cleanup
     if db_instance:
         await db_instance.close()
+    await c.close_http_client()
     logger.info("Shutting down Web UI...")
 
 
@@ -1067,39 +1075,62 @@ async def root():
     return HTMLResponse(content=get_dashboard_html())
 
 
-@app.get("/api/status")
-async def get_status():
-    """Get current bot status"""
-    import settings
-
-    abs_connected = False
-    abs_user = None
-    abs_user_type = None
+async def get_abs_status() -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    ABS connection check, reused for ABS_STATUS_TTL seconds instead of hitting the server on every poll.
+    :return: (connected, username, user type)
+    """
+    global abs_status_cache
+    now = datetime.now()
+    if abs_status_cache and (now - abs_status_cache[0]).total_seconds() < ABS_STATUS_TTL:
+        return abs_status_cache[1]
 
+    status = (False, None, None)
     try:
         username, user_type, user_locked = await c.bookshelf_auth_test()
-        abs_connected = True
-        abs_user = username
-        abs_user_type = user_type
+        status = (True, username, user_type)
     except Exception as e:
         logger.warning(f"Failed to get ABS status: {e}")
 
+    abs_status_cache = (now, status)
+    return status
+
+
+@app.get("/api/status")
+async def get_status():
+    """Get current bot status"""
+    import settings
+
+    abs_connected, abs_user, abs_user_type = await get_abs_status()
+
     uptime_delta = datetime.now() - startup_time
     days = uptime_delta.days
     hours, remainder = divmod(uptime_delta.seconds, 3600)
     minutes, _ = divmod(remainder, 60)
     uptime_str = f"{days}d {hours}h {minutes}m" if days > 0 else f"{hours}h {minutes}m"
 
+    # Written by the bot process, absent until it has been running for a snapshot interval
+    perf = metrics.read_snapshot()
+
     return {
         "status": "running",
         "abs_connected": abs_connected,
         "abs_user": abs_user,
         "abs_user_type": abs_user_type,
         "version": settings.versionNumber,
-        "uptime": uptime_str
+        "uptime": uptime_str,
+        "perf": perf.get('histograms', {}) if perf else {}
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics, from the snapshot the bot process writes every METRICS_SNAPSHOT_INTERVAL seconds"""
+    data = metrics.read_snapshot() or {}
+    return PlainTextResponse(content=metrics.render_prometheus(data),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/api/config")
 async def get_config():
     """Get current configuration"""
@@ -1163,26 +1194,25 @@ async def save_database_config(config: DatabaseConfig):
 @app.post("/api/test-abs-connection")
 async def test_abs_connection(request: TestConnectionRequest):
     """Test connection with custom URL and token"""
-    import httpx
-
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(
-                f"{request.url}/api/me?token={request.token}"
-            )
+        client = c.get_http_client()
+        response = await client.get(
+            f"{request.url}/api/me?token={request.token}",
+            timeout=10
+        )
 
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "success": True,
-                    "user": data.get("username", "Unknown"),
-                    "user_type": data.get("type", "Unknown")
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"Server returned status {response.status_code}"
-                }
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                "success": True,
+                "user": data.get("username", "Unknown"),
+                "user_type": data.get("type", "Unknown")
+            }
+        else:
+            return {
+                "success": False,
+                "error": f"Server returned status {response.status_code}"
+            }
     except Exception as e:
         return {
             "success": False,
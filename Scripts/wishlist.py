@@ -7,6 +7,7 @@ from abc import ABC, abstractmethod
 
 from interactions.ext.paginators import Paginator
 import bookshelfAPI as c
+import metrics
 from interactions import *
 from settings import DEBUG_MODE, DEFAULT_PROVIDER, bookshelf_traveller_footer
 
@@ -61,15 +62,17 @@ class SQLiteDatabase(DatabaseInterface):
         self.cursor = None
 
     async def connect(self):
-        import aiosqlite
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        self.conn = await aiosqlite.connect(self.db_path)
+        import sqlite_manager
+        self.conn = await sqlite_manager.connect(self.db_path)
         self.cursor = await self.conn.cursor()
         logger.info(f"Connected to SQLite database: {self.db_path}")
 
     async def close(self):
         if self.conn:
-            await self.conn.close()
+            import sqlite_manager
+            await self.cursor.close()
+            await sqlite_manager.release(self.db_path)
+            self.conn = None
 
     async def create_wishlist_table(self):
         await self.cursor.execute('''
@@ -271,19 +274,23 @@ async def close_database():
 
 
 # Wrapper functions for backward compatibility
+@metrics.timed('db.query', db='wishlist', query='insert_wishlist_data')
 async def insert_wishlist_data(title: str, author: str, description: str, cover: str, provider: str,
                                provider_id: str, discord_id: int, data: str) -> bool:
     return await db.insert_wishlist_data(title, author, description, cover, provider, provider_id, discord_id, data)
 
 
+@metrics.timed('db.query', db='wishlist', query='search_wishlist_db')
 async def search_wishlist_db(discord_id: int = 0, title: str = "", provider_id: str = "") -> List[Tuple]:
     return await db.search_wishlist_db(discord_id, title, provider_id)
 
 
+@metrics.timed('db.query', db='wishlist', query='updated_wishlist_db')
 async def updated_wishlist_db(discord_id: int, downloaded: int, title: str):
     await db.update_wishlist_db(discord_id, downloaded, title)
 
 
+@metrics.timed('db.query', db='wishlist', query='search_all_wishlists')
 async def search_all_wishlists() -> List[Tuple]:
     return await db.search_all_wishlists()
 
@@ -0,0 +1,381 @@
+"""
+Mock Audiobookshelf - a stand-in ABS server with a synthetic catalogue, for the offline benchmarks.
+
+Only the endpoints and fields the bot reads are served. The catalogue is deterministic for a given size, so
+two benchmark runs against the same size see the same libraries, series, users and progress. Every response
+is delayed by the configured latency, and requests are counted per endpoint so the runner can report how
+many round trips a hot path needs.
+
+    python mock_abs.py --size 10000 --latency-ms 20 --port 13378
+"""
+import argparse
+import asyncio
+import random
+import re
+import time
+from collections import Counter
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+# Synthetic catalogue
+BOOK_LIBRARIES = (('lib_books_main0001', 'Audiobooks'), ('lib_books_extra002', 'More Audiobooks'))
+PODCAST_LIBRARY = ('lib_podcasts00003', 'Podcasts')
+PODCAST_COUNT = 20
+EPISODES_PER_PODCAST = 25
+SERIES_LENGTH = 8
+CHAPTERS_PER_BOOK = 24
+USER_COUNT = 5
+RECENT_SESSIONS = 10
+# Items added and books finished within this many seconds of startup, so the task lookbacks find a few
+RECENT_WINDOW = 120
+
+ADJECTIVES = ('Silent', 'Broken', 'Hidden', 'Last', 'Crimson', 'Distant', 'Hollow', 'Golden', 'Frozen', 'Wandering',
+              'Burning', 'Shattered', 'Quiet', 'Iron', 'Lost', 'Bright')
+NOUNS = ('Kingdom', 'River', 'Empire', 'Garden', 'Star', 'Tower', 'Voyage', 'Storm', 'Harbor', 'Forest', 'Engine',
+         'Library', 'Crown', 'Mountain', 'Archive', 'Traveller')
+FIRST_NAMES = ('Ada', 'Brandon', 'Clara', 'Dmitri', 'Elena', 'Farid', 'Grace', 'Hiro', 'Ingrid', 'Jonas', 'Keiko',
+               'Liam', 'Maya', 'Nadia', 'Oscar', 'Priya')
+LAST_NAMES = ('Abbott', 'Baker', 'Castillo', 'Dubois', 'Eriksen', 'Fischer', 'Garcia', 'Huang', 'Ivanova', 'Jensen',
+              'Kowalski', 'Larsen', 'Moreau', 'Novak', 'Okafor', 'Petrov')
+GENRES = ('Fantasy', 'Science Fiction', 'Mystery', 'Thriller', 'History', 'Biography', 'Romance', 'Horror',
+          'Philosophy', 'Adventure')
+
+# Same rule as bookshelfAPI.metrics_endpoint, ids become :id so counts aggregate per endpoint
+_ID_SEGMENT = re.compile(r"^(?=.*\d)[\w-]{8,}$")
+
+
+def endpoint_name(method: str, path: str) -> str:
+    segments = ['' if not segment else ':id' if _ID_SEGMENT.match(segment) else segment
+                for segment in path.split('/')]
+    return f"{method} {'/'.join(segments)}"
+
+
+def _person(index: int) -> str:
+    return f"{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+
+
+class Catalogue:
+    """
+    Books, podcasts, users and their progress for a library of a given size.
+    Items are kept as compact tuples and only expanded into ABS documents when requested.
+    """
+
+    def __init__(self, size: int, seed: int = 0):
+        rng = random.Random(seed)
+        self.size = size
+        self.started = int(time.time() * 1000)
+        author_count = max(1, size // 10)
+        block = SERIES_LENGTH * 2
+        series_count = -(-size // block)
+
+        # (id, library_id, title, author, narrator, series_index, sequence, genres, year, duration, added_at)
+        self.books = []
+        for i in range(size):
+            # Consecutive blocks alternate between the libraries, every other book of a block is in its series
+            library_id = BOOK_LIBRARIES[(i // block) % len(BOOK_LIBRARIES)][0]
+            series_index = i // block if i % 2 == 0 else None
+            sequence = (i % block) // 2 + 1 if series_index is not None else None
+            title = f"The {ADJECTIVES[rng.randrange(len(ADJECTIVES))]} {NOUNS[rng.randrange(len(NOUNS))]} {i}"
+            genres = tuple(sorted({GENRES[rng.randrange(len(GENRES))] for _ in range(rng.randint(1, 3))}))
+            # Newest items last, the last few were added within RECENT_WINDOW
+            added_at = self.started - (size - i) * (RECENT_WINDOW * 1000 // 10)
+            self.books.append((f"li_book_{i:08d}", library_id, title, _person(rng.randrange(author_count)),
+                               _person(rng.randrange(author_count) + 7), series_index, sequence, genres,
+                               1950 + rng.randrange(75), float(rng.randint(3600, 40 * 3600)), added_at))
+        self.series_names = [f"{ADJECTIVES[k % len(ADJECTIVES)]} {NOUNS[(k // len(ADJECTIVES)) % len(NOUNS)]} "
+                             f"Saga {k}" for k in range(series_count)]
+
+        self.podcasts = [(f"li_podcast_{p:06d}", PODCAST_LIBRARY[0], f"Podcast Hour {p}", _person(p),
+                          self.started - (PODCAST_COUNT - p) * 86400000) for p in range(PODCAST_COUNT)]
+
+        self.by_id = {book[0]: book for book in self.books}
+        self.podcasts_by_id = {podcast[0]: podcast for podcast in self.podcasts}
+        self.library_books = {library_id: [book for book in self.books if book[1] == library_id]
+                              for library_id, name in BOOK_LIBRARIES}
+        # library id -> {series index: books in sequence order}
+        self.library_series = {}
+        for book in self.books:
+            if book[5] is not None:
+                self.library_series.setdefault(book[1], {}).setdefault(book[5], []).append(book)
+
+        # Each user listened to a slice of the catalogue, a quarter of it finished, one book finished just now
+        progress_count = min(size, 50 + size // 100)
+        self.users = []
+        self.progress = {}
+        for u in range(USER_COUNT):
+            user_id = f"usr_{u:08d}"
+            entries = []
+            for k in range(progress_count):
+                book = self.books[(u * 7919 + k * 13) % size]
+                finished = k % 4 == 0
+                finished_at = (self.started - 60000 if k == 0
+                               else self.started - (k + 1) * 86400000) if finished else None
+                entries.append({
+                    'id': f"prog_{u}_{k:08d}", 'libraryItemId': book[0], 'episodeId': None,
+                    'mediaItemId': f"book_{book[0]}", 'mediaItemType': 'book', 'displayTitle': book[2],
+                    'duration': book[9], 'progress': 1.0 if finished else round(rng.random(), 3),
+                    'currentTime': book[9] if finished else round(book[9] * rng.random(), 1),
+                    'isFinished': finished, 'finishedAt': finished_at,
+                    'lastUpdate': finished_at or self.started - k * 3600000,
+                    'startedAt': self.started - (k + 30) * 86400000
+                })
+            # Only the first two users are currently active
+            self.users.append({'id': user_id, 'username': f"listener{u}", 'type': 'admin' if u == 0 else 'user',
+                               'isActive': True, 'lastSeen': self.started - u * (60000 if u < 2 else 86400000),
+                               'createdAt': self.started - 365 * 86400000})
+            self.progress[user_id] = entries
+
+    # Documents ---------------------------------
+
+    def _series_ref(self, book) -> list:
+        if book[5] is None:
+            return []
+        return [{'id': f"ser_{book[5]:08d}", 'name': self.series_names[book[5]], 'sequence': str(book[6])}]
+
+    def minified(self, book) -> dict:
+        series = f"{self.series_names[book[5]]} #{book[6]}" if book[5] is not None else ''
+        return {
+            'id': book[0], 'libraryId': book[1], 'mediaType': 'book', 'addedAt': book[10], 'updatedAt': book[10],
+            'media': {
+                'metadata': {'title': book[2], 'authorName': book[3], 'narratorName': book[4], 'seriesName': series,
+                             'genres': list(book[7]), 'publishedYear': str(book[8]), 'asin': f"B0{book[0][-8:]}"},
+                'duration': book[9], 'numTracks': 1, 'ebookFormat': None
+            }
+        }
+
+    def expanded(self, book) -> dict:
+        chapter_length = book[9] / CHAPTERS_PER_BOOK
+        return {
+            'id': book[0], 'ino': book[0][-8:], 'libraryId': book[1], 'mediaType': 'book',
+            'addedAt': book[10], 'updatedAt': book[10],
+            'media': {
+                'metadata': {
+                    'title': book[2], 'subtitle': None, 'authors': [{'id': f"aut_{book[3]}", 'name': book[3]}],
+                    'narrators': [book[4]], 'series': self._series_ref(book), 'genres': list(book[7]),
+                    'publishedYear': str(book[8]), 'publisher': 'Synthetic Press', 'description': f"About {book[2]}.",
+                    'language': 'English', 'asin': f"B0{book[0][-8:]}", 'authorName': book[3],
+                    'narratorName': book[4]
+                },
+                'duration': book[9],
+                'chapters': [{'id': n, 'start': n * chapter_length, 'end': (n + 1) * chapter_length,
+                              'title': f"Chapter {n + 1}"} for n in range(CHAPTERS_PER_BOOK)],
+                'audioFiles': [{'index': 1, 'ino': book[0][-8:], 'duration': book[9],
+                                'metadata': {'filename': 'book.m4b', 'ext': '.m4b'}}],
+                'tracks': [{'index': 1, 'startOffset': 0, 'duration': book[9], 'title': 'book.m4b',
+                            'contentUrl': f"/api/items/{book[0]}/file/{book[0][-8:]}"}],
+                'ebookFile': None
+            }
+        }
+
+    def podcast(self, podcast, expanded: bool = False) -> dict:
+        episodes = [{'id': f"ep_{podcast[0][-6:]}_{e:04d}", 'index': e, 'title': f"Episode {e}",
+                     'duration': 1800.0 + e, 'publishedAt': podcast[4] + e * 3600000}
+                    for e in range(EPISODES_PER_PODCAST)]
+        media = {'metadata': {'title': podcast[2], 'author': podcast[3], 'genres': ['Talk']},
+                 'numEpisodes': EPISODES_PER_PODCAST}
+        if expanded:
+            media['episodes'] = episodes
+        return {'id': podcast[0], 'libraryId': podcast[1], 'mediaType': 'podcast', 'addedAt': podcast[4],
+                'updatedAt': podcast[4], 'media': media}
+
+    def item(self, item_id: str, expanded: bool = True):
+        book = self.by_id.get(item_id)
+        if book is not None:
+            return self.expanded(book) if expanded else self.minified(book)
+        podcast = self.podcasts_by_id.get(item_id)
+        if podcast is not None:
+            return self.podcast(podcast, expanded)
+        return None
+
+    def series_page(self, library_id: str, limit: int, page: int) -> dict:
+        members = self.library_series.get(library_id, {})
+        ordered = sorted(members)
+        results = [{'id': f"ser_{k:08d}", 'name': self.series_names[k], 'type': 'series',
+                    'books': [dict(self.minified(book), sequence=str(book[6])) for book in members[k]]}
+                   for k in ordered[page * limit:(page + 1) * limit]]
+        return {'results': results, 'total': len(ordered), 'limit': limit, 'page': page}
+
+    def recent_sessions(self) -> list:
+        sessions = []
+        for n, book in enumerate(self.books[-RECENT_SESSIONS:]):
+            sessions.append({'id': f"sess_recent_{n:04d}", 'libraryItemId': book[0], 'bookId': f"book_{book[0]}",
+                             'episodeId': None, 'mediaType': 'book', 'displayTitle': book[2],
+                             'displayAuthor': book[3], 'mediaMetadata': {'title': book[2], 'subtitle': ''},
+                             'duration': book[9], 'timeListening': 1800.0, 'updatedAt': book[10]})
+        return sessions
+
+
+def create_app(size: int, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0) -> FastAPI:
+    """
+    :param size: number of books, split over the book libraries
+    :param latency_ms: delay added to every response
+    :param jitter_ms: up to this much more, uniformly random
+    :param seed: catalogue seed
+    :return: the mock server application
+    """
+    catalogue = Catalogue(size, seed)
+    counts = Counter()
+    jitter = random.Random(seed)
+    app = FastAPI(title="Mock Audiobookshelf")
+
+    @app.middleware("http")
+    async def latency_and_counts(request: Request, call_next):
+        if request.url.path.startswith('/__bench'):
+            return await call_next(request)
+        counts[endpoint_name(request.method, request.url.path)] += 1
+        delay = latency_ms + (jitter.uniform(0, jitter_ms) if jitter_ms else 0.0)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        return await call_next(request)
+
+    # Harness ---------------------------------
+
+    @app.get("/__bench/stats")
+    async def bench_stats():
+        return {'size': size, 'latency_ms': latency_ms, 'total': sum(counts.values()), 'requests': dict(counts)}
+
+    @app.post("/__bench/reset")
+    async def bench_reset():
+        counts.clear()
+        return {'ok': True}
+
+    @app.get("/healthcheck")
+    async def healthcheck():
+        return Response(status_code=200)
+
+    # Libraries ---------------------------------
+
+    @app.get("/api/libraries")
+    async def libraries():
+        result = [{'id': library_id, 'name': name, 'mediaType': 'book', 'settings': {'audiobooksOnly': True}}
+                  for library_id, name in BOOK_LIBRARIES]
+        result.append({'id': PODCAST_LIBRARY[0], 'name': PODCAST_LIBRARY[1], 'mediaType': 'podcast',
+                       'settings': {'audiobooksOnly': False}})
+        return {'libraries': result}
+
+    @app.get("/api/libraries/{library_id}/items")
+    async def library_items(library_id: str, limit: int = 0, page: int = 0, desc: int = 0, sort: str = ''):
+        if library_id == PODCAST_LIBRARY[0]:
+            items = [catalogue.podcast(podcast) for podcast in catalogue.podcasts]
+            return {'results': items, 'total': len(items), 'limit': limit, 'page': page}
+        books = catalogue.library_books.get(library_id)
+        if books is None:
+            return JSONResponse({'error': 'Library not found'}, status_code=404)
+        # Items never change after startup, so updatedAt order is addedAt order
+        ordered = books[::-1] if desc else books
+        selected = ordered[page * limit:(page + 1) * limit] if limit else ordered
+        return {'results': [catalogue.minified(book) for book in selected], 'total': len(books),
+                'limit': limit, 'page': page}
+
+    @app.get("/api/libraries/{library_id}/series")
+    async def library_series(library_id: str, limit: int = 50, page: int = 0):
+        return catalogue.series_page(library_id, limit, page)
+
+    @app.get("/api/libraries/{library_id}/search")
+    async def library_search(library_id: str, q: str = '', limit: int = 12):
+        query = q.lower()
+        if library_id == PODCAST_LIBRARY[0]:
+            podcasts = [catalogue.podcast(p) for p in catalogue.podcasts if query in p[2].lower()][:limit]
+            return {'podcast': [{'libraryItem': podcast} for podcast in podcasts], 'book': []}
+        found = []
+        for book in catalogue.library_books.get(library_id, []):
+            if query in book[2].lower() or query in book[3].lower():
+                found.append({'libraryItem': catalogue.expanded(book), 'matchKey': 'title', 'matchText': book[2]})
+                if len(found) >= limit:
+                    break
+        return {'book': found, 'podcast': [], 'series': [], 'authors': [], 'tags': []}
+
+    # Items ---------------------------------
+
+    @app.get("/api/items/{item_id}")
+    async def get_item(item_id: str, request: Request):
+        item = catalogue.item(item_id)
+        if item is None:
+            return JSONResponse({'error': 'Not found'}, status_code=404)
+        etag = f'"{item_id}-{item["updatedAt"]}"'
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers={'ETag': etag})
+        return JSONResponse(item, headers={'ETag': etag})
+
+    @app.post("/api/items/batch/get")
+    async def batch_get(request: Request):
+        body = await request.json()
+        items = [catalogue.item(item_id) for item_id in body.get('libraryItemIds', [])]
+        return {'libraryItems': [item for item in items if item is not None]}
+
+    @app.post("/api/items/{item_id}/play")
+    @app.post("/api/items/{item_id}/play/{episode_id}")
+    async def play_item(item_id: str, episode_id: str = None):
+        item = catalogue.item(item_id)
+        if item is None:
+            return JSONResponse({'error': 'Not found'}, status_code=404)
+        duration = item['media'].get('duration', 1800.0)
+        return {'id': f"sess_{item_id[-8:]}_{int(time.time() * 1000)}", 'libraryItemId': item_id,
+                'episodeId': episode_id, 'mediaType': item['mediaType'], 'currentTime': 0.0, 'duration': duration,
+                'displayTitle': item['media']['metadata']['title'], 'libraryItem': item,
+                'audioTracks': item['media'].get('tracks', [])}
+
+    # Sessions ---------------------------------
+
+    @app.get("/api/session/{session_id}")
+    async def get_session(session_id: str):
+        item_id = f"li_book_{session_id.split('_')[1]}" if session_id.count('_') >= 2 else None
+        book = catalogue.by_id.get(item_id)
+        return {'id': session_id, 'libraryItemId': item_id, 'duration': book[9] if book else 0.0,
+                'currentTime': 0.0}
+
+    @app.post("/api/session/{session_id}/sync")
+    @app.post("/api/session/{session_id}/close")
+    async def session_update(session_id: str):
+        return Response(status_code=200)
+
+    # Users and progress ---------------------------------
+
+    @app.get("/api/me")
+    async def me():
+        user = catalogue.users[0]
+        return dict(user, mediaProgress=catalogue.progress[user['id']])
+
+    @app.get("/api/me/listening-stats")
+    async def listening_stats():
+        return {'totalTime': 36000.0, 'items': {}, 'days': {}, 'dayOfWeek': {}, 'today': 0,
+                'recentSessions': catalogue.recent_sessions()}
+
+    @app.get("/api/me/progress/{item_id}")
+    @app.get("/api/me/progress/{item_id}/{episode_id}")
+    async def item_progress(item_id: str, episode_id: str = None):
+        for entry in catalogue.progress[catalogue.users[0]['id']]:
+            if entry['libraryItemId'] == item_id and entry['episodeId'] == episode_id:
+                return entry
+        return JSONResponse({'error': 'Not found'}, status_code=404)
+
+    @app.get("/api/users")
+    async def users():
+        return {'users': catalogue.users}
+
+    @app.get("/api/users/{user_id}")
+    async def user(user_id: str):
+        for entry in catalogue.users:
+            if entry['id'] == user_id:
+                return dict(entry, mediaProgress=catalogue.progress[user_id])
+        return JSONResponse({'error': 'Not found'}, status_code=404)
+
+    return app
+
+
+def serve(size: int, port: int, latency_ms: float = 0.0, jitter_ms: float = 0.0, host: str = '127.0.0.1'):
+    """Build the catalogue and serve it until the process is stopped."""
+    import uvicorn
+    app = create_app(size, latency_ms, jitter_ms)
+    uvicorn.run(app, host=host, port=port, log_level="warning", access_log=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mock Audiobookshelf server for benchmarks")
+    parser.add_argument('--size', type=int, default=1000, help="number of books")
+    parser.add_argument('--port', type=int, default=13378)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    args = parser.parse_args()
+    serve(args.size, args.port, args.latency_ms, args.jitter_ms)
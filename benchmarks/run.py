@@ -0,0 +1,468 @@
+"""
+Offline benchmarks - drives the bot's hot paths against the mock Audiobookshelf server.
+
+For every library size a mock server is started (see mock_abs.py) and each scenario runs in a fresh
+process, so caches, the library mirror and peak memory don't carry over between scenarios. Reported per
+scenario: wall time of the measured part, ABS requests it made (per endpoint) and the peak RSS of the process,
+after setup and after the measured part. Results are written as JSON to benchmarks/results/ and two
+runs can be compared with --compare.
+
+    python benchmarks/run.py --sizes 1000 10000 --latency-ms 20
+    python benchmarks/run.py --compare results/before.json results/after.json
+
+The bot's requirements (Scripts/requirements.txt) must be installed. Nothing connects to Discord, commands
+are called with stand-in contexts and their replies are only counted.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'Scripts')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+SEARCH_QUERIES = ('saga', 'the silent', 'kingdom 4', 'maya', 'tower', 'ivanova', 'traveller', 'golden river',
+                  'storm 12', 'zzz no match')
+
+
+# Stand-ins for the Discord side ---------------------------------
+
+class FakeClient:
+    """Just enough of the interactions client for a paginator to register its buttons."""
+
+    def add_component_callback(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return None
+
+
+class FakeContext:
+    """Slash command / autocomplete context, replies are counted instead of sent."""
+
+    def __init__(self, input_text: str = '', guild_id: int = 1):
+        self.input_text = input_text
+        self.guild_id = guild_id
+        self.author = types.SimpleNamespace(id=1, username='bench', display_name='bench')
+        self.author_id = 1
+        self.deferred = False
+        self.responded = False
+        self.sent = []
+
+    async def defer(self, *args, **kwargs):
+        self.deferred = True
+
+    async def send(self, *args, **kwargs):
+        self.responded = True
+        self.sent.append(kwargs.get('choices') or kwargs.get('content') or kwargs.get('embeds') or args)
+        return types.SimpleNamespace(id=len(self.sent), edit=self.edit)
+
+    async def edit(self, *args, **kwargs):
+        return None
+
+
+def _callback(command):
+    """The coroutine function behind a slash command or autocomplete decorator."""
+    return getattr(command, 'callback', command)
+
+
+def _fake_main():
+    """
+    audio.py and playback_session.py take the voice adapter from main, which logs in to Discord on import.
+    Provide the same adapter around a client that never connects.
+    """
+    import discord
+    from voice_adapter import VoiceAdapter
+    module = types.ModuleType('main')
+    module.voice_adapter = VoiceAdapter(discord.Client(intents=discord.Intents.none()))
+    sys.modules['main'] = module
+
+
+# Scenarios ---------------------------------
+# setup() is not measured, run() is. Both get the scenario state dict.
+
+async def _warm_mirror(state):
+    import library_mirror
+    import search_index
+    await library_mirror.initialize_library_mirror()
+    if library_mirror._warmup_task:
+        await library_mirror._warmup_task
+    await search_index.ensure_loaded()
+
+
+async def _setup_mirror_cold(state):
+    import library_mirror
+    library_mirror.library_db = library_mirror.create_library_database()
+    await library_mirror.library_db.connect()
+    await library_mirror.library_db.create_library_tables()
+
+
+async def _run_mirror_cold(state):
+    import library_mirror
+    await library_mirror.refresh_libraries(force=True)
+
+
+async def _setup_autocomplete(state):
+    _fake_main()
+    import audio
+    state['autocomplete'] = _callback(audio.AudioPlayBack.search_media_auto_complete)
+    if state.get('mirror', True):
+        await _warm_mirror(state)
+
+
+async def _run_autocomplete_recent(state):
+    ctx = FakeContext('')
+    await state['autocomplete'](None, ctx)
+    return len(ctx.sent[-1]) if ctx.sent else 0
+
+
+async def _run_autocomplete_search(state):
+    choices = 0
+    for query in SEARCH_QUERIES:
+        ctx = FakeContext(query)
+        await state['autocomplete'](None, ctx)
+        choices += len(ctx.sent[-1]) if ctx.sent else 0
+    return choices
+
+
+async def _setup_new_books(state):
+    pass
+
+
+async def _run_new_books(state):
+    import subscription_task
+    return len(await subscription_task.newBookList())
+
+
+async def _setup_new_book_tick(state):
+    import subscription_task
+    await subscription_task.initialize_task_database()
+    # A first tick sets the watermarks, the measured one is a steady-state tick
+    watermarks = await subscription_task.get_watermarks(subscription_task.NEW_BOOK_WATERMARKS)
+    await subscription_task.newBookList(watermarks=watermarks)
+    await subscription_task.set_watermarks(subscription_task.NEW_BOOK_WATERMARKS, watermarks)
+
+
+async def _run_new_book_tick(state):
+    import subscription_task
+    watermarks = await subscription_task.get_watermarks(subscription_task.NEW_BOOK_WATERMARKS)
+    found = await subscription_task.newBookList(watermarks=watermarks)
+    await subscription_task.set_watermarks(subscription_task.NEW_BOOK_WATERMARKS, watermarks)
+    return len(found)
+
+
+async def _setup_finished_books(state):
+    pass
+
+
+async def _run_finished_books(state):
+    import subscription_task
+    return len(await subscription_task.SubscriptionTask.getFinishedBooks())
+
+
+async def _setup_finished_book_tick(state):
+    import subscription_task
+    await subscription_task.initialize_task_database()
+    watermarks = await subscription_task.get_watermarks(subscription_task.FINISHED_BOOK_WATERMARKS)
+    await subscription_task.SubscriptionTask.getFinishedBooks(watermarks)
+    await subscription_task.set_watermarks(subscription_task.FINISHED_BOOK_WATERMARKS, watermarks)
+
+
+async def _run_finished_book_tick(state):
+    import subscription_task
+    watermarks = await subscription_task.get_watermarks(subscription_task.FINISHED_BOOK_WATERMARKS)
+    found = await subscription_task.SubscriptionTask.getFinishedBooks(watermarks)
+    await subscription_task.set_watermarks(subscription_task.FINISHED_BOOK_WATERMARKS, watermarks)
+    return len(found)
+
+
+async def _setup_discover(state):
+    import default_commands
+    await _warm_mirror(state)
+    state['discover'] = _callback(default_commands.PrimaryCommands.discover_books)
+    state['extension'] = types.SimpleNamespace(ephemeral_output=True, bot=FakeClient(),
+                                               callback_interaction_discover=None)
+
+
+async def _run_discover(state):
+    for genre in (None, 'Mystery'):
+        ctx = FakeContext()
+        await state['discover'](state['extension'], ctx, genre=genre)
+    return len(ctx.sent)
+
+
+async def _setup_session_update(state):
+    _fake_main()
+    import bookshelfAPI as c
+    import playback_session
+    from session_sync import SessionSyncEngine
+    session = playback_session.PlaybackSession(None, 1, None)
+    item_id = 'li_book_00000000'
+    details = await c.bookshelf_get_item_details(item_id)
+    session.bookItemID = item_id
+    session.sessionID = 'sess_00000000_bench'
+    session.bookDuration = float(details.get('duration') or 0) or 36000.0
+    session.stream_started = True
+    session.syncEngine = SessionSyncEngine(session.sessionID, item_id, 0.0, session.bookDuration)
+    session.syncEngine.start_clock()
+    state['session'] = session
+
+
+async def _run_session_update(state):
+    import playback_session
+    session = state['session']
+    cycles = state['cycles']
+    for _ in range(cycles):
+        # One loop interval of playback passes between ticks
+        session.syncEngine.advance(float(playback_session.updateFrequency))
+        await session._session_update()
+    return cycles
+
+
+async def _setup_series(state):
+    import bookshelfAPI as c
+    libraries = await c.bookshelf_libraries()
+    state['series_names'] = []
+    for name, (library_id, audiobooks_only) in libraries.items():
+        r = await c.bookshelf_conn(endpoint=f"/libraries/{library_id}/series", GET=True, params="&limit=10&page=0")
+        state['series_names'].extend(series['name'] for series in r.json().get('results', []))
+    state['series_names'].append('No Such Series')
+
+
+async def _run_series(state):
+    import bookshelfAPI as c
+    found = 0
+    for name in state['series_names']:
+        series_id, library_id, books = await c.bookshelf_get_series_id(name)
+        found += series_id is not None
+    return found
+
+
+SCENARIOS = {
+    'mirror_cold_fill': (_setup_mirror_cold, _run_mirror_cold, {}),
+    'autocomplete_recent': (_setup_autocomplete, _run_autocomplete_recent, {}),
+    'autocomplete_search': (_setup_autocomplete, _run_autocomplete_search, {}),
+    'autocomplete_search_no_mirror': (_setup_autocomplete, _run_autocomplete_search,
+                                      {'mirror': False, 'env': {'LIBRARY_MIRROR': 'False'}}),
+    'new_book_list': (_setup_new_books, _run_new_books, {}),
+    'new_book_tick': (_setup_new_book_tick, _run_new_book_tick, {}),
+    'finished_books': (_setup_finished_books, _run_finished_books, {}),
+    'finished_book_tick': (_setup_finished_book_tick, _run_finished_book_tick, {}),
+    'discover': (_setup_discover, _run_discover, {}),
+    'session_update': (_setup_session_update, _run_session_update, {'cycles': 120}),
+    'series_lookup': (_setup_series, _run_series, {}),
+}
+
+
+# Mock server ---------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _serve(size: int, port: int, latency_ms: float, jitter_ms: float):
+    sys.path.insert(0, BENCH_DIR)
+    import mock_abs
+    mock_abs.serve(size, port, latency_ms, jitter_ms)
+
+
+def start_mock_server(size: int, latency_ms: float, jitter_ms: float, timeout: float = 300.0):
+    """
+    :return: (process, base url), once the server answers
+    """
+    import httpx
+    port = _free_port()
+    process = multiprocessing.get_context('spawn').Process(target=_serve, args=(size, port, latency_ms, jitter_ms),
+                                                           name=f"MockABS-{size}", daemon=True)
+    process.start()
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not process.is_alive():
+            raise RuntimeError(f"mock server for {size} items exited with code {process.exitcode}")
+        try:
+            if httpx.get(f"{url}/healthcheck", timeout=1).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"mock server for {size} items did not start within {timeout}s")
+
+
+def _mock_stats(url: str, reset: bool = False) -> dict:
+    import httpx
+    if reset:
+        httpx.post(f"{url}/__bench/reset", timeout=10)
+        return {}
+    return httpx.get(f"{url}/__bench/stats", timeout=10).json()
+
+
+# Worker ---------------------------------
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _worker(name: str, url: str, options: dict, queue):
+    """Runs one scenario in its own process and puts the result on the queue."""
+    result = {'status': 'ok'}
+    workdir = tempfile.mkdtemp(prefix='traveller-bench-')
+    try:
+        # The database files are created relative to the working directory
+        os.chdir(workdir)
+        os.environ.update({'PYTHON_DOTENV_DISABLED': '1', 'bookshelfURL': url, 'bookshelfToken': 'bench-token',
+                           'DISCORD_TOKEN': 'bench', 'DB_TYPE': 'sqlite', 'DEBUG_MODE': 'False'})
+        os.environ.update(options.get('env', {}))
+        sys.path.insert(0, SCRIPTS_DIR)
+        logging.basicConfig(level=logging.WARNING)
+        logging.getLogger('bot').setLevel(logging.ERROR)
+
+        setup, run, _ = SCENARIOS[name]
+        state = dict(options)
+
+        async def scenario():
+            await setup(state)
+            _mock_stats(url, reset=True)
+            result['setup_rss_kb'] = _peak_rss_kb()
+            start = time.perf_counter()
+            value = await run(state)
+            result['wall_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            result['value'] = value
+            stats = _mock_stats(url)
+            result['requests_total'] = stats.get('total', 0)
+            result['requests'] = dict(sorted(stats.get('requests', {}).items()))
+
+        asyncio.run(scenario())
+    except ImportError as e:
+        result = {'status': 'skipped', 'error': f"{type(e).__name__}: {e}"}
+    except Exception as e:
+        result = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+
+    result['peak_rss_kb'] = _peak_rss_kb()
+    queue.put(result)
+
+
+def run_scenario(name: str, url: str, timeout: float) -> dict:
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    options = dict(SCENARIOS[name][2])
+    process = context.Process(target=_worker, args=(name, url, options, queue), name=f"bench-{name}")
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return {'status': 'error', 'error': f"timed out after {timeout}s"}
+    if queue.empty():
+        return {'status': 'error', 'error': f"worker exited with code {process.exitcode}"}
+    return queue.get()
+
+
+# Reporting ---------------------------------
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def _row(result: dict) -> str:
+    if result['status'] != 'ok':
+        return f"{result['scenario']:<30} {result['size']:>7} {result['status']}: {result.get('error', '')}"
+    return (f"{result['scenario']:<30} {result['size']:>7} {result['wall_ms']:>10.1f} {result['requests_total']:>8} "
+            f"{result['setup_rss_kb'] // 1024:>8} {result['peak_rss_kb'] // 1024:>8}")
+
+
+def print_report(results: list):
+    print(f"{'scenario':<30} {'size':>7} {'wall ms':>10} {'requests':>8} {'setup MB':>8} {'peak MB':>8}")
+    for result in results:
+        print(_row(result))
+
+
+def compare(before_path: str, after_path: str):
+    """Print wall time and request count changes between two result files."""
+    with open(before_path) as f:
+        before = {(r['scenario'], r['size']): r for r in json.load(f)['results']}
+    with open(after_path) as f:
+        after = json.load(f)['results']
+
+    print(f"{'scenario':<30} {'size':>7} {'wall ms':>21} {'change':>8} {'requests':>13} {'rss MB':>11}")
+    for result in after:
+        old = before.get((result['scenario'], result['size']))
+        if not old or old['status'] != 'ok' or result['status'] != 'ok':
+            print(_row(result))
+            continue
+        change = (result['wall_ms'] - old['wall_ms']) / old['wall_ms'] * 100 if old['wall_ms'] else 0.0
+        print(f"{result['scenario']:<30} {result['size']:>7} {old['wall_ms']:>10.1f} {result['wall_ms']:>10.1f} "
+              f"{change:>+7.1f}% {old['requests_total']:>6} {result['requests_total']:>6} "
+              f"{old['peak_rss_kb'] // 1024:>5} {result['peak_rss_kb'] // 1024:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks against a mock Audiobookshelf server")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="library sizes in books")
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="added to every mock ABS response")
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--timeout', type=float, default=900.0, help="seconds allowed per scenario")
+    parser.add_argument('--output', help="result file, default results/<timestamp>.json")
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = []
+    for size in args.sizes:
+        print(f"Starting mock server with {size} books, {args.latency_ms}ms latency...")
+        server, url = start_mock_server(size, args.latency_ms, args.jitter_ms)
+        try:
+            for name in args.scenarios:
+                result = {'scenario': name, 'size': size, **run_scenario(name, url, args.timeout)}
+                results.append(result)
+                print(_row(result))
+        finally:
+            server.terminate()
+            server.join()
+
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'latency_ms': args.latency_ms,
+        'jitter_ms': args.jitter_ms,
+        'results': results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print()
+    print_report(results)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()